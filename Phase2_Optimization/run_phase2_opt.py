@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import argparse
 import os
 import sys
+from contextlib import nullcontext
 from pathlib import Path
 from typing import List, Dict
 
@@ -14,8 +16,20 @@ if str(ROOT) not in sys.path:
 from src import config
 from src.data_loader import load_and_process_data
 from src.scheduler import STRATEGY_FCFS, STRATEGY_MINSLK, STRATEGY_COST_COMPOSITE
-from src.simulation_engine import JobShop, summarize_results
-from src.visualizer import plot_comparison, plot_gantt, export_results_csv
+from src.simulation_engine import JobShop, SimulationResult, summarize_results
+from src.exporter import StreamingResultWriter
+from src.live_metrics import LiveMetrics
+from src.profiling import profile_session
+from src.visualizer import plot_comparison, plot_gantt
+
+
+DATASET_NAME = "Data1.3"
+DATA_FILE = ROOT / "native_data" / "csv" / "Data1.3.csv"
+LIVE_FILE = Path(__file__).resolve().parent / "results" / "phase2_live.jsonl"
+PHASE2_STRATEGIES = [STRATEGY_FCFS, STRATEGY_MINSLK, STRATEGY_COST_COMPOSITE]
+COMPARISON_CHART = "Phase2_comparison_bar_chart.png"
+GANTT_CHART = "Phase2_gantt_chart.png"
+REPORT_NAME = "Phase2_Optimization_Report.md"
 
 
 def _to_dict_results(results) -> List[Dict]:
@@ -29,6 +43,7 @@ def _to_dict_results(results) -> List[Dict]:
             "due_date": r.due_date,
             "tardiness": r.tardiness,
             "machine": r.machine,
+            "machine_index": r.machine_index,
         }
         for r in results
     ]
@@ -83,74 +98,110 @@ def generate_markdown_report(metrics_dict: Dict, output_path: Path) -> None:
         f.write(f"状态判断：{status_text}\n")
 
 
-def run_phase2(output_dir: str | Path) -> Dict:
-    data_file = ROOT / "native_data" / "csv" / "Data1.3.csv"
+def simulate_strategy(jobs: List[Dict], strategy: str, csv_path: str | Path,
+                      live_channel=None) -> List[SimulationResult]:
+    """单策略仿真；结果在仿真过程中由后台线程流式写出到 csv_path，live_channel 非空时实时上报进度。"""
+    with StreamingResultWriter(csv_path) as writer:
+        shop = JobShop(jobs=jobs, strategy=strategy, sink=writer.put)
+        if live_channel is not None:
+            shop.enable_live_metrics(live_channel, strategy)
+        return shop.run()
+
+
+def _best_strategy(summary_records: List[Dict]) -> str:
+    return min(summary_records, key=lambda x: x["mean_tardiness_h"])["strategy"]
+
+
+def plot_phase2_charts(summary_records: List[Dict], all_results: Dict[str, List[Dict]],
+                       output_dir: str | Path) -> None:
     output_dir = Path(output_dir)
-    output_dir.mkdir(parents=True, exist_ok=True)
+    plot_comparison(summary_records, output_dir, filename=COMPARISON_CHART)
+    plot_gantt(all_results[STRATEGY_COST_COMPOSITE], output_dir=output_dir, filename=GANTT_CHART,
+               max_jobs=None)
+
+
+def write_phase2_report(summary_records: List[Dict], output_dir: str | Path) -> Path:
+    metrics_dict = {
+        "dataset": DATASET_NAME,
+        "strategies": {r["strategy"]: {
+            "mean_tardiness_h": r["mean_tardiness_h"],
+            "mean_tardiness_n": r["mean_tardiness_n"],
+        } for r in summary_records},
+        "best_strategy": _best_strategy(summary_records),
+    }
+    report_path = Path(output_dir) / REPORT_NAME
+    generate_markdown_report(metrics_dict, report_path)
+    return report_path
 
-    strategies = [STRATEGY_FCFS, STRATEGY_MINSLK, STRATEGY_COST_COMPOSITE]
-    dataset_name = "Data1.3"
 
-    jobs = load_and_process_data(data_file)
+def run_phase2(output_dir: str | Path, headless: bool = False, live_channel=None) -> Dict:
+    """
+    运行阶段二全部策略并生成报告。
+    headless=True 时为无界面批处理模式：跳过图表与打开目录，仅输出 CSV 与 Markdown 报告。
+    live_channel 为 LiveMetrics.queue 时各策略仿真实时上报进度。
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    jobs = load_and_process_data(DATA_FILE)
 
     summary_records: List[Dict] = []
     all_results: Dict[str, List[Dict]] = {}
 
-    with tqdm(total=len(strategies), desc="阶段二进度") as pbar:
-        for strategy in strategies:
-            print(f"阶段二优化对比 {dataset_name} - 策略 {strategy} ...")
-            shop = JobShop(jobs=jobs, strategy=strategy)
-            results = shop.run()
+    with tqdm(total=len(PHASE2_STRATEGIES), desc="阶段二进度") as pbar:
+        for strategy in PHASE2_STRATEGIES:
+            print(f"阶段二优化对比 {DATASET_NAME} - 策略 {strategy} ...")
+            csv_path = output_dir / f"results_{DATASET_NAME}_{strategy}.csv"
+            results = simulate_strategy(jobs, strategy, csv_path, live_channel)
             metrics = summarize_results(results)
             print(
                 f"完成。H类平均拖期: {metrics['mean_tardiness_h']:.2f}m，"
                 f"N类平均拖期: {metrics['mean_tardiness_n']:.2f}m"
             )
 
-            result_dicts = _to_dict_results(results)
-            all_results[strategy] = result_dicts
-
-            csv_path = output_dir / f"results_{dataset_name}_{strategy}.csv"
-            export_results_csv(result_dicts, csv_path)
+            all_results[strategy] = _to_dict_results(results)
 
             summary_records.append({
-                "dataset": dataset_name,
+                "dataset": DATASET_NAME,
                 "strategy": strategy,
                 **metrics,
             })
             pbar.update(1)
 
-    plot_comparison(summary_records, output_dir, filename="Phase2_comparison_bar_chart.png")
-
-    gantt_path = output_dir / "Phase2_gantt_chart.png"
-    plot_gantt(all_results[STRATEGY_COST_COMPOSITE], output_dir=output_dir, filename="Phase2_gantt_chart.png")
+    if not headless:
+        plot_phase2_charts(summary_records, all_results, output_dir)
 
-    metrics_dict = {
-        "dataset": dataset_name,
-        "strategies": {r["strategy"]: {
-            "mean_tardiness_h": r["mean_tardiness_h"],
-            "mean_tardiness_n": r["mean_tardiness_n"],
-        } for r in summary_records},
-        "best_strategy": min(summary_records, key=lambda x: x["mean_tardiness_h"])["strategy"],
-    }
-    report_path = output_dir / "Phase2_Optimization_Report.md"
-    generate_markdown_report(metrics_dict, report_path)
+    report_path = write_phase2_report(summary_records, output_dir)
 
-    try:
-        os.startfile(output_dir)  # type: ignore[attr-defined]
-    except Exception:
-        print(f"结果已保存至：{output_dir}")
+    if not headless:
+        try:
+            os.startfile(output_dir)  # type: ignore[attr-defined]
+        except Exception:
+            print(f"结果已保存至：{output_dir}")
 
     return {
         "summary_records": summary_records,
         "report_path": report_path,
-        "comparison_chart": output_dir / "Phase2_comparison_bar_chart.png",
-        "gantt_chart": gantt_path,
+        "comparison_chart": output_dir / COMPARISON_CHART,
+        "gantt_chart": output_dir / GANTT_CHART,
     }
 
 
-def main() -> None:
-    run_phase2(Path(__file__).resolve().parent / "results")
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="运行阶段二优化研究")
+    parser.add_argument("--profile", action="store_true", help="剖析模式：输出各组件耗时汇总与 cProfile 文件")
+    parser.add_argument("--live", nargs="?", const=str(LIVE_FILE), default=None, metavar="PATH",
+                        help="实时显示各次仿真进度并写入 JSON-lines 文件（缺省 %(const)s）")
+    args = parser.parse_args(argv)
+
+    output_dir = Path(__file__).resolve().parent / "results"
+    with LiveMetrics(args.live) if args.live else nullcontext() as live:
+        channel = live.queue if live else None
+        if args.profile:
+            with profile_session(output_dir, "profile_phase2"):
+                run_phase2(output_dir, live_channel=channel)
+        else:
+            run_phase2(output_dir, live_channel=channel)
 
 
 if __name__ == "__main__":
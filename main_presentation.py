@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import argparse
 import os
 import sys
 import shutil
+from dataclasses import asdict
+from functools import partial
 from pathlib import Path
+from typing import Dict, List
 
 ROOT = Path(__file__).resolve().parent
 if str(ROOT) not in sys.path:
@@ -17,8 +21,12 @@ if str(PHASE1_DIR) not in sys.path:
 if str(PHASE2_DIR) not in sys.path:
     sys.path.append(str(PHASE2_DIR))
 
-from Phase1_Baseline.run_phase1_status import run_phase1
-from Phase2_Optimization.run_phase2_opt import run_phase2
+import Phase1_Baseline.run_phase1_status as phase1
+import Phase2_Optimization.run_phase2_opt as phase2
+from src.data_loader import load_and_process_data
+from src.pipeline import KIND_MAIN, KIND_PROCESS, KIND_THREAD, Pipeline, file_digest
+from src.profiling import profile_session
+from src.simulation_engine import summarize_results
 
 
 def _reset_output_dir(output_dir: Path) -> None:
@@ -39,35 +47,116 @@ def _merge_reports(output_dir: Path, phase1_report: Path, phase2_report: Path) -
     return final_report
 
 
-def main() -> None:
-    output_dir = ROOT / "simulation_results"
-    _reset_output_dir(output_dir)
-
-    print("=== 开始阶段一：基准现状分析 (Data1.3) ===")
-    phase1_result = run_phase1(output_dir=output_dir)
-    print("=== 阶段一完成。结果已保存。===")
-
-    print("=== 开始阶段二：优化策略研究 (Data1.3) ===")
-    phase2_result = run_phase2(output_dir=output_dir)
-    print("=== 阶段二完成。正在生成最终汇总... ===")
-
-    final_report = _merge_reports(
-        output_dir,
-        phase1_result["report_path"],
-        phase2_result["report_path"],
-    )
-
-    for src, name in [
-        (phase2_result["comparison_chart"], "comparison_bar_chart.png"),
-        (phase2_result["gantt_chart"], "gantt_chart.png"),
+def _code_key(*paths: Path) -> list:
+    """代码指纹：任一源文件变更都会使依赖它的节点重跑。"""
+    files = []
+    for path in paths:
+        files.extend(sorted(path.glob("*.py")) if path.is_dir() else [path])
+    return [(f.name, file_digest(f)) for f in files]
+
+
+def _summary_record(results, strategy: str) -> Dict:
+    return {"dataset": phase1.DATASET_NAME, "strategy": strategy, **summarize_results(results)}
+
+
+def build_pipeline(output_dir: Path, headless: bool = False, max_workers: int | None = None,
+                   profile: bool = False) -> Pipeline:
+    """
+    报告流水线：加载数据 → 仿真（两阶段共享的策略只跑一次）→ 指标 → 各阶段图表/报告 → 最终汇总。
+    profile=True 时不读写缓存、全部节点在主进程串行执行，保证组件计时覆盖完整流程。
+    """
+    engine_key = _code_key(ROOT / "src")
+    pipe = Pipeline(cache_dir=None if profile else output_dir / ".pipeline_cache",
+                    max_workers=max_workers, inline=profile)
+
+    pipe.add("load", partial(load_and_process_data, phase1.DATA_FILE),
+             kind=KIND_THREAD, key=file_digest(phase1.DATA_FILE))
+
+    # 两阶段的策略取并集，共享的 (数据集, 策略) 只仿真一次
+    strategies = list(dict.fromkeys(phase1.PHASE1_STRATEGIES + phase2.PHASE2_STRATEGIES))
+    for strategy in strategies:
+        csv_path = output_dir / f"results_{phase1.DATASET_NAME}_{strategy}.csv"
+        pipe.add(f"simulate:{strategy}",
+                 partial(phase1.simulate_strategy, strategy=strategy, csv_path=csv_path),
+                 deps=["load"], kind=KIND_PROCESS, key=[strategy, engine_key], outputs=[csv_path])
+        pipe.add(f"metrics:{strategy}", partial(_summary_record, strategy=strategy),
+                 deps=[f"simulate:{strategy}"], kind=KIND_THREAD, key=engine_key)
+
+    for module, strategies_of_phase, plot_charts, write_report, tag in [
+        (phase1, phase1.PHASE1_STRATEGIES, phase1.plot_phase1_charts, phase1.write_phase1_report, "phase1"),
+        (phase2, phase2.PHASE2_STRATEGIES, phase2.plot_phase2_charts, phase2.write_phase2_report, "phase2"),
     ]:
-        if src.exists():
-            shutil.copyfile(src, output_dir / name)
+        runner_key = _code_key(Path(module.__file__))
+        metric_nodes = [f"metrics:{s}" for s in strategies_of_phase]
+        pipe.add(f"{tag}:report",
+                 lambda *records, write_report=write_report: write_report(list(records), output_dir),
+                 deps=metric_nodes, kind=KIND_THREAD, key=runner_key,
+                 outputs=[output_dir / module.REPORT_NAME])
+        if not headless:
+            n = len(strategies_of_phase)
+
+            def _charts(*args, strategies_of_phase=strategies_of_phase, plot_charts=plot_charts, n=n):
+                records, runs = list(args[:n]), args[n:]
+                all_results = {s: [asdict(r) for r in res] for s, res in zip(strategies_of_phase, runs)}
+                plot_charts(records, all_results, output_dir)
+
+            # matplotlib 的 pyplot 不是线程安全的，图表节点在主线程执行
+            pipe.add(f"{tag}:charts", _charts,
+                     deps=metric_nodes + [f"simulate:{s}" for s in strategies_of_phase],
+                     kind=KIND_MAIN, key=runner_key,
+                     outputs=[output_dir / module.COMPARISON_CHART, output_dir / module.GANTT_CHART])
+
+    final_outputs = [output_dir / "FINAL_PROJECT_SUMMARY.md"]
+    final_deps = ["phase1:report", "phase2:report"]
+    if not headless:
+        final_deps.append("phase2:charts")
+        final_outputs += [output_dir / "comparison_bar_chart.png", output_dir / "gantt_chart.png"]
+
+    def _final(phase1_report: Path, phase2_report: Path, *_charts) -> Path:
+        final_report = _merge_reports(output_dir, phase1_report, phase2_report)
+        for src, name in [
+            (output_dir / phase2.COMPARISON_CHART, "comparison_bar_chart.png"),
+            (output_dir / phase2.GANTT_CHART, "gantt_chart.png"),
+        ]:
+            if src.exists():
+                shutil.copyfile(src, output_dir / name)
+        return final_report
+
+    pipe.add("final", _final, deps=final_deps, kind=KIND_THREAD,
+             key=_code_key(Path(__file__)), outputs=final_outputs)
+    return pipe
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="运行阶段一、二并生成最终汇总")
+    parser.add_argument("--clean", action="store_true", help="清空输出目录与流水线缓存后全部重跑")
+    parser.add_argument("--headless", action="store_true", help="无界面批处理：不生成图表")
+    parser.add_argument("--workers", type=int, default=None, help="并行工作进程/线程数")
+    parser.add_argument("--profile", action="store_true",
+                        help="剖析模式：串行执行全部节点，输出各组件耗时汇总与 cProfile 文件")
+    args = parser.parse_args(argv)
+
+    output_dir = ROOT / "simulation_results"
+    if args.clean:
+        _reset_output_dir(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
 
-    try:
-        os.startfile(output_dir)  # type: ignore[attr-defined]
-    except Exception:
-        print(f"所有结果已保存至：{output_dir}")
+    print("=== 开始运行报告流水线：阶段一基准分析 + 阶段二优化研究 (Data1.3) ===")
+    pipe = build_pipeline(output_dir, headless=args.headless, max_workers=args.workers, profile=args.profile)
+    if args.profile:
+        with profile_session(output_dir, "profile_presentation"):
+            pipe.run()
+    else:
+        pipe.run()
+    print(f"=== 流水线完成：执行 {len(pipe.executed)} 个节点，跳过 {len(pipe.skipped)} 个未变更节点 ===")
+    if pipe.skipped:
+        print("已跳过：" + ", ".join(pipe.skipped))
+
+    if not args.headless:
+        try:
+            os.startfile(output_dir)  # type: ignore[attr-defined]
+        except Exception:
+            print(f"所有结果已保存至：{output_dir}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+引擎后端基准
+
+把同一组场景（Data1.1–1.3 与不同负荷、规模的合成订单流）分别交给各引擎后端运行：
+jobshop（参考 JobShop）、heap（纯 Python 事件表）、simpy（SimPy 事件内核，需安装 simpy）。
+报告各后端的耗时与吞吐（作业/秒），并以 JobShop 为参考逐作业比对排程，
+最后给出每个场景上结果一致且最快的后端。
+
+示例：
+    python run_backend_benchmark.py
+    python run_backend_benchmark.py --backends jobshop heap --generated 3 --jobs 20000 --repeats 1
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.backends import BACKENDS, benchmark_backends, get_backend
+from src.equivalence import DATASETS, dataset_scenarios, generated_scenarios
+from src.scheduler import STRATEGY_ROLLOUT, available_strategies
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="引擎后端基准（吞吐与结果一致性）")
+    parser.add_argument("--backends", nargs="*", default=None, help=f"缺省为已安装的全部后端（{', '.join(BACKENDS)}）")
+    parser.add_argument("--datasets", nargs="*", default=list(DATASETS), help="native_data/csv 下的数据集名")
+    parser.add_argument("--generated", type=int, default=3, help="合成订单流场景数")
+    parser.add_argument("--jobs", type=int, default=5000, help="每个合成场景的订单数")
+    parser.add_argument("--strategies", nargs="*", default=None,
+                        help=f"缺省为除 {STRATEGY_ROLLOUT} 外的全部策略（只有参考后端支持 {STRATEGY_ROLLOUT}）")
+    parser.add_argument("--repeats", type=int, default=3, help="计时重复次数（取最短）")
+    args = parser.parse_args()
+
+    backends = None
+    if args.backends:
+        backends = [get_backend(name) for name in args.backends]
+        missing = [b for b in backends if not b.available()]
+        for b in missing:
+            print(f"跳过后端 {b.name}：需要安装 {b.requires}")
+        backends = [b for b in backends if b.available()]
+    strategies = args.strategies or [s for s in available_strategies() if s != STRATEGY_ROLLOUT]
+    scenarios = dataset_scenarios(args.datasets) + generated_scenarios(args.generated, n_jobs=args.jobs)
+
+    print("=" * 96)
+    print("引擎后端基准")
+    for b in (backends or [b for b in BACKENDS.values() if b.available()]):
+        print(f"  {b.name:<8} {b.description}")
+    for b in BACKENDS.values():
+        if not b.available() and not args.backends:
+            print(f"  {b.name:<8} 未安装 {b.requires}，跳过")
+    print("=" * 96)
+
+    def _progress(case):
+        mark = "✓" if case.equivalent else "✗"
+        print(f"  {mark} {case.scenario:<22} {case.strategy:<22} {case.backend:<8} {case.throughput:>10,.0f} 作业/s",
+              flush=True)
+
+    report = benchmark_backends(scenarios, backends, strategies, repeats=args.repeats, progress=_progress)
+    print()
+    print(report.format_table())
+    return 0 if all(c.equivalent for c in report.cases) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+引擎等价性检验（黄金输出对比）
+
+在 Data1.1–1.3 与合成订单流上，对 available_strategies() 中的每个策略分别运行参考 JobShop
+与候选引擎，逐作业比较开工/完工时刻与机器，报告首个分歧点与实测加速比。
+存在分歧或候选引擎出错时以退出码 1 结束，可直接用作性能改动的验收门槛。
+
+示例：
+    python run_equivalence.py --candidate mypkg.fast_engine:FastJobShop --generated 3
+    python run_equivalence.py --strategies FCFS EDD --repeats 5
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.equivalence import (DATASETS, compare_engines, dataset_scenarios, generated_scenarios, load_engine,
+                             reference_engine)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="引擎等价性检验（黄金输出对比）")
+    parser.add_argument("--candidate", default=None,
+                        help="候选引擎 模块:名称（JobShop 兼容类或 engine(jobs, strategy) 函数）；缺省与参考引擎自比")
+    parser.add_argument("--datasets", nargs="*", default=list(DATASETS), help="native_data/csv 下的数据集名")
+    parser.add_argument("--generated", type=int, default=3, help="合成订单流场景数")
+    parser.add_argument("--jobs", type=int, default=1000, help="每个合成场景的订单数")
+    parser.add_argument("--strategies", nargs="*", default=None, help="缺省为全部策略")
+    parser.add_argument("--tolerance", type=float, default=1e-6, help="时间比较容差（分钟）")
+    parser.add_argument("--repeats", type=int, default=3, help="计时重复次数（取最短）")
+    parser.add_argument("--check-machine-index", action="store_true", help="同时比较机台编号")
+    args = parser.parse_args()
+
+    candidate = load_engine(args.candidate) if args.candidate else reference_engine
+    scenarios = dataset_scenarios(args.datasets) + generated_scenarios(args.generated, n_jobs=args.jobs)
+
+    print("=" * 96)
+    print(f"引擎等价性检验：参考 JobShop vs 候选 {args.candidate or 'JobShop（自比）'}")
+    print("=" * 96)
+
+    def _progress(case):
+        mark = "✓" if case.equivalent else "✗"
+        print(f"  {mark} {case.scenario:<22} {case.strategy:<22} 加速比 {case.speedup:.2f}x", flush=True)
+
+    report = compare_engines(candidate, scenarios, strategies=args.strategies, tolerance=args.tolerance,
+                             repeats=args.repeats, check_machine_index=args.check_machine_index,
+                             progress=_progress)
+    print()
+    print(report.format_table())
+    for case in report.cases:
+        if not case.equivalent:
+            detail = case.error or case.divergence.describe()
+            print(f"首个分歧：{case.scenario} / {case.strategy}：{detail}")
+            break
+    return 0 if report.equivalent else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+自适应重复仿真
+
+对每个策略按批并行启动不同种子的独立重复，直到 H/N 平均拖期的置信区间半宽
+低于目标或达到重复次数上限，输出均值 ± 半宽与所用重复次数。
+
+示例：
+    python run_replications.py --data Data1.3 --relative 0.05 --abs 2
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src import config
+from src.data_loader import load_and_process_data
+from src.live_metrics import LiveMetrics
+from src.replication import ReplicationController
+from src.scheduler import available_strategies
+
+LIVE_FILE = ROOT / "simulation_results" / "replications_live.jsonl"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="自适应重复仿真")
+    parser.add_argument("--data", default="Data1.3", help="native_data/csv 下的数据集名")
+    parser.add_argument("--strategies", nargs="*", default=None, help="缺省为全部策略")
+    parser.add_argument("--abs", type=float, default=0.0, help="置信区间半宽绝对目标（分钟）")
+    parser.add_argument("--relative", type=float, default=0.05, help="置信区间半宽相对目标（占均值比例）")
+    parser.add_argument("--confidence", type=float, default=config.REPLICATION_CONFIDENCE)
+    parser.add_argument("--max-replications", type=int, default=config.REPLICATION_MAX)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--live", nargs="?", const=str(LIVE_FILE), default=None, metavar="PATH",
+                        help="实时显示各次仿真进度并写入 JSON-lines 文件（缺省 %(const)s）")
+    args = parser.parse_args()
+
+    jobs = load_and_process_data(ROOT / "native_data" / "csv" / f"{args.data}.csv")
+    strategies = args.strategies or available_strategies()
+
+    print("=" * 80)
+    print(f"自适应重复仿真：{args.data}，置信水平 {args.confidence:.0%}，"
+          f"目标半宽 max({args.abs}, {args.relative:.0%}·均值)")
+    print("=" * 80)
+    with LiveMetrics(args.live) if args.live else nullcontext() as live:
+        for strategy in strategies:
+            t0 = time.perf_counter()
+            summary = ReplicationController(
+                jobs, strategy,
+                target_half_width=args.abs,
+                relative_half_width=args.relative,
+                confidence=args.confidence,
+                max_replications=args.max_replications,
+                max_workers=args.workers,
+                live_channel=live.queue if live else None,
+            ).run()
+            h = summary.estimates["mean_tardiness_h"]
+            n = summary.estimates["mean_tardiness_n"]
+            status = "已收敛" if summary.converged else "达到上限"
+            print(f"  {strategy:25s}: H={h.mean:9.2f}±{h.half_width:7.2f}  N={n.mean:9.2f}±{n.half_width:7.2f}  "
+                  f"重复 {summary.replications:3d} 次（{status}，{time.perf_counter() - t0:.1f}s）")
+
+
+if __name__ == "__main__":
+    main()
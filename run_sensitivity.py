@@ -7,18 +7,23 @@
 """
 from __future__ import annotations
 
+import argparse
 import sys
 from pathlib import Path
 from typing import List, Dict
 from copy import deepcopy
+from contextlib import nullcontext
 
 ROOT = Path(__file__).resolve().parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from src.data_loader import load_and_process_data
+from src.live_metrics import LiveMetrics
 from src.simulation_engine import JobShop, summarize_results
 from src import config
+from src.queueing import SCREEN_INFEASIBLE, estimate_queue, h_tardiness_lower_bound, screen_bound
+from src.profiling import profile_session
 
 
 def compress_arrival_times(jobs: List[Dict], compression_factor: float) -> List[Dict]:
@@ -45,12 +50,16 @@ def compress_arrival_times(jobs: List[Dict], compression_factor: float) -> List[
     return compressed
 
 
-def run_sensitivity_analysis(compression_factors: List[float] = None):
+def run_sensitivity_analysis(compression_factors: List[float] = None, h_target: float = None, live_channel=None):
     """
     执行敏感性分析。
     
     Args:
         compression_factors: 压缩因子列表，默认 [1.0, 0.8, 0.7, 0.6]
+        h_target: H 类平均拖期目标（分钟）。给出时先计算 H 平均拖期的下界（对任意策略成立），
+                  下界已超过目标的场景可证明各策略都不达标，跳过仿真；
+                  各策略的排队论估计只作参考，不用于跳过仿真
+        live_channel: LiveMetrics.queue，给出时各次仿真实时上报进度（run_id 为 "x压缩因子:策略"）
     """
     if compression_factors is None:
         compression_factors = [1.0, 0.8, 0.7, 0.6]
@@ -69,6 +78,7 @@ def run_sensitivity_analysis(compression_factors: List[float] = None):
     strategies = ["FCFS", "Cost_Based_Composite"]
     
     results_table = []
+    screened = []
     
     for factor in compression_factors:
         arrival_rate_increase = (1 / factor - 1) * 100 if factor < 1 else 0
@@ -80,6 +90,19 @@ def run_sensitivity_analysis(compression_factors: List[float] = None):
             print(f"场景：到达时间压缩至 {factor*100:.0f}%（到达率增加 {arrival_rate_increase:.0f}%）")
         print("-" * 80)
         
+        if h_target is not None:
+            for strategy in strategies:
+                estimate = estimate_queue(original_jobs, strategy, compression_factor=factor)
+                print(f"  解析估计 {strategy:25s}: H平均拖期≈{estimate.tardiness_h:.2f}min, "
+                      f"N平均拖期≈{estimate.tardiness_n:.2f}min (N去B比例={estimate.n_to_b_fraction:.2f})")
+            bound = h_tardiness_lower_bound(original_jobs, compression_factor=factor)
+            verdict = screen_bound(bound, h_target)
+            print(f"  H平均拖期下界（任意策略）：{bound:.2f}min → {verdict}")
+            if verdict == SCREEN_INFEASIBLE:
+                print("  >>> 下界已超过目标，各策略都不可能达标，跳过仿真")
+                screened.append({"factor": factor, "verdict": verdict, "bound": bound})
+                continue
+        
         # 压缩到达时间
         jobs = compress_arrival_times(original_jobs, factor)
         
@@ -87,6 +110,8 @@ def run_sensitivity_analysis(compression_factors: List[float] = None):
         
         for strategy in strategies:
             shop = JobShop([deepcopy(j) for j in jobs], strategy)
+            if live_channel is not None:
+                shop.enable_live_metrics(live_channel, f"x{factor:g}:{strategy}")
             sim_results = shop.run()
             metrics = summarize_results(sim_results)
             
@@ -144,6 +169,11 @@ def run_sensitivity_analysis(compression_factors: List[float] = None):
               f"{r['Cost_Based_Composite']['n_tardiness']:^12.2f}")
     
     print("=" * 80)
+    if screened:
+        print("下界预筛跳过的场景：")
+        for r in screened:
+            print(f"  压缩因子 {r['factor']:.2f}: {r['verdict']} "
+                  f"(H拖期下界 {r['bound']:.2f}min, 目标 {h_target:.2f}min)")
     print()
     print("结论分析：")
     print("- 随着到达率增加，系统负荷上升，拖期显著增加")
@@ -154,4 +184,17 @@ def run_sensitivity_analysis(compression_factors: List[float] = None):
 
 
 if __name__ == "__main__":
-    run_sensitivity_analysis()
+    parser = argparse.ArgumentParser(description="到达压缩敏感性分析")
+    parser.add_argument("--profile", action="store_true", help="剖析模式：输出各组件耗时汇总与 cProfile 文件")
+    parser.add_argument("--h-target", type=float, default=None,
+                        help="H 平均拖期目标（分钟）：H 拖期下界已超过目标的场景跳过仿真")
+    parser.add_argument("--live", nargs="?", const=str(ROOT / "simulation_results" / "sensitivity_live.jsonl"),
+                        default=None, metavar="PATH", help="实时显示各次仿真进度并写入 JSON-lines 文件（缺省 %(const)s）")
+    args = parser.parse_args()
+    with LiveMetrics(args.live) if args.live else nullcontext() as live:
+        channel = live.queue if live else None
+        if args.profile:
+            with profile_session(ROOT / "simulation_results", "profile_sensitivity"):
+                run_sensitivity_analysis(h_target=args.h_target, live_channel=channel)
+        else:
+            run_sensitivity_analysis(h_target=args.h_target, live_channel=channel)
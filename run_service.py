@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+本地 what-if 查询服务
+
+常驻进程：启动时加载数据集并预热工作进程池，之后通过 HTTP 接收
+"按某数据集、某策略、某些参数覆盖、再追加几张订单会怎样"的查询，返回拖期等指标。
+相同查询去重、结果缓存，并发查询攒批后分发给工作进程。只监听本机。
+
+接口：
+    GET  /health     服务状态与统计（缓存命中、合并、批次数）
+    GET  /datasets   可查询的数据集与策略
+    POST /whatif     单个查询，或 {"queries": [...]} 批量查询
+
+示例：
+    python run_service.py
+    python run_service.py --port 9000 --workers 4 --data native_data/csv/Data1.3.csv
+    curl -s localhost:8765/whatif -d '{"dataset": "Data1.3", "strategy": "OPT",
+        "overrides": {"b_machines": 3}, "orders": [{"job_type": "H", "arrival_time": 120}]}'
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src import config
+from src.backends import BACKENDS
+from src.data_loader import load_and_process_data
+from src.service import WhatIfService, serve
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="本地 what-if 查询服务")
+    parser.add_argument("--data", nargs="*", default=None,
+                        help="订单 CSV（缺省为 native_data/csv 下的全部数据集，以文件名为数据集名）")
+    parser.add_argument("--host", default=config.SERVICE_HOST, help="监听地址")
+    parser.add_argument("--port", type=int, default=config.SERVICE_PORT, help="监听端口（0 表示由系统分配）")
+    parser.add_argument("--workers", type=int, default=None, help="工作进程数")
+    parser.add_argument("--backend", default=config.SERVICE_BACKEND, choices=list(BACKENDS), help="缺省引擎后端")
+    parser.add_argument("--batch-window", type=float, default=config.SERVICE_BATCH_WINDOW, help="攒批窗口（秒）")
+    parser.add_argument("--cache-size", type=int, default=config.SERVICE_CACHE_SIZE, help="结果缓存条数")
+    args = parser.parse_args()
+
+    paths = [Path(p) for p in args.data] if args.data else sorted((ROOT / "native_data" / "csv").glob("*.csv"))
+    datasets = {p.stem: load_and_process_data(p) for p in paths}
+    service = WhatIfService(datasets, max_workers=args.workers, backend=args.backend,
+                            batch_window=args.batch_window, cache_size=args.cache_size)
+
+    def _ready(host, port):
+        print(f"what-if 服务已启动：http://{host}:{port}（{service.workers} 个工作进程，"
+              f"数据集 {', '.join(datasets)}），Ctrl+C 退出", flush=True)
+
+    try:
+        asyncio.run(serve(service, args.host, args.port, ready=_ready))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+代理模型 What-if 查询
+
+首次运行时按拉丁超立方扫参（并行 JobShop）并保存记录，之后直接读取记录拟合高斯过程代理模型，
+对给定参数即时给出 H/N 平均拖期估计与不确定性；不确定性过大或超出训练范围时提示需要仿真，
+加 --refine 则当场运行 JobShop 复核并把结果追加到扫参记录中。
+
+示例：
+    python run_surrogate.py --compression-factor 0.75 --reservation-window 300 --b-machines 3
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.data_loader import load_and_process_data
+from src.live_metrics import LiveMetrics
+from src.scheduler import STRATEGY_COST_COMPOSITE
+from src.surrogate import (GaussianProcessSurrogate, latin_hypercube, load_records, run_sweep, save_records,
+                           strategy_parameters)
+
+DATA_FILE = ROOT / "native_data" / "csv" / "Data1.3.csv"
+SWEEP_FILE = ROOT / "simulation_results" / "surrogate_sweep.jsonl"
+LIVE_FILE = ROOT / "simulation_results" / "surrogate_sweep_live.jsonl"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="代理模型 What-if 查询")
+    parameters = strategy_parameters(STRATEGY_COST_COMPOSITE)
+    for name in parameters:
+        parser.add_argument("--" + name.replace("_", "-"), type=float, default=None)
+    parser.add_argument("--samples", type=int, default=120, help="扫参记录不存在时的抽样点数")
+    parser.add_argument("--workers", type=int, default=None, help="扫参进程数")
+    parser.add_argument("--refine", action="store_true", help="需要复核时运行 JobShop 并追加记录")
+    parser.add_argument("--live", nargs="?", const=str(LIVE_FILE), default=None, metavar="PATH",
+                        help="扫参时实时显示各点进度并写入 JSON-lines 文件（缺省 %(const)s）")
+    args = parser.parse_args()
+
+    jobs = load_and_process_data(DATA_FILE)
+    if not SWEEP_FILE.exists():
+        print(f"未找到扫参记录，开始扫参（{args.samples} 个点）...")
+        t0 = time.perf_counter()
+        if args.live:
+            with LiveMetrics(args.live) as live:
+                records = run_sweep(jobs, latin_hypercube(args.samples, parameters=parameters),
+                                    max_workers=args.workers, live_channel=live.queue)
+        else:
+            records = run_sweep(jobs, latin_hypercube(args.samples, parameters=parameters), max_workers=args.workers)
+        save_records(records, SWEEP_FILE, append=False)
+        print(f"扫参完成，耗时 {time.perf_counter() - t0:.1f}s，已保存至 {SWEEP_FILE}")
+
+    model = GaussianProcessSurrogate(STRATEGY_COST_COMPOSITE).fit(load_records(SWEEP_FILE, STRATEGY_COST_COMPOSITE))
+    point = {name: getattr(args, name) for name in parameters if getattr(args, name) is not None}
+
+    t0 = time.perf_counter()
+    pred = model.predict(point)
+    elapsed = (time.perf_counter() - t0) * 1e6
+    print(f"查询参数：{point or '（全部取 config 缺省值）'}")
+    print(f"  H平均拖期 ≈ {pred.mean_tardiness_h:.2f} ± {pred.std_h:.2f} min")
+    print(f"  N平均拖期 ≈ {pred.mean_tardiness_n:.2f} ± {pred.std_n:.2f} min")
+    print(f"  查询耗时 {elapsed:.0f}µs（训练样本 {len(model.records)} 个）")
+
+    if pred.needs_simulation:
+        print(f"  >>> 建议仿真复核：{pred.reason}")
+        if args.refine:
+            record = model.refine(jobs, point)
+            save_records([record], SWEEP_FILE)
+            print(f"  仿真结果：H平均拖期={record.mean_tardiness_h:.2f}min, N平均拖期={record.mean_tardiness_n:.2f}min")
+
+
+if __name__ == "__main__":
+    main()
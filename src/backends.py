@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import math
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from .equivalence import Divergence, Engine, Scenario, first_divergence, jobshop_engine, timed_run
+from .scheduler import (STRATEGY_COST_COMPOSITE, STRATEGY_EDD, STRATEGY_FCFS, STRATEGY_MINSLK, STRATEGY_OPT,
+                        available_strategies)
+
+BACKEND_JOBSHOP = "jobshop"
+BACKEND_HEAP = "heap"
+BACKEND_SIMPY = "simpy"
+
+_FAST_STRATEGIES = (STRATEGY_FCFS, STRATEGY_EDD, STRATEGY_MINSLK, STRATEGY_OPT, STRATEGY_COST_COMPOSITE)
+
+
+@dataclass
+class Backend:
+    """
+    引擎后端：target 为 "模块:类名"（相对 src 包），类的构造参数与 run() 接口同 JobShop。
+    requires 为可选依赖的模块名，未安装时 available() 为假，其余后端照常可用。
+    """
+    name: str
+    target: str
+    description: str
+    strategies: Optional[Sequence[str]] = None  # None 表示支持全部策略
+    requires: Optional[str] = None
+
+    def available(self) -> bool:
+        return self.requires is None or importlib.util.find_spec(self.requires) is not None
+
+    def supports(self, strategy: str) -> bool:
+        return self.strategies is None or strategy in self.strategies
+
+    def shop_class(self) -> type:
+        if not self.available():
+            raise ImportError(f"后端 {self.name} 需要安装 {self.requires}")
+        module_name, _, attr = self.target.partition(":")
+        return getattr(importlib.import_module(module_name, __package__), attr)
+
+    def engine(self, **overrides) -> Engine:
+        """按 equivalence 的引擎约定包装，overrides 为 JobShop 兼容的构造参数（机器数、种子等）。"""
+        return jobshop_engine(self.shop_class(), **overrides)
+
+
+BACKENDS: Dict[str, Backend] = {}
+
+
+def register_backend(backend: Backend) -> None:
+    BACKENDS[backend.name] = backend
+
+
+def get_backend(name: str) -> Backend:
+    if name not in BACKENDS:
+        raise KeyError(f"未知后端 {name!r}，可选：{', '.join(BACKENDS)}")
+    return BACKENDS[name]
+
+
+def available_backends() -> List[Backend]:
+    return [b for b in BACKENDS.values() if b.available()]
+
+
+register_backend(Backend(BACKEND_JOBSHOP, ".simulation_engine:JobShop",
+                         "手动队列 + 逐步扫描（参考实现，支持全部策略与扩展接口）"))
+register_backend(Backend(BACKEND_HEAP, ".heap_engine:HeapJobShop",
+                         "纯 Python 事件表：堆式优先级队列 + 完工事件堆", strategies=_FAST_STRATEGIES))
+register_backend(Backend(BACKEND_SIMPY, ".simpy_engine:SimPyJobShop",
+                         "SimPy 事件内核", strategies=_FAST_STRATEGIES, requires="simpy"))
+
+
+# ----------------------------------------------------------------------
+# 跨后端基准
+# ----------------------------------------------------------------------
+@dataclass
+class BackendCase:
+    scenario: str
+    strategy: str
+    backend: str
+    n_jobs: int
+    seconds: float
+    equivalent: bool
+    divergence: Optional[Divergence] = None
+    error: str = ""
+
+    @property
+    def throughput(self) -> float:
+        """作业/秒。"""
+        return self.n_jobs / self.seconds if 0 < self.seconds < math.inf else 0.0
+
+
+@dataclass
+class BackendReport:
+    cases: List[BackendCase] = field(default_factory=list)
+
+    def speedups(self, scenario: str) -> Dict[str, float]:
+        """场景内各后端相对参考后端的几何平均加速比（只在该后端支持的策略上比较）。"""
+        cases = [c for c in self.cases if c.scenario == scenario]
+        ref = {c.strategy: c.seconds for c in cases if c.backend == BACKEND_JOBSHOP}
+        out: Dict[str, float] = {}
+        for backend in dict.fromkeys(c.backend for c in cases):
+            ratios = [ref[c.strategy] / c.seconds for c in cases
+                      if c.backend == backend and c.strategy in ref and 0 < c.seconds < math.inf]
+            out[backend] = math.exp(sum(math.log(r) for r in ratios) / len(ratios)) if ratios else math.nan
+        return out
+
+    def recommend(self) -> Dict[str, Optional[str]]:
+        """
+        每个场景的推荐后端：在该场景全部已测策略上都与参考一致的后端中加速比最高者。
+        后端不支持的策略（如 Rollout）仍需由参考后端运行。
+        """
+        out: Dict[str, Optional[str]] = {}
+        for scenario in dict.fromkeys(c.scenario for c in self.cases):
+            correct = {c.backend for c in self.cases if c.scenario == scenario}
+            correct -= {c.backend for c in self.cases if c.scenario == scenario and not c.equivalent}
+            speedups = {b: v for b, v in self.speedups(scenario).items() if b in correct and not math.isnan(v)}
+            out[scenario] = max(speedups, key=speedups.get) if speedups else None
+        return out
+
+    def format_table(self) -> str:
+        lines = [f"{'场景':<22} {'策略':<22} {'后端':<8} {'作业数':>6} {'耗时(ms)':>10} {'作业/s':>10}  结果",
+                 "-" * 96]
+        for c in self.cases:
+            status = "一致" if c.equivalent else ("出错：" + c.error if c.error else "分歧：" + c.divergence.describe())
+            lines.append(f"{c.scenario:<22} {c.strategy:<22} {c.backend:<8} {c.n_jobs:>6d} "
+                         f"{c.seconds * 1000:>10.1f} {c.throughput:>10,.0f}  {status}")
+        lines.append("-" * 96)
+        for scenario, backend in self.recommend().items():
+            speedups = "，".join(f"{b} {v:.2f}x" for b, v in self.speedups(scenario).items())
+            lines.append(f"{scenario:<22} 推荐 {backend or '（无一致后端）':<8} 加速比：{speedups}")
+        return "\n".join(lines)
+
+
+def benchmark_backends(scenarios: Iterable[Scenario], backends: Optional[Sequence[Backend]] = None,
+                       strategies: Optional[Sequence[str]] = None, repeats: int = 3, tolerance: float = 1e-6,
+                       progress: Optional[Callable[[BackendCase], None]] = None) -> BackendReport:
+    """
+    在每个场景 × 策略上依次运行各后端，记录最短耗时与吞吐，并以 JobShop 的结果为参考逐作业比对。
+    参考后端每个用例只运行一组（其耗时同样计入报告，未列入 backends 时自动加入）；后端不支持的策略跳过。
+    """
+    backends = list(backends or available_backends())
+    if all(b.name != BACKEND_JOBSHOP for b in backends):
+        backends.insert(0, get_backend(BACKEND_JOBSHOP))
+    strategies = list(strategies or available_strategies())
+    reference = get_backend(BACKEND_JOBSHOP).engine()
+    engines = {b.name: (reference if b.name == BACKEND_JOBSHOP else b.engine()) for b in backends}
+    report = BackendReport()
+    for scenario in scenarios:
+        for strategy in strategies:
+            ref_results, ref_time = timed_run(reference, scenario.jobs, strategy, repeats)
+            for backend in backends:
+                if not backend.supports(strategy):
+                    continue
+                if backend.name == BACKEND_JOBSHOP:
+                    case = BackendCase(scenario.name, strategy, backend.name, len(scenario.jobs), ref_time, True)
+                else:
+                    try:
+                        results, seconds = timed_run(engines[backend.name], scenario.jobs, strategy, repeats)
+                    except Exception as exc:  # 单个后端出错不影响其余后端的测量
+                        case = BackendCase(scenario.name, strategy, backend.name, len(scenario.jobs), math.inf,
+                                           False, error=f"{type(exc).__name__}: {exc}")
+                    else:
+                        divergence = first_divergence(ref_results, results, tolerance)
+                        case = BackendCase(scenario.name, strategy, backend.name, len(scenario.jobs), seconds,
+                                           divergence is None, divergence)
+                report.cases.append(case)
+                if progress is not None:
+                    progress(case)
+    return report
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import atexit
+import json
+import mmap
+import struct
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from . import config
+from .job import TYPE_N, TYPE_NAMES, Job, JobLike
+from .rng import Seed, seed_from_json, seed_to_json
+
+# 场景包格式（小端）：
+#   头部 <4sIIQ：魔数、版本、元数据 JSON 长度、作业数 n
+#   元数据 JSON（含种子与 config 快照），补齐到 8 字节
+#   列存：job_id int64[n] | arrival f64[n] | due f64[n] | expected f64[n] | time_a f64[n] | time_b f64[n] | type u8[n]
+# time_a/time_b 为按 seed 预采样的加工时间（H 类没有 A 机时间，记为 NaN）
+BUNDLE_MAGIC = b"DSOB"
+BUNDLE_VERSION = 1
+_HEADER = struct.Struct("<4sIIQ")
+_FLOAT_COLUMNS = ("arrival_time", "due_date", "expected_duration", "time_a", "time_b")
+
+SHM_PREFIX = "shm:"
+FILE_PREFIX = "file:"
+
+# 每个进程已附加的场景包：引用 → ScenarioBundle（附加一次，后续任务直接复用）
+_ATTACHED: Dict[str, "ScenarioBundle"] = {}
+_ATEXIT_REGISTERED = False
+
+
+def _config_snapshot() -> Dict:
+    return {
+        "A_MACHINES": config.A_MACHINES,
+        "B_MACHINES": config.B_MACHINES,
+        "TRIANGULAR_B_H": list(config.TRIANGULAR_B_H),
+        "TRIANGULAR_B_N": list(config.TRIANGULAR_B_N),
+        "TRIANGULAR_A_N": list(config.TRIANGULAR_A_N),
+        "DUE_DATE_FACTOR": config.DUE_DATE_FACTOR,
+        "RANDOM_SEED": config.RANDOM_SEED,
+    }
+
+
+def pack_scenario(jobs: List[JobLike], seed: Optional[Seed] = None, meta: Optional[Dict] = None) -> bytearray:
+    """把作业表、按 seed 预采样的加工时间与 config 快照打包为一块连续缓冲区。"""
+    # 延迟导入：simulation_engine 不依赖本模块，避免循环导入
+    from .simulation_engine import JobShop
+
+    shop = JobShop(jobs, "FCFS", seed=seed)
+    ordered = shop.jobs
+    n = len(ordered)
+    header_meta = {"seed": seed_to_json(shop.seed), "config": _config_snapshot(), **(meta or {})}
+    meta_bytes = json.dumps(header_meta, ensure_ascii=False).encode("utf-8")
+    meta_padded = meta_bytes + b"\0" * (-len(meta_bytes) % 8)
+
+    buf = bytearray(_HEADER.size + len(meta_padded) + n * (8 * 6 + 1))
+    _HEADER.pack_into(buf, 0, BUNDLE_MAGIC, BUNDLE_VERSION, len(meta_bytes), n)
+    offset = _HEADER.size
+    buf[offset:offset + len(meta_padded)] = meta_padded
+    offset += len(meta_padded)
+
+    struct.pack_into(f"<{n}q", buf, offset, *(j.job_id for j in ordered))
+    offset += 8 * n
+    columns = {
+        "arrival_time": [j.arrival_time for j in ordered],
+        "due_date": [j.due_date for j in ordered],
+        "expected_duration": [j.expected_duration for j in ordered],
+        "time_a": [shop._sample_process_time(j, "A") if j.type_code == TYPE_N else float("nan") for j in ordered],
+        "time_b": [shop._sample_process_time(j, "B") for j in ordered],
+    }
+    for name in _FLOAT_COLUMNS:
+        struct.pack_into(f"<{n}d", buf, offset, *columns[name])
+        offset += 8 * n
+    buf[offset:offset + n] = bytes(j.type_code for j in ordered)
+    return buf
+
+
+class ScenarioBundle:
+    """
+    场景包的只读视图。各列是底层缓冲区上的 memoryview（零拷贝），
+    jobs()/process_times() 首次调用时解码为 JobShop 所需的结构并在本进程内缓存。
+    """
+
+    def __init__(self, buffer, owner=None):
+        view = memoryview(buffer)
+        magic, version, meta_len, n = _HEADER.unpack_from(view, 0)
+        if magic != BUNDLE_MAGIC:
+            raise ValueError("不是场景包")
+        if version != BUNDLE_VERSION:
+            raise ValueError(f"不支持的场景包版本：{version}")
+        offset = _HEADER.size
+        self.meta: Dict = json.loads(bytes(view[offset:offset + meta_len]).decode("utf-8"))
+        offset += meta_len + (-meta_len % 8)
+        self.n = n
+        self.seed: Seed = seed_from_json(self.meta["seed"])
+        self._view = view
+        # 持有共享内存 / mmap 对象，保证视图有效
+        self._owner = owner
+        self.columns: Dict[str, memoryview] = {}
+        self.columns["job_id"] = view[offset:offset + 8 * n].cast("q")
+        offset += 8 * n
+        for name in _FLOAT_COLUMNS:
+            self.columns[name] = view[offset:offset + 8 * n].cast("d")
+            offset += 8 * n
+        self.columns["job_type"] = view[offset:offset + n]
+        self._jobs: Optional[List[Job]] = None
+        self._process_times: Optional[Dict[tuple, float]] = None
+
+    def __len__(self) -> int:
+        return self.n
+
+    def jobs(self) -> List[Job]:
+        """解码为作业记录列表（按到达时间排序，与 load_and_process_data 的输出一致）。"""
+        if self._jobs is None:
+            c = self.columns
+            self._jobs = [
+                Job(job_id, arrival, TYPE_NAMES[code], expected, due)
+                for job_id, arrival, code, expected, due in zip(
+                    c["job_id"], c["arrival_time"], c["job_type"], c["expected_duration"], c["due_date"])
+            ]
+        return self._jobs
+
+    def process_times(self) -> Dict[tuple, float]:
+        """预采样加工时间，格式与 JobShop 的加工时间缓存相同（仅对 seed == self.seed 的仿真有效）。"""
+        if self._process_times is None:
+            c = self.columns
+            times: Dict[tuple, float] = {}
+            for job_id, code, t_a, t_b in zip(c["job_id"], c["job_type"], c["time_a"], c["time_b"]):
+                if code == TYPE_N:
+                    times[(job_id, "A")] = t_a
+                times[(job_id, "B")] = t_b
+            self._process_times = times
+        return self._process_times
+
+    def release(self) -> None:
+        """释放视图（关闭前必须先释放，否则共享内存/mmap 无法关闭）。"""
+        for col in self.columns.values():
+            col.release()
+        self.columns = {}
+        self._view.release()
+
+
+class SharedScenario:
+    """
+    由主进程持有的共享内存场景包。ref 可传给工作进程，工作进程用 attach(ref) 零拷贝附加。
+    用法：with SharedScenario(jobs) as scenario: pool.map(task, [(scenario.ref, ...), ...])
+    """
+
+    def __init__(self, jobs: List[JobLike], seed: Optional[Seed] = None, meta: Optional[Dict] = None):
+        data = pack_scenario(jobs, seed=seed, meta=meta)
+        self._shm = shared_memory.SharedMemory(create=True, size=len(data))
+        self._shm.buf[:len(data)] = data
+        self.ref = SHM_PREFIX + self._shm.name
+        self.size = len(data)
+
+    def close(self) -> None:
+        if self._shm is not None:
+            bundle = _ATTACHED.pop(self.ref, None)
+            if bundle is not None:
+                bundle.release()
+                bundle._owner.close()
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self) -> "SharedScenario":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def write_scenario(jobs: List[JobLike], path: str | Path, seed: Optional[Seed] = None,
+                   meta: Optional[Dict] = None) -> str:
+    """把场景包写入文件，返回可传给 attach() 的引用（工作进程以 mmap 附加）。"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(pack_scenario(jobs, seed=seed, meta=meta))
+    return FILE_PREFIX + str(path)
+
+
+def attach(ref: str) -> ScenarioBundle:
+    """按引用附加场景包（共享内存或内存映射文件）；同一进程内重复调用直接返回缓存。"""
+    bundle = _ATTACHED.get(ref)
+    if bundle is not None:
+        return bundle
+    if ref.startswith(SHM_PREFIX):
+        # 进程池的工作进程与主进程共用同一个 resource_tracker，附加时的重复登记不会导致误删
+        shm = shared_memory.SharedMemory(name=ref[len(SHM_PREFIX):])
+        bundle = ScenarioBundle(shm.buf, owner=shm)
+    elif ref.startswith(FILE_PREFIX):
+        with open(ref[len(FILE_PREFIX):], "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        bundle = ScenarioBundle(mm, owner=mm)
+    else:
+        raise ValueError(f"无法识别的场景包引用：{ref}")
+    global _ATEXIT_REGISTERED
+    if not _ATEXIT_REGISTERED:
+        atexit.register(detach_all)
+        _ATEXIT_REGISTERED = True
+    _ATTACHED[ref] = bundle
+    return bundle
+
+
+def detach_all() -> None:
+    """释放本进程附加的全部场景包（进程退出时自动调用）。"""
+    while _ATTACHED:
+        _, bundle = _ATTACHED.popitem()
+        bundle.release()
+        if bundle._owner is not None:
+            bundle._owner.close()
+
+
+def make_shop(ref: str, strategy: str, seed: Optional[Seed] = None, **overrides):
+    """
+    在工作进程中由场景包构造 JobShop：作业表按进程缓存，种子与场景包一致时直接复用预采样加工时间。
+    """
+    from .simulation_engine import JobShop
+
+    bundle = attach(ref)
+    seed = bundle.seed if seed is None else seed
+    times = bundle.process_times() if seed == bundle.seed else None
+    return JobShop(bundle.jobs(), strategy, seed=seed, process_times=times, **overrides)
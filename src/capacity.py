@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from . import config
+from .bundle import SharedScenario, attach
+from .queueing import SCREEN_INFEASIBLE, estimate_queue, screen_estimate
+from .scheduler import STRATEGY_COST_COMPOSITE
+from .surrogate import simulate_point
+
+# 配置点结论的来源
+SOURCE_SIMULATED = "simulated"  # JobShop 仿真
+
+# (压缩因子, A 机数, B 机数)
+Cell = Tuple[float, int, int]
+
+
+@dataclass
+class CapacityPoint:
+    compression_factor: float
+    a_machines: int
+    b_machines: int
+    feasible: bool
+    source: str
+    mean_tardiness_h: float
+    mean_tardiness_n: float
+
+    @property
+    def cell(self) -> Cell:
+        return (self.compression_factor, self.a_machines, self.b_machines)
+
+
+@dataclass
+class CapacityPlan:
+    """
+    产能搜索结果。只对少数配置点做了仿真，其余点的可行性由单调性推出：
+    在同一策略下，机器更多或负荷更轻（压缩因子更大）都不会使拖期变大，因此
+    - (f', a', b') 可行且 f' <= f、a' <= a、b' <= b ⇒ (f, a, b) 可行；
+    - (f', a', b') 不可行且 f' >= f、a' >= a、b' >= b ⇒ (f, a, b) 不可行。
+    启发式策略并不严格满足该假设，violations() 列出已仿真点之间的反例供复核。
+    单调性推断只使用仿真点；screened 记录排队论估计明显超标的配置（H 拖期估计），只用于安排仿真顺序。
+    """
+    h_target: float
+    n_target: Optional[float]
+    strategy: str
+    compression_factors: List[float]
+    a_values: List[int]
+    b_values: List[int]
+    points: Dict[Cell, CapacityPoint] = field(default_factory=dict)
+    screened: Dict[Cell, float] = field(default_factory=dict)
+    rounds: int = 0
+
+    def add(self, point: CapacityPoint) -> None:
+        self.points[point.cell] = point
+
+    def status(self, factor: float, a: int, b: int) -> Optional[bool]:
+        """配置点的可行性：已评估或可由单调性推出时返回 True/False，否则 None。"""
+        point = self.points.get((factor, a, b))
+        if point is not None:
+            return point.feasible
+        for p in self.points.values():
+            if p.feasible:
+                if p.compression_factor <= factor and p.a_machines <= a and p.b_machines <= b:
+                    return True
+            elif p.compression_factor >= factor and p.a_machines >= a and p.b_machines >= b:
+                return False
+        return None
+
+    def min_b_machines(self, factor: float, a: int) -> Optional[int]:
+        """给定负荷与 A 机数时满足目标的最少 B 机数；搜索范围内都不满足时为 None。"""
+        for b in self.b_values:
+            if self.status(factor, a, b):
+                return b
+        return None
+
+    def frontier(self, factor: float) -> List[Tuple[int, int]]:
+        """满足目标的极小配置 (A 机数, B 机数)：减少任一类机器都会违反目标。"""
+        out = []
+        best_b = None
+        for a in self.a_values:
+            b = self.min_b_machines(factor, a)
+            if b is not None and (best_b is None or b < best_b):
+                out.append((a, b))
+                best_b = b
+        return out
+
+    @property
+    def simulated(self) -> int:
+        return sum(1 for p in self.points.values() if p.source == SOURCE_SIMULATED)
+
+    @property
+    def grid_size(self) -> int:
+        return len(self.compression_factors) * len(self.a_values) * len(self.b_values)
+
+    def violations(self) -> List[Tuple[CapacityPoint, CapacityPoint]]:
+        """已仿真点中违反单调性的 (可行点, 机器更多/负荷更轻却不可行的点) 对。"""
+        simulated = [p for p in self.points.values() if p.source == SOURCE_SIMULATED]
+        return [(p, q) for p in simulated if p.feasible for q in simulated
+                if not q.feasible and q.cell != p.cell and q.compression_factor >= p.compression_factor
+                and q.a_machines >= p.a_machines and q.b_machines >= p.b_machines]
+
+
+def _bisection_order(values: Sequence) -> List:
+    """按逐层取中点的顺序排列（中间、四分位、……），先评估的行对其余行的剪枝作用最大。"""
+    out, spans = [], [(0, len(values))]
+    while spans:
+        next_spans = []
+        for lo, hi in spans:
+            if lo < hi:
+                mid = (lo + hi) // 2
+                out.append(values[mid])
+                next_spans += [(lo, mid), (mid + 1, hi)]
+        spans = next_spans
+    return out
+
+
+def _feasible(h: float, n: Optional[float], h_target: float, n_target: Optional[float]) -> bool:
+    return h <= h_target and (n_target is None or n is None or n <= n_target)
+
+
+def _evaluate(args: tuple) -> Tuple[float, float]:
+    ref, cell, strategy, live_channel = args
+    bundle = attach(ref)
+    factor, a, b = cell
+    record = simulate_point(bundle.jobs(), {"compression_factor": factor, "a_machines": a, "b_machines": b},
+                            strategy, process_times=bundle.process_times(),
+                            live_channel=live_channel, run_id=f"x{factor:g}:A{a}:B{b}")
+    return record.mean_tardiness_h, record.mean_tardiness_n
+
+
+def plan_capacity(jobs: List[Dict], h_target: float = config.CAPACITY_H_TARGET,
+                  compression_factors: Sequence[float] = (1.0,), strategy: str = STRATEGY_COST_COMPOSITE,
+                  a_range: Tuple[int, int] = config.CAPACITY_A_RANGE,
+                  b_range: Tuple[int, int] = config.CAPACITY_B_RANGE,
+                  n_target: Optional[float] = None, screen: bool = True,
+                  screen_margin: float = config.CAPACITY_SCREEN_MARGIN, max_workers: Optional[int] = None,
+                  progress: Optional[Callable[[CapacityPoint], None]] = None,
+                  live_channel: Any = None) -> CapacityPlan:
+    """
+    在 负荷 × A 机数 × B 机数 网格上搜索满足 H 平均拖期 <= h_target（及可选 N 平均拖期 <= n_target）
+    的配置，返回 CapacityPlan。
+
+    - screen 为真时先用排队论解析估计（queueing.estimate_queue）标出明显超标的配置。估计并不保守，
+      因此不据此下结论：只把各行第一个未被标出的 B 机数（估计的边界）作为该行的首个仿真点；
+    - 之后按轮推进：每轮按"逐层取中点"的顺序挑选至多 workers 个仍有未确定 B 机数的 (负荷, A 机数) 行，
+      各取该行估计的边界（该行尚无仿真点时）或未确定区间的中点（即逐行二分），
+      并行仿真后用单调性把结论推广到被支配的配置，直到所有点都已确定。
+      每轮只取进程数个点，使后面的行能利用前面各轮的结论剪枝，仿真点数通常远小于网格大小；
+    - live_channel 为 LiveMetrics.queue 时各仿真点实时上报进度，run_id 为 "x负荷:A机数:B机数"。
+    """
+    plan = CapacityPlan(h_target, n_target, strategy, sorted(compression_factors),
+                        list(range(a_range[0], a_range[1] + 1)), list(range(b_range[0], b_range[1] + 1)))
+
+    if screen:
+        for factor in plan.compression_factors:
+            for a in plan.a_values:
+                for b in plan.b_values:
+                    estimate = estimate_queue(jobs, strategy, a, b, compression_factor=factor)
+                    if screen_estimate(estimate, h_target, screen_margin) == SCREEN_INFEASIBLE:
+                        plan.screened[(factor, a, b)] = estimate.tardiness_h
+
+    width = max_workers or os.cpu_count() or 1
+    rows = [(factor, a) for factor in _bisection_order(plan.compression_factors)
+            for a in _bisection_order(plan.a_values)]
+
+    def next_batch() -> List[Cell]:
+        batch = []
+        for factor, a in rows:
+            # 单调性保证未确定的 B 机数构成连续区间，取中点即二分
+            open_b = [b for b in plan.b_values if plan.status(factor, a, b) is None]
+            if open_b:
+                probe = open_b[len(open_b) // 2]
+                if not any(p.compression_factor == factor and p.a_machines == a for p in plan.points.values()):
+                    # 该行的首个仿真点取排队论估计的边界（第一个未被标出超标的 B 机数）
+                    probe = next((b for b in open_b if (factor, a, b) not in plan.screened), open_b[-1])
+                batch.append((factor, a, probe))
+                if len(batch) >= width:
+                    break
+        return batch
+
+    def record(cell: Cell, outcome: Tuple[float, float]) -> None:
+        h, n = outcome
+        point = CapacityPoint(*cell, _feasible(h, n, h_target, n_target), SOURCE_SIMULATED, h, n)
+        plan.add(point)
+        if progress is not None:
+            progress(point)
+
+    batch = next_batch()
+    if not batch:
+        return plan
+    with SharedScenario(jobs) as scenario:
+        if max_workers == 1:
+            while batch:
+                for cell in batch:
+                    record(cell, _evaluate((scenario.ref, cell, strategy, live_channel)))
+                plan.rounds += 1
+                batch = next_batch()
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                while batch:
+                    for cell, outcome in zip(batch, pool.map(_evaluate, [(scenario.ref, c, strategy, live_channel)
+                                                                       for c in batch])):
+                        record(cell, outcome)
+                    plan.rounds += 1
+                    batch = next_batch()
+    return plan
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import random
+import struct
+from dataclasses import fields
+from operator import attrgetter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .job import Job, JobLike
+from .simulation_engine import JobShop, ManualQueue, SimulationResult
+
+CHECKPOINT_VERSION = 1
+STATE_FILE = "state.pkl"
+RESULTS_FILE = "results.log"
+
+_RESULT_FIELDS = [f.name for f in fields(SimulationResult)]
+_result_row = attrgetter(*_RESULT_FIELDS)
+_FRAME = struct.Struct("<I")
+
+
+def jobs_fingerprint(jobs: List[Job]) -> str:
+    """作业列表指纹，恢复时用于确认传入的是同一批订单。"""
+    h = hashlib.sha256()
+    for j in jobs:
+        h.update(repr((j.job_id, j.job_type, j.arrival_time, j.due_date)).encode("utf-8"))
+    return h.hexdigest()
+
+
+class Checkpointer:
+    """
+    周期性把 JobShop 状态写入检查点目录。
+
+    - results.log：只追加的结果日志，每次只写上次检查点之后新增的结果（分帧 pickle）；
+    - state.pkl：机器、队列（按 job_id 保存）、游标、统计量与全局 RNG 状态，原子替换写入。
+    因此单次写入的开销与检查点间隔内的事件数成正比，而不是与已完成作业总数成正比。
+    """
+
+    def __init__(self, directory: str | Path, every_events: Optional[int] = None,
+                 every_time: Optional[float] = None, fsync: bool = False):
+        if every_events is None and every_time is None:
+            raise ValueError("every_events 与 every_time 至少指定一个")
+        self.directory = Path(directory)
+        self.every_events = every_events
+        self.every_time = every_time
+        self.fsync = fsync
+        self.saves = 0
+        self._fingerprint = ""
+        self._results_written = 0
+        self._results_bytes = 0
+        self._last_events = 0
+        self._last_time = 0.0
+
+    def attach(self, shop: JobShop) -> None:
+        """绑定到一个新开始的仿真：清空目录中旧的检查点。"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._fingerprint = jobs_fingerprint(shop.jobs)
+        (self.directory / RESULTS_FILE).write_bytes(b"")
+        (self.directory / STATE_FILE).unlink(missing_ok=True)
+        self._results_written = 0
+        self._results_bytes = 0
+        self._last_events = shop.events_processed
+        self._last_time = shop.clock
+
+    def _resume_from(self, shop: JobShop, state: Dict) -> None:
+        self._fingerprint = state["fingerprint"]
+        self._results_written = state["results_count"]
+        self._results_bytes = state["results_bytes"]
+        self._last_events = shop.events_processed
+        self._last_time = shop.clock
+
+    def maybe_save(self, shop: JobShop) -> None:
+        if self.every_events is not None and shop.events_processed - self._last_events >= self.every_events:
+            self.save(shop)
+        elif self.every_time is not None and shop.clock - self._last_time >= self.every_time:
+            self.save(shop)
+
+    def save(self, shop: JobShop) -> None:
+        new_results = shop.results[self._results_written:]
+        if new_results:
+            payload = pickle.dumps([_result_row(r) for r in new_results], protocol=pickle.HIGHEST_PROTOCOL)
+            with (self.directory / RESULTS_FILE).open("r+b") as f:
+                # 截掉上次未完成的写入（若有），再追加新帧
+                f.seek(self._results_bytes)
+                f.truncate()
+                f.write(_FRAME.pack(len(payload)))
+                f.write(payload)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            self._results_bytes += _FRAME.size + len(payload)
+            self._results_written += len(new_results)
+
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "fingerprint": self._fingerprint,
+            "strategy": shop.strategy,
+            "scheduler_params": shop.scheduler.overrides(),
+            "seed": shop.seed,
+            "now": shop.now,
+            "clock": shop.clock,
+            "job_idx": shop._job_idx,
+            "finished": shop._finished,
+            "events_processed": shop.events_processed,
+            "a_busy_until": list(shop.a_machines_busy_until),
+            "b_busy_until": list(shop.b_machines_busy_until),
+            "a_queue": [j.job_id for j in shop.a_queue.peek_jobs()],
+            "b_queue": [j.job_id for j in shop.b_queue.peek_jobs()],
+            "h_in_b_system": shop.h_in_b_system,
+            "b_reserved_until": shop._b_reserved_until,
+            "b_hold": shop._b_hold,
+            "b_reserved_idle": shop.b_reserved_idle,
+            "results_count": self._results_written,
+            "results_bytes": self._results_bytes,
+            "rng_state": random.getstate(),
+        }
+        tmp = self.directory / (STATE_FILE + ".tmp")
+        with tmp.open("wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp, self.directory / STATE_FILE)
+
+        self.saves += 1
+        self._last_events = shop.events_processed
+        self._last_time = shop.clock
+
+
+def _read_results(path: Path, count: int, size: int) -> List[SimulationResult]:
+    results: List[SimulationResult] = []
+    with path.open("rb") as f:
+        data = f.read(size)
+    offset = 0
+    while offset < len(data) and len(results) < count:
+        (length,) = _FRAME.unpack_from(data, offset)
+        offset += _FRAME.size
+        results.extend(SimulationResult(*row) for row in pickle.loads(data[offset:offset + length]))
+        offset += length
+    return results
+
+
+def resume_from_checkpoint(directory: str | Path, jobs: List[JobLike],
+                           sink: Optional[Callable[[SimulationResult], None]] = None,
+                           keep_checkpointing: bool = True, every_events: Optional[int] = None,
+                           every_time: Optional[float] = None) -> JobShop:
+    """
+    从检查点目录恢复 JobShop；随后调用 run() 的结果与未中断的运行逐位一致。
+    jobs 必须与原运行相同（按指纹校验）。keep_checkpointing=True 时继续在同一目录写检查点，
+    间隔缺省沿用 every_events/every_time 参数，二者都未给出时每 10000 个事件写一次。
+    """
+    directory = Path(directory)
+    with (directory / STATE_FILE).open("rb") as f:
+        state = pickle.load(f)
+    if state.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"不支持的检查点版本：{state.get('version')}")
+
+    shop = JobShop(jobs, state["strategy"], sink=sink, seed=state.get("seed"),
+                   **state.get("scheduler_params", {}))
+    if jobs_fingerprint(shop.jobs) != state["fingerprint"]:
+        raise ValueError("作业列表与检查点不一致，无法恢复")
+
+    by_id = {j.job_id: j for j in shop.jobs}
+    shop.now = state["now"]
+    shop.clock = state["clock"]
+    shop._job_idx = state["job_idx"]
+    shop._finished = state["finished"]
+    shop._started = True
+    shop.events_processed = state["events_processed"]
+    shop.a_machines_busy_until = list(state["a_busy_until"])
+    shop.b_machines_busy_until = list(state["b_busy_until"])
+    shop.a_queue = ManualQueue("A_Queue", (by_id[job_id] for job_id in state["a_queue"]))
+    shop.b_queue = ManualQueue("B_Queue", (by_id[job_id] for job_id in state["b_queue"]))
+    shop.h_in_b_system = state["h_in_b_system"]
+    shop._b_reserved_until = state.get("b_reserved_until")
+    shop._b_hold = state.get("b_hold")
+    shop.b_reserved_idle = state.get("b_reserved_idle", 0.0)
+    shop.results = _read_results(directory / RESULTS_FILE, state["results_count"], state["results_bytes"])
+    random.setstate(state["rng_state"])
+
+    if keep_checkpointing:
+        if every_events is None and every_time is None:
+            every_events = 10_000
+        checkpointer = Checkpointer(directory, every_events=every_events, every_time=every_time)
+        checkpointer._resume_from(shop, state)
+        shop.checkpointer = checkpointer
+    return shop
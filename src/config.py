@@ -18,6 +18,14 @@ TRIANGULAR_A_N = (360, 480, 840)
 A_BUSY_THRESHOLD = 5  # A 队列长度阈值（每台 A 机后排 5 个以上视为堵死）
 B_RESERVATION_WINDOW = 200.0  # 预留窗口（分钟）
 A_QUEUE_STRICT_LIMIT = 15  # A 队列总长度严格限制（3台 * 5 = 15）
+A_OVERFLOW_LIMIT = 10  # Cost_Based_Composite：A 机负载超过该值时 N 才允许溢出到空闲 B 机
+
+# Rollout 策略参数（N 类派工时对"去 A / 去 B"各做一次短时域前向仿真）
+ROLLOUT_HORIZON = 2000.0  # 前向仿真时域（分钟）
+ROLLOUT_H_WEIGHT = 10.0  # H 类拖期权重（N 类为 1）
+ROLLOUT_SAMPLES = 8  # 每次决策抽样的未来情景数（到达与加工时间按分布抽样，两侧代价取平均）
+ROLLOUT_MAX_EVENTS = 5000  # 单个分支最多处理的事件数，超出时退回启发式规则（按事件计，与墙钟无关）
+ROLLOUT_WORKERS = None  # 前向仿真进程数，None 表示按 CPU 核数，1 表示在当前进程内顺序评估
 
 # 交货期设置（与期望加工时间相关）
 DUE_DATE_FACTOR = 1.5  # 交货期 = 到达时间 + 1.5 * 期望加工时间
@@ -25,6 +33,44 @@ DUE_DATE_FACTOR = 1.5  # 交货期 = 到达时间 + 1.5 * 期望加工时间
 # 统一随机种子（保证可复现）
 RANDOM_SEED = 42
 
+# 独立重复仿真（见 replication.py）
+REPLICATION_CONFIDENCE = 0.95  # 置信水平
+REPLICATION_MIN = 5  # 最少重复次数（样本太少时 t 分布半宽不可靠）
+REPLICATION_MAX = 200  # 重复次数上限（预算）
+
+# 离线基准求解器（见 offline_solver.py）
+OFFLINE_H_WEIGHT = 10.0  # 目标函数中 H 类拖期权重（N 类为 1）
+OFFLINE_ITERATIONS = 200_000  # 每次重启的局部搜索步数
+OFFLINE_RESTARTS = 8  # 并行重启次数
+
+# 产能规划（见 capacity.py）
+CAPACITY_A_RANGE = (1, 8)  # A 机数量搜索范围（含端点）
+CAPACITY_B_RANGE = (1, 8)  # B 机数量搜索范围（含端点）
+CAPACITY_H_TARGET = 10.0  # 缺省 H 类平均拖期目标（分钟）
+CAPACITY_SCREEN_MARGIN = 0.5  # 排队论预筛的判定余量（见 queueing.screen_estimate）
+
+# 多目标 Pareto 探索（见 pareto.py）
+PARETO_GENERATIONS = 4  # 搜索代数（第 0 代为拉丁超立方抽样，之后变异存档成员）
+PARETO_BATCH_SIZE = 8  # 每代新候选数
+PARETO_MIN_REPLICATIONS = 3  # 判定提前淘汰前每个候选至少的重复次数
+PARETO_MAX_REPLICATIONS = 10  # 候选未被淘汰时的重复次数
+
+# 本地 what-if 查询服务（见 service.py）
+SERVICE_HOST = "127.0.0.1"  # 只监听本机
+SERVICE_PORT = 8765
+SERVICE_BACKEND = "heap"  # 缺省引擎后端，策略不受支持（如 Rollout）时回退到 jobshop
+SERVICE_BATCH_WINDOW = 0.005  # 攒批窗口（秒）：窗口内到达的查询去重后一起分发给工作进程
+SERVICE_CACHE_SIZE = 1024  # 结果缓存条数（LRU）
+SERVICE_MAX_BODY = 1 << 20  # 请求体上限（字节）
+
+# 增量重仿真：JobShop.enable_marks() 缺省每处理多少个事件记录一次状态标记（标记缺省关闭）
+MARK_EVERY_EVENTS = 100
+
+# 实时指标（长时间扫参的进度上报）
+LIVE_METRICS_EVERY_EVENTS = 500  # 每处理多少个事件检查一次是否需要上报
+LIVE_METRICS_INTERVAL = 1.0  # 同一运行两次上报的最小间隔（秒，墙钟）
+LIVE_METRICS_STALL_SECONDS = 60.0  # 超过该时长没有新上报的运行视为停滞并告警
+
 # 调度规则名称（阶段一）
 STRATEGY_MINSLK = "MinSLK"
 
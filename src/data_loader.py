@@ -1,24 +1,27 @@
 from __future__ import annotations
 
 import csv
-import random
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 from . import config
+from .job import Job
+from .rng import PURPOSE_DUE_JITTER, Seed, make_rng
 
 
 def _parse_time(value: str) -> datetime:
     return datetime.strptime(value.strip(), "%Y-%m-%d %H:%M")
 
 
-def load_and_process_data(filepath: str | Path) -> List[Dict]:
+def load_and_process_data(filepath: str | Path, seed: Optional[Seed] = None) -> List[Job]:
     """
     读取 CSV，将绝对时间转换为相对仿真时间（分钟），
     并计算 Expected Duration 与 Due Date。
     
     为了让不同调度策略产生差异化结果，交货期会加入随机扰动。
+    seed 缺省为 config.RANDOM_SEED；传入 rng.SeedSequence 时扰动取自其 due_jitter 流。
+    返回紧凑的 Job 记录（仍支持 job["due_date"] 等字典式访问）。
     """
     filepath = Path(filepath)
     rows = []
@@ -42,7 +45,7 @@ def load_and_process_data(filepath: str | Path) -> List[Dict]:
     base_time = min(r["arrival_dt"] for r in rows)
     
     # 使用固定种子生成交货期扰动，确保可复现
-    rng = random.Random(config.RANDOM_SEED)
+    rng = make_rng(config.RANDOM_SEED if seed is None else seed, PURPOSE_DUE_JITTER)
 
     processed = []
     for row in rows:
@@ -54,13 +57,13 @@ def load_and_process_data(filepath: str | Path) -> List[Dict]:
         due_jitter = rng.uniform(-0.1, 0.1) * expected_duration
         due_date = arrival_time + config.DUE_DATE_FACTOR * expected_duration + due_jitter
 
-        processed.append({
-            "job_id": row["job_id"],
-            "arrival_time": float(arrival_time),
-            "job_type": row["job_type"],
-            "expected_duration": float(expected_duration),
-            "due_date": float(due_date),
-        })
+        processed.append(Job(
+            job_id=row["job_id"],
+            arrival_time=float(arrival_time),
+            job_type=row["job_type"],
+            expected_duration=float(expected_duration),
+            due_date=float(due_date),
+        ))
 
-    processed.sort(key=lambda x: x["arrival_time"])
+    processed.sort(key=lambda x: x.arrival_time)
     return processed
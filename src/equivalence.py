@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import importlib
+import inspect
+import math
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+from .data_loader import load_and_process_data
+from .job import Job
+from .rng import root_sequence
+from .scheduler import available_strategies
+from .simulation_engine import JobShop, SimulationResult
+from .workload import PoissonWorkload
+
+# 引擎：engine(jobs, strategy) -> 按开工顺序的 SimulationResult 列表
+Engine = Callable[[List[Job], str], List[SimulationResult]]
+
+DATA_DIR = Path(__file__).resolve().parents[1] / "native_data" / "csv"
+DATASETS = ("Data1.1", "Data1.2", "Data1.3")
+
+
+def jobshop_engine(shop_cls: type = JobShop, **kwargs) -> Engine:
+    """
+    把 JobShop（或接口兼容的子类/替代实现）包装为引擎。
+    """
+    def run(jobs: List[Job], strategy: str) -> List[SimulationResult]:
+        return shop_cls(jobs, strategy, **kwargs).run()
+    run.__name__ = getattr(shop_cls, "__name__", "engine")
+    return run
+
+
+reference_engine = jobshop_engine(JobShop)
+
+
+def load_engine(spec: str) -> Engine:
+    """按 "模块:名称" 加载候选引擎；名称指向类时按 JobShop 接口包装。"""
+    module_name, _, attr = spec.partition(":")
+    if not attr:
+        raise ValueError(f"引擎应写作 模块:名称，收到 {spec!r}")
+    obj = getattr(importlib.import_module(module_name), attr)
+    return jobshop_engine(obj) if inspect.isclass(obj) else obj
+
+
+# ----------------------------------------------------------------------
+# 场景
+# ----------------------------------------------------------------------
+@dataclass
+class Scenario:
+    name: str
+    jobs: List[Job]
+
+
+def dataset_scenarios(names: Sequence[str] = DATASETS) -> List[Scenario]:
+    return [Scenario(name, load_and_process_data(DATA_DIR / f"{name}.csv")) for name in names]
+
+
+def generated_scenarios(count: int, n_jobs: int = 1000,
+                        compression_factors: Sequence[float] = (1.0, 0.8, 0.6)) -> List[Scenario]:
+    """
+    合成订单流场景：以 Data1.3 的到达率为基准，按压缩因子轮流取不同负荷，
+    每个场景使用根种子序列派生的独立子序列，结果可复现。
+    """
+    base = load_and_process_data(DATA_DIR / "Data1.3.csv")
+    scenarios = []
+    for i in range(count):
+        factor = compression_factors[i % len(compression_factors)]
+        workload = PoissonWorkload.from_jobs(base, compression_factor=factor,
+                                             seed=root_sequence().child("equivalence", i))
+        jobs = [Job.from_mapping(j) for j in workload.generate(math.inf, limit=n_jobs)]
+        scenarios.append(Scenario(f"generated#{i}(x{factor:g})", jobs))
+    return scenarios
+
+
+# ----------------------------------------------------------------------
+# 对比
+# ----------------------------------------------------------------------
+@dataclass
+class Divergence:
+    """首个分歧：按参考引擎的开工顺序，第一个字段不一致（或缺失/多出）的作业。"""
+    job_id: Optional[int]
+    field: str
+    reference: object
+    candidate: object
+    reference_start: Optional[float] = None
+
+    def describe(self) -> str:
+        at = f"（参考开工时刻 {self.reference_start:.4f}）" if self.reference_start is not None else ""
+        return f"作业 {self.job_id} 的 {self.field}{at}：参考 {self.reference!r}，候选 {self.candidate!r}"
+
+
+@dataclass
+class CaseReport:
+    scenario: str
+    strategy: str
+    n_jobs: int
+    equivalent: bool
+    divergence: Optional[Divergence]
+    reference_time: float
+    candidate_time: float
+    error: str = ""
+
+    @property
+    def speedup(self) -> float:
+        return self.reference_time / self.candidate_time if self.candidate_time > 0 else math.inf
+
+
+@dataclass
+class EquivalenceReport:
+    cases: List[CaseReport] = field(default_factory=list)
+
+    @property
+    def equivalent(self) -> bool:
+        return all(c.equivalent for c in self.cases)
+
+    @property
+    def speedup(self) -> float:
+        """全部用例的几何平均加速比。"""
+        values = [c.speedup for c in self.cases if 0 < c.speedup < math.inf]
+        return math.exp(sum(math.log(v) for v in values) / len(values)) if values else math.nan
+
+    def format_table(self) -> str:
+        lines = [f"{'场景':<22} {'策略':<22} {'作业数':>6} {'参考(ms)':>10} {'候选(ms)':>10} {'加速比':>7}  结果",
+                 "-" * 96]
+        for c in self.cases:
+            status = "一致" if c.equivalent else ("出错：" + c.error if c.error else "分歧：" + c.divergence.describe())
+            lines.append(f"{c.scenario:<22} {c.strategy:<22} {c.n_jobs:>6d} {c.reference_time * 1000:>10.1f} "
+                         f"{c.candidate_time * 1000:>10.1f} {c.speedup:>6.2f}x  {status}")
+        lines.append("-" * 96)
+        passed = sum(1 for c in self.cases if c.equivalent)
+        lines.append(f"一致 {passed}/{len(self.cases)}，几何平均加速比 {self.speedup:.2f}x")
+        return "\n".join(lines)
+
+
+def first_divergence(reference: Iterable[SimulationResult], candidate: Iterable[SimulationResult],
+                     tolerance: float = 1e-6, check_machine_index: bool = False) -> Optional[Divergence]:
+    """
+    逐作业比较开工时刻、完工时刻与机器类型（可选机台编号），时间允许 tolerance 分钟误差。
+    按参考结果的开工顺序扫描，返回第一个不一致的作业；完全一致时返回 None。
+    """
+    ref = sorted(reference, key=lambda r: (r.start_time, r.job_id))
+    cand = {r.job_id: r for r in candidate}
+    fields: List[Tuple[str, bool]] = [("start_time", True), ("end_time", True), ("machine", False)]
+    if check_machine_index:
+        fields.append(("machine_index", False))
+    for r in ref:
+        other = cand.pop(r.job_id, None)
+        if other is None:
+            return Divergence(r.job_id, "缺失", "已开工", None, r.start_time)
+        for name, numeric in fields:
+            a, b = getattr(r, name), getattr(other, name)
+            if (abs(a - b) > tolerance) if numeric else (a != b):
+                return Divergence(r.job_id, name, a, b, r.start_time)
+    if cand:
+        extra = min(cand.values(), key=lambda r: (r.start_time, r.job_id))
+        return Divergence(extra.job_id, "多出", None, "已开工")
+    return None
+
+
+def timed_run(engine: Engine, jobs: List[Job], strategy: str, repeats: int) -> Tuple[List[SimulationResult], float]:
+    """运行 repeats 次，返回首次结果与最短耗时（每次传入新的作业列表，避免引擎间共享可变状态）。"""
+    best = math.inf
+    results: List[SimulationResult] = []
+    for i in range(max(1, repeats)):
+        batch = list(jobs)
+        start = time.perf_counter()
+        out = engine(batch, strategy)
+        best = min(best, time.perf_counter() - start)
+        if i == 0:
+            results = list(out)
+    return results, best
+
+
+def compare_engines(candidate: Engine, scenarios: Iterable[Scenario],
+                    strategies: Optional[Sequence[str]] = None, reference: Engine = reference_engine,
+                    tolerance: float = 1e-6, repeats: int = 3, check_machine_index: bool = False,
+                    progress: Optional[Callable[[CaseReport], None]] = None) -> EquivalenceReport:
+    """
+    在每个场景 × 策略上运行参考引擎与候选引擎，比较排程并记录最短耗时。
+    候选引擎抛出异常时记为不一致并继续下一个用例。
+    """
+    strategies = list(strategies or available_strategies())
+    report = EquivalenceReport()
+    for scenario in scenarios:
+        for strategy in strategies:
+            ref_results, ref_time = timed_run(reference, scenario.jobs, strategy, repeats)
+            try:
+                cand_results, cand_time = timed_run(candidate, scenario.jobs, strategy, repeats)
+            except Exception as exc:  # 候选引擎的任何错误都应报告而不是中断整个对比
+                case = CaseReport(scenario.name, strategy, len(scenario.jobs), False, None,
+                                  ref_time, math.inf, error=f"{type(exc).__name__}: {exc}")
+            else:
+                divergence = first_divergence(ref_results, cand_results, tolerance, check_machine_index)
+                case = CaseReport(scenario.name, strategy, len(scenario.jobs), divergence is None,
+                                  divergence, ref_time, cand_time)
+            report.cases.append(case)
+            if progress is not None:
+                progress(case)
+    return report
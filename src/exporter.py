@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import queue
+import struct
+import threading
+import zlib
+from dataclasses import fields
+from operator import attrgetter, itemgetter
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .profiling import COMPONENT_EXPORT, timed
+from .simulation_engine import SimulationResult
+
+# 导出字段顺序（与阶段脚本中的 _to_dict_results 一致）
+RESULT_FIELDS = [f.name for f in fields(SimulationResult)]
+
+# 分块二进制格式：文件头 + 若干 [记录数 uint32][压缩长度 uint32][zlib 压缩的定长记录]
+BINARY_MAGIC = b"DSORES1\n"
+_BINARY_RECORD = struct.Struct("<q1sddddd1sI")
+_CHUNK_HEADER = struct.Struct("<II")
+
+_get_result_row = attrgetter(*RESULT_FIELDS)
+_get_dict_row = itemgetter(*RESULT_FIELDS)
+
+_STOP = object()
+
+
+def _infer_format(path: Path) -> str:
+    name = path.name.lower()
+    if name.endswith(".csv.gz"):
+        return "csv.gz"
+    if name.endswith(".csv.zst"):
+        return "csv.zst"
+    if name.endswith(".bin"):
+        return "bin"
+    return "csv"
+
+
+def _to_row(record: Any) -> tuple:
+    if isinstance(record, SimulationResult):
+        return _get_result_row(record)
+    return _get_dict_row(record)
+
+
+class StreamingResultWriter:
+    """
+    后台线程流式导出仿真结果。
+
+    引擎通过 put()（可直接作为 JobShop 的 sink）把定案的记录放入有界队列，
+    写线程按批取出并写入 CSV / gzip CSV / zstd CSV / 分块二进制文件，
+    使仿真计算与磁盘 I/O 重叠。队列满时 put() 阻塞，形成背压，内存占用有上界。
+
+    格式由 fmt 指定，缺省按后缀推断：.csv、.csv.gz、.csv.zst、.bin。
+    zstd 需要可选依赖 zstandard。
+    """
+
+    def __init__(self, output_path: str | Path, fmt: str | None = None,
+                 queue_size: int = 10_000, batch_size: int = 1_000,
+                 compress_level: int = 6):
+        self.output_path = Path(output_path)
+        self.fmt = fmt or _infer_format(self.output_path)
+        if self.fmt not in ("csv", "csv.gz", "csv.zst", "bin"):
+            raise ValueError(f"不支持的导出格式：{self.fmt}")
+        self.batch_size = batch_size
+        self.compress_level = compress_level
+        self.records_written = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+    def start(self) -> "StreamingResultWriter":
+        if self._thread is not None:
+            return self
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        stream = self._open()
+        self._thread = threading.Thread(target=self._run, args=(stream,), name="result-writer", daemon=True)
+        self._thread.start()
+        return self
+
+    @timed(COMPONENT_EXPORT)
+    def put(self, record: Any) -> None:
+        """推送一条结果（SimulationResult 或同字段 dict）。"""
+        if self._error is not None:
+            raise RuntimeError("结果写线程已失败") from self._error
+        if self._thread is None:
+            self.start()
+        self._queue.put(record)
+
+    @timed(COMPONENT_EXPORT)
+    def close(self) -> None:
+        """等待队列写空并关闭文件；写线程中的异常在此抛出。"""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+        if self._error is not None:
+            raise RuntimeError("结果写线程已失败") from self._error
+
+    def __enter__(self) -> "StreamingResultWriter":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # 写线程
+    # ------------------------------------------------------------------
+    def _open(self):
+        if self.fmt == "csv":
+            return self.output_path.open("w", newline="", encoding="utf-8")
+        if self.fmt == "csv.gz":
+            raw = gzip.open(self.output_path, "wb", compresslevel=self.compress_level)
+            return io.TextIOWrapper(raw, encoding="utf-8", newline="")
+        if self.fmt == "csv.zst":
+            try:
+                import zstandard
+            except ImportError as exc:
+                raise ImportError("导出 .csv.zst 需要安装 zstandard：pip install zstandard") from exc
+            raw = zstandard.ZstdCompressor(level=self.compress_level).stream_writer(
+                self.output_path.open("wb"), closefd=True
+            )
+            return io.TextIOWrapper(raw, encoding="utf-8", newline="")
+        return self.output_path.open("wb")
+
+    def _next_batch(self) -> tuple[List[Any], bool]:
+        """阻塞取一条，再非阻塞取满一批；返回 (批次, 是否收到结束标记)。"""
+        batch = []
+        item = self._queue.get()
+        while True:
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                return batch, False
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return batch, False
+
+    def _run(self, stream) -> None:
+        done = False
+        try:
+            with stream:
+                if self.fmt == "bin":
+                    stream.write(BINARY_MAGIC)
+                    write_batch = lambda rows: self._write_binary_chunk(stream, rows)
+                else:
+                    writer = csv.writer(stream)
+                    writer.writerow(RESULT_FIELDS)
+                    write_batch = writer.writerows
+                while not done:
+                    batch, done = self._next_batch()
+                    if batch:
+                        write_batch([_to_row(r) for r in batch])
+                        self.records_written += len(batch)
+        except BaseException as exc:
+            self._error = exc
+            # 排空队列直到结束标记，避免生产者在 put() 上永久阻塞
+            while not done:
+                done = self._queue.get() is _STOP
+
+    def _write_binary_chunk(self, stream, rows: List[tuple]) -> None:
+        packed = b"".join(
+            _BINARY_RECORD.pack(
+                job_id, job_type.encode("ascii"), arrival, start, end, due, tardiness,
+                machine.encode("ascii"), machine_index,
+            )
+            for job_id, job_type, arrival, start, end, due, tardiness, machine, machine_index in rows
+        )
+        payload = zlib.compress(packed, self.compress_level)
+        stream.write(_CHUNK_HEADER.pack(len(rows), len(payload)))
+        stream.write(payload)
+
+
+def read_binary_results(path: str | Path) -> Iterator[Dict]:
+    """逐条读取分块二进制结果文件。"""
+    with Path(path).open("rb") as f:
+        if f.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+            raise ValueError(f"不是结果二进制文件：{path}")
+        while True:
+            header = f.read(_CHUNK_HEADER.size)
+            if not header:
+                return
+            _, size = _CHUNK_HEADER.unpack(header)
+            packed = zlib.decompress(f.read(size))
+            for values in _BINARY_RECORD.iter_unpack(packed):
+                row = dict(zip(RESULT_FIELDS, values))
+                row["job_type"] = row["job_type"].decode("ascii")
+                row["machine"] = row["machine"].decode("ascii")
+                yield row
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import random
+from bisect import bisect_right
+from heapq import heappop, heappush
+from operator import itemgetter
+from typing import Callable, Dict, List, Optional
+
+from . import config
+from .job import TYPE_H, Job, JobLike, to_jobs
+from .rng import Seed, global_seed
+from .scheduler import (Scheduler, STRATEGY_COST_COMPOSITE, STRATEGY_EDD, STRATEGY_FCFS, STRATEGY_MINSLK,
+                        STRATEGY_OPT, STRATEGY_ROLLOUT)
+from .simulation_engine import SimulationResult, _by_arrival, _by_due_date, sample_process_time
+
+_by_seq = itemgetter(1)
+
+
+# ----------------------------------------------------------------------
+# 优先级队列
+# ----------------------------------------------------------------------
+class _KeyQueue:
+    """
+    静态优先级键（到达时间、交货期）的小根堆，元素为 (键, 入队序号, 作业)。
+    同键按入队先后出队，与 ManualQueue 每次稳定排序后取队首的结果相同，但出队为 O(log n)。
+    """
+    __slots__ = ("heap", "key")
+
+    def __init__(self, key: Callable[[Job], float]):
+        self.heap: List[tuple] = []
+        self.key = key
+
+    def push(self, job: Job, seq: int) -> None:
+        heappush(self.heap, (self.key(job), seq, job))
+
+    def pop(self, now: float) -> Job:
+        return heappop(self.heap)[2]
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+
+class _SlackQueue(_KeyQueue):
+    """
+    MinSLK 队列：松弛时间 slack_key - now 随时间平移，相对次序不变，因此堆按 slack_key 组织；
+    出队时把减去 now 后舍入相等的队首元素一并取出，按入队先后选取（与稳定排序的并列处理一致）。
+    """
+    __slots__ = ()
+
+    def __init__(self):
+        super().__init__(None)
+
+    def push(self, job: Job, seq: int) -> None:
+        heappush(self.heap, (job.slack_key, seq, job))
+
+    def pop(self, now: float) -> Job:
+        heap = self.heap
+        first = heappop(heap)
+        value = first[0] - now
+        if not heap or heap[0][0] - now != value:
+            return first[2]
+        ties = [first]
+        while heap and heap[0][0] - now == value:
+            ties.append(heappop(heap))
+        best = min(ties, key=_by_seq)
+        for item in ties:
+            if item is not best:
+                heappush(heap, item)
+        return best[2]
+
+
+class _HFirstQueue:
+    """Cost_Based_Composite 的 B 机队列：H 按 EDD 绝对优先，无 H 时 N 按 MinSLK。"""
+    __slots__ = ("h", "n")
+
+    def __init__(self):
+        self.h = _KeyQueue(_by_due_date)
+        self.n = _SlackQueue()
+
+    def push(self, job: Job, seq: int) -> None:
+        (self.h if job.type_code == TYPE_H else self.n).push(job, seq)
+
+    def pop(self, now: float) -> Job:
+        return self.h.pop(now) if self.h.heap else self.n.pop(now)
+
+    def __len__(self) -> int:
+        return len(self.h.heap) + len(self.n.heap)
+
+
+def _make_queue(strategy: str, machine: str):
+    """与 ManualQueue.sort_and_pop 的分支一一对应。"""
+    if machine == "B" and strategy == STRATEGY_COST_COMPOSITE:
+        return _HFirstQueue()
+    if strategy == STRATEGY_FCFS:
+        return _KeyQueue(_by_arrival)
+    if strategy in (STRATEGY_MINSLK, STRATEGY_COST_COMPOSITE):
+        return _SlackQueue()
+    return _KeyQueue(_by_due_date)
+
+
+# ----------------------------------------------------------------------
+# 事件表引擎
+# ----------------------------------------------------------------------
+class HeapJobShop:
+    """
+    纯 Python 事件表引擎后端，构造参数与 run() 接口同 JobShop，排程结果逐作业一致
+    （同样的派工规则、队列规则、B 机预留与收尾处理），区别在于：
+    - 队列按优先级键组织为堆，出队 O(log n)（JobShop 每次出队都整队排序）；
+    - 未来完工时刻放在事件堆中，下一事件时刻不必每步扫描全部机器；
+    - H 类直接进 B 队列，不再统计派工所需的负载。
+    不支持 Rollout（前向仿真依赖 JobShop 的快照/分叉接口），也不提供检查点、在线提交等扩展接口。
+    """
+    STRATEGIES = (STRATEGY_FCFS, STRATEGY_EDD, STRATEGY_MINSLK, STRATEGY_OPT, STRATEGY_COST_COMPOSITE)
+
+    def __init__(self, jobs: List[JobLike], strategy: str,
+                 sink: Optional[Callable[[SimulationResult], None]] = None,
+                 a_machines: Optional[int] = None, b_machines: Optional[int] = None,
+                 reservation_window: Optional[float] = None, busy_threshold: Optional[int] = None,
+                 overflow_limit: Optional[int] = None, seed: Optional[Seed] = None,
+                 process_times: Optional[Dict[tuple, float]] = None):
+        if strategy == STRATEGY_ROLLOUT:
+            raise ValueError(f"{type(self).__name__} 不支持 {STRATEGY_ROLLOUT} 策略")
+        self.jobs: List[Job] = sorted(to_jobs(jobs), key=_by_arrival)
+        self.h_arrivals = sorted(j.arrival_time for j in self.jobs if j.type_code == TYPE_H)
+        self._process_times: Dict[tuple, float] = {} if process_times is None else process_times
+        self.seed = config.RANDOM_SEED if seed is None else seed
+        self.strategy = strategy
+        self.scheduler = Scheduler(strategy=strategy, reservation_window=reservation_window,
+                                   busy_threshold=busy_threshold, overflow_limit=overflow_limit)
+        self.sink = sink
+        self.a_machines_busy_until: List[float] = [0.0] * (config.A_MACHINES if a_machines is None else a_machines)
+        self.b_machines_busy_until: List[float] = [0.0] * (config.B_MACHINES if b_machines is None else b_machines)
+        self.a_queue = _make_queue(strategy, "A")
+        self.b_queue = _make_queue(strategy, "B")
+        # B 队列中的 H 数量（与 JobShop.h_in_b_system 相同）
+        self.h_in_b_system = 0
+        self.results: List[SimulationResult] = []
+        self.events_processed = 0
+        self._seq = 0
+        # 未来完工时刻（小根堆）；机器只在空闲后才会再次开工，因此 > now 的元素都是各机台当前的完工时刻
+        self._completions: List[float] = []
+
+    def run(self) -> List[SimulationResult]:
+        random.seed(global_seed(self.seed))
+        jobs = self.jobs
+        n_jobs = len(jobs)
+        completions = self._completions
+        idx = 0
+        now = 0.0
+        while True:
+            self.events_processed += 1
+            while idx < n_jobs and jobs[idx].arrival_time <= now:
+                self._dispatch_job(jobs[idx], now)
+                idx += 1
+            self._try_start_jobs(now)
+
+            next_arrival = jobs[idx].arrival_time if idx < n_jobs else float("inf")
+            while completions and completions[0] <= now:
+                heappop(completions)
+            next_event = min(next_arrival, completions[0] if completions else float("inf"))
+            if next_event == float("inf"):
+                # 没有未来事件：队列仍非空说明 B 机在为 H 预留，收尾时强制处理（同 JobShop）
+                if (len(self.a_queue) or len(self.b_queue)) and len(self.results) < n_jobs:
+                    self._force_process_remaining(now)
+                break
+            now = next_event
+        return self.results
+
+    # ------------------------------------------------------------------
+    def _next_h_arrival(self, now: float) -> Optional[float]:
+        i = bisect_right(self.h_arrivals, now)
+        return self.h_arrivals[i] if i < len(self.h_arrivals) else None
+
+    def _dispatch_job(self, job: Job, now: float) -> None:
+        if job.type_code == TYPE_H:
+            machine = "B"
+            self.h_in_b_system += 1
+        else:
+            machine = self.scheduler.decide_machine(
+                job, now,
+                a_queue_len=len(self.a_queue),
+                a_in_service=sum(1 for t in self.a_machines_busy_until if t > now),
+                b_queue_len=len(self.b_queue),
+                b_in_service=sum(1 for t in self.b_machines_busy_until if t > now),
+                next_h_arrival=self._next_h_arrival(now),
+                h_in_b_system=self.h_in_b_system,
+            )
+        self._seq += 1
+        (self.a_queue if machine == "A" else self.b_queue).push(job, self._seq)
+
+    def _should_b_wait_for_h(self, now: float) -> bool:
+        if self.strategy != STRATEGY_COST_COMPOSITE:
+            return False
+        next_h = self._next_h_arrival(now)
+        return next_h is not None and next_h - now <= self.scheduler.b_reservation_window
+
+    @staticmethod
+    def _idle(busy_until: List[float], now: float) -> Optional[int]:
+        for i, t in enumerate(busy_until):
+            if t <= now:
+                return i
+        return None
+
+    def _try_start_jobs(self, now: float) -> None:
+        a_busy, a_queue = self.a_machines_busy_until, self.a_queue
+        while len(a_queue):
+            idle = self._idle(a_busy, now)
+            if idle is None:
+                break
+            self._start_job(a_queue.pop(now), "A", idle, now)
+
+        b_busy, b_queue = self.b_machines_busy_until, self.b_queue
+        while len(b_queue):
+            idle = self._idle(b_busy, now)
+            if idle is None:
+                break
+            if self.h_in_b_system == 0 and self._should_b_wait_for_h(now):
+                break
+            job = b_queue.pop(now)
+            if job.type_code == TYPE_H:
+                self.h_in_b_system -= 1
+            self._start_job(job, "B", idle, now)
+
+    def _force_process_remaining(self, now: float) -> None:
+        """与 JobShop._force_process_remaining 相同：A、B 两组各自从 now 开始，每个作业派给最早空闲的机台。"""
+        for machine, queue, busy in (("A", self.a_queue, self.a_machines_busy_until),
+                                     ("B", self.b_queue, self.b_machines_busy_until)):
+            while len(queue):
+                t = max(now, min(busy))
+                job = queue.pop(t)
+                if job.type_code == TYPE_H and machine == "B":
+                    self.h_in_b_system -= 1
+                self._start_job(job, machine, self._idle(busy, t), t)
+
+    def _start_job(self, job: Job, machine: str, machine_index: int, now: float) -> float:
+        key = (job.job_id, machine)
+        duration = self._process_times.get(key)
+        if duration is None:
+            duration = self._process_times[key] = sample_process_time(self.seed, job, machine)
+        end_time = now + duration
+        if machine == "A":
+            self.a_machines_busy_until[machine_index] = end_time
+        else:
+            self.b_machines_busy_until[machine_index] = end_time
+        self._schedule_completion(end_time, now)
+        result = SimulationResult(job.job_id, job.job_type, job.arrival_time, now, end_time, job.due_date,
+                                  max(0.0, end_time - job.due_date), machine, machine_index)
+        self.results.append(result)
+        if self.sink is not None:
+            self.sink(result)
+        return end_time
+
+    def _schedule_completion(self, end_time: float, now: float) -> None:
+        heappush(self._completions, end_time)
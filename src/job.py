@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Union
+
+# 订单类型编码（与场景包 bundle.py 的 type 列一致）
+TYPE_H = 0
+TYPE_N = 1
+TYPE_NAMES = ("H", "N")
+TYPE_CODES = {"H": TYPE_H, "N": TYPE_N}
+
+# 与 data_loader 输出的作业字典对应的字段（按此顺序）
+JOB_FIELDS = ("job_id", "arrival_time", "job_type", "expected_duration", "due_date")
+
+
+class Job:
+    """
+    紧凑的作业记录（__slots__，无实例字典）。同一 Job 可被多个 JobShop 及其分支共享，进入仿真后不应再修改。
+
+    - type_code 为整数类型编码（TYPE_H / TYPE_N），热路径中比较整数而不是字符串；
+    - slack_key = due_date - expected_duration 为预计算的静态优先级键，
+      MinSLK 的松弛时间即 slack_key - now（与原先逐次计算的结果逐位相同）；
+    - 保留 job["due_date"]、dict(job)、job.keys() 等字典式访问，旧代码与外部脚本无需修改。
+    """
+    __slots__ = ("job_id", "arrival_time", "job_type", "type_code", "expected_duration", "due_date", "slack_key")
+
+    def __init__(self, job_id: int, arrival_time: float, job_type: str, expected_duration: float, due_date: float):
+        self.job_id = job_id
+        self.arrival_time = arrival_time
+        self.job_type = TYPE_NAMES[TYPE_CODES[job_type]]
+        self.type_code = TYPE_CODES[job_type]
+        self.expected_duration = expected_duration
+        self.due_date = due_date
+        self.slack_key = due_date - expected_duration
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any]) -> "Job":
+        return cls(data["job_id"], data["arrival_time"], data["job_type"], data["expected_duration"], data["due_date"])
+
+    @property
+    def is_h(self) -> bool:
+        return self.type_code == TYPE_H
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in JOB_FIELDS}
+
+    # ------------------------------------------------------------------
+    # 字典式访问（兼容旧接口）
+    # ------------------------------------------------------------------
+    def keys(self) -> tuple:
+        return JOB_FIELDS
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in JOB_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        """按字段修改（供修改副本的旧脚本使用），同步更新类型编码与静态优先级键。"""
+        if key not in JOB_FIELDS:
+            raise KeyError(key)
+        if key == "job_type":
+            self.type_code = TYPE_CODES[value]
+            value = TYPE_NAMES[self.type_code]
+        setattr(self, key, value)
+        self.slack_key = self.due_date - self.expected_duration
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in JOB_FIELDS else default
+
+    def __contains__(self, key: object) -> bool:
+        return key in JOB_FIELDS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(JOB_FIELDS)
+
+    def __len__(self) -> int:
+        return len(JOB_FIELDS)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Job):
+            return (self.job_id == other.job_id and self.arrival_time == other.arrival_time
+                    and self.type_code == other.type_code and self.expected_duration == other.expected_duration
+                    and self.due_date == other.due_date)
+        if isinstance(other, Mapping):
+            return self.to_dict() == dict(other)
+        return NotImplemented
+
+    __hash__ = None  # 与作业字典一致：按内容比较，不可哈希
+
+    def __repr__(self) -> str:
+        return (f"Job(job_id={self.job_id!r}, arrival_time={self.arrival_time!r}, job_type={self.job_type!r}, "
+                f"expected_duration={self.expected_duration!r}, due_date={self.due_date!r})")
+
+    def __getstate__(self) -> tuple:
+        return tuple(getattr(self, name) for name in JOB_FIELDS)
+
+    def __setstate__(self, state: tuple) -> None:
+        self.__init__(*state)
+
+
+JobLike = Union[Job, Mapping[str, Any]]
+
+
+def as_job(data: JobLike) -> Job:
+    """作业字典转为 Job；已是 Job 时原样返回（共享同一对象）。"""
+    return data if isinstance(data, Job) else Job.from_mapping(data)
+
+
+def to_jobs(jobs: Iterable[JobLike]) -> List[Job]:
+    return [j if isinstance(j, Job) else Job.from_mapping(j) for j in jobs]
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from . import config
+
+
+class LiveReporter:
+    """
+    工作进程侧的进度上报器，由 JobShop.enable_live_metrics 挂到仿真上。
+    挂上时立即推送一条初始快照，使主进程从运行开始就跟踪该 run_id（首次上报前卡住的运行也能被判为停滞）；
+    之后每处理 every_events 个事件检查一次墙钟，距上次上报超过 every_seconds 秒才推送一条快照，
+    因此上报频率与仿真速度无关，热循环中的开销只是一次整数比较。
+    """
+
+    def __init__(self, channel: Any, run_id: str, every_events: Optional[int] = None,
+                 every_seconds: Optional[float] = None):
+        self.channel = channel
+        self.run_id = str(run_id)
+        self.every_events = every_events or config.LIVE_METRICS_EVERY_EVENTS
+        self.every_seconds = config.LIVE_METRICS_INTERVAL if every_seconds is None else every_seconds
+        self._next_check = 0
+        self._final_sent = False
+
+    def attach(self, shop) -> None:
+        self._start_wall = self._last_wall = time.perf_counter()
+        self._last_events = shop.events_processed
+        self._next_check = shop.events_processed + self.every_events
+        self._seen = 0
+        self._tardiness = {"H": 0.0, "N": 0.0}
+        self._counts = {"H": 0, "N": 0}
+        self.report(shop)
+
+    def maybe_report(self, shop) -> None:
+        if shop.events_processed < self._next_check:
+            return
+        self._next_check = shop.events_processed + self.every_events
+        if time.perf_counter() - self._last_wall >= self.every_seconds:
+            self.report(shop)
+
+    def finish(self, shop) -> None:
+        """仿真结束时推送最终快照（只推送一次）。"""
+        if not self._final_sent:
+            self._final_sent = True
+            self.report(shop, final=True)
+
+    def report(self, shop, final: bool = False) -> None:
+        results = shop.results
+        if len(results) < self._seen:
+            # restore() 回退了结果列表，重新累计
+            self._seen = 0
+            self._tardiness = {"H": 0.0, "N": 0.0}
+            self._counts = {"H": 0, "N": 0}
+        for r in results[self._seen:]:
+            self._tardiness[r.job_type] += r.tardiness
+            self._counts[r.job_type] += 1
+        self._seen = len(results)
+
+        wall = time.perf_counter()
+        interval = wall - self._last_wall
+        horizon = shop.jobs[-1].arrival_time if shop.jobs else 0.0
+        sample = {
+            "run_id": self.run_id,
+            "pid": os.getpid(),
+            "final": final,
+            "events": shop.events_processed,
+            "sim_time": shop.clock,
+            # 以最后一个到达时刻为参照的仿真进度（在线模式下作业表会增长，仅供参考）
+            "progress": min(1.0, shop.clock / horizon) if horizon > 0 else None,
+            "jobs_started": len(results),
+            "jobs_total": len(shop.jobs),
+            "events_per_sec": (shop.events_processed - self._last_events) / interval if interval > 0 else 0.0,
+            "mean_tardiness_h": self._tardiness["H"] / self._counts["H"] if self._counts["H"] else 0.0,
+            "mean_tardiness_n": self._tardiness["N"] / self._counts["N"] if self._counts["N"] else 0.0,
+            "wall_time": wall - self._start_wall,
+        }
+        self._last_wall = wall
+        self._last_events = shop.events_processed
+        self.channel.put(sample)
+
+
+def format_sample(sample: Dict) -> str:
+    progress = f" ({sample['progress'] * 100:5.1f}%)" if sample.get("progress") is not None else ""
+    tag = " 完成" if sample.get("final") else ""
+    return (f"[{sample['run_id']}]{tag} 事件 {sample['events']:,} | 仿真时间 {sample['sim_time']:,.0f}{progress} | "
+            f"{sample['events_per_sec']:,.0f} 事件/s | 已开工 {sample['jobs_started']}/{sample['jobs_total']} | "
+            f"H拖期 {sample['mean_tardiness_h']:.2f} N拖期 {sample['mean_tardiness_n']:.2f}")
+
+
+class LiveMetrics:
+    """
+    主进程侧的实时指标通道。queue 可作为参数传给进程池任务（Manager 队列代理可序列化），
+    工作进程用 JobShop.enable_live_metrics(queue, run_id) 上报；后台线程接收快照，
+    打印到终端并逐行写入 JSON-lines 文件，同时对超过 stall_seconds 没有新上报的运行告警。
+
+    用法：with LiveMetrics("live.jsonl") as live: pool.map(task, [(live.queue, run_id, ...), ...])
+    """
+
+    def __init__(self, path: str | Path | None = None, echo: bool = True,
+                 stall_seconds: Optional[float] = None):
+        self.path = Path(path) if path is not None else None
+        self.echo = echo
+        self.stall_seconds = config.LIVE_METRICS_STALL_SECONDS if stall_seconds is None else stall_seconds
+        self._manager = multiprocessing.Manager()
+        self.queue = self._manager.Queue()
+        # run_id -> 最近一条快照；_updated 记录主进程收到的墙钟时刻
+        self.latest: Dict[str, Dict] = {}
+        self._updated: Dict[str, float] = {}
+        self._warned: set = set()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "LiveMetrics":
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="live-metrics", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self.queue.put(None)
+            self._thread.join()
+            self._thread = None
+        self._manager.shutdown()
+
+    def __enter__(self) -> "LiveMetrics":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def stalled(self, seconds: Optional[float] = None) -> List[str]:
+        """超过 seconds 秒没有新上报且尚未结束的运行。"""
+        limit = self.stall_seconds if seconds is None else seconds
+        now = time.monotonic()
+        return [run_id for run_id, t in self._updated.items()
+                if not self.latest[run_id].get("final") and now - t > limit]
+
+    def _run(self) -> None:
+        stream = self.path.open("a", encoding="utf-8") if self.path is not None else None
+        poll = max(0.5, min(5.0, self.stall_seconds / 4))
+        try:
+            while True:
+                try:
+                    sample = self.queue.get(timeout=poll)
+                except queue.Empty:
+                    self._check_stalled()
+                    continue
+                if sample is None:
+                    break
+                self.latest[sample["run_id"]] = sample
+                self._updated[sample["run_id"]] = time.monotonic()
+                self._warned.discard(sample["run_id"])
+                if stream is not None:
+                    stream.write(json.dumps(sample, ensure_ascii=False) + "\n")
+                    stream.flush()
+                if self.echo:
+                    print(format_sample(sample), flush=True)
+                self._check_stalled()
+        finally:
+            if stream is not None:
+                stream.close()
+
+    def _check_stalled(self) -> None:
+        for run_id in self.stalled():
+            if run_id not in self._warned:
+                self._warned.add(run_id)
+                print(f"[{run_id}] 警告：已超过 {self.stall_seconds:.0f}s 没有新的进度上报，可能停滞", flush=True)
@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import csv
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from . import config
+from .bundle import SharedScenario, make_shop
+from .replication import confidence_half_width, replication_seed
+from .scheduler import STRATEGY_COST_COMPOSITE, STRATEGY_EDD, STRATEGY_FCFS, STRATEGY_MINSLK, STRATEGY_OPT
+from .simulation_engine import SimulationResult, summarize_results
+from .surrogate import DEFAULT_BOUNDS
+
+# 目标 -> 方向（+1 越小越好，-1 越大越好）
+OBJECTIVES: Dict[str, int] = {
+    "mean_tardiness_h": 1,
+    "mean_tardiness_n": 1,
+    "b_utilization": -1,
+}
+
+# 各策略可调的参数（busy_threshold 只作用于 OPT，overflow_limit 只作用于 Cost_Based_Composite）
+TUNABLE_PARAMETERS: Dict[str, Tuple[str, ...]] = {
+    STRATEGY_OPT: ("reservation_window", "busy_threshold"),
+    STRATEGY_COST_COMPOSITE: ("reservation_window", "overflow_limit"),
+}
+# 无参数的基准策略各作为一个候选参与比较
+BASELINE_STRATEGIES = (STRATEGY_FCFS, STRATEGY_EDD, STRATEGY_MINSLK)
+_INTEGER_PARAMETERS = ("busy_threshold", "overflow_limit")
+
+
+def b_utilization(results: Sequence[SimulationResult], b_machines: int) -> float:
+    """B 机利用率：B 机加工总时长 / (B 机数 × 最后完工时刻)。"""
+    horizon = max((r.end_time for r in results), default=0.0)
+    if horizon <= 0 or b_machines <= 0:
+        return 0.0
+    busy = sum(r.end_time - r.start_time for r in results if r.machine == "B")
+    return busy / (b_machines * horizon)
+
+
+@dataclass
+class Candidate:
+    """一个候选配置（策略 + 参数）及其各次重复的目标值样本。"""
+    strategy: str
+    params: Dict[str, float] = field(default_factory=dict)
+    samples: Dict[str, List[float]] = field(default_factory=lambda: {m: [] for m in OBJECTIVES})
+    generation: int = 0
+    dropped: bool = False  # 已被提前淘汰（置信意义下被支配）
+
+    @property
+    def key(self) -> tuple:
+        return (self.strategy,) + tuple(sorted(self.params.items()))
+
+    @property
+    def label(self) -> str:
+        if not self.params:
+            return self.strategy
+        return self.strategy + "(" + ", ".join(f"{k}={v:g}" for k, v in sorted(self.params.items())) + ")"
+
+    @property
+    def replications(self) -> int:
+        return len(self.samples["mean_tardiness_h"])
+
+    def mean(self, objective: str) -> float:
+        values = self.samples[objective]
+        return sum(values) / len(values) if values else math.nan
+
+    def to_dict(self) -> Dict:
+        row = {"label": self.label, "strategy": self.strategy, "generation": self.generation,
+               "replications": self.replications, "dropped": self.dropped}
+        row.update(self.params)
+        row.update({m: self.mean(m) for m in OBJECTIVES})
+        return row
+
+
+def dominates(a: Candidate, b: Candidate) -> bool:
+    """按均值比较：a 在所有目标上不差于 b，且至少一个目标严格更好。"""
+    better = False
+    for m, direction in OBJECTIVES.items():
+        x, y = direction * a.mean(m), direction * b.mean(m)
+        if x > y:
+            return False
+        better = better or x < y
+    return better
+
+
+def confidently_dominates(a: Candidate, b: Candidate, confidence: float = config.REPLICATION_CONFIDENCE) -> bool:
+    """
+    考虑抽样误差后 a 仍支配 b：第 i 次重复对所有候选使用同一种子（公共随机数），因此按重复配对，
+    对每个目标求差值 a_i - b_i（按方向换算为越小越好）的均值置信区间，
+    所有目标的区间上端都不超过 0、且至少一个目标严格小于 0 时成立。
+    配对比较消去了种子带来的共同波动，远比分别比较两个置信区间灵敏。
+    """
+    n = min(a.replications, b.replications)
+    if n < 2:
+        return False
+    better = False
+    for m, direction in OBJECTIVES.items():
+        diffs = [direction * (x - y) for x, y in zip(a.samples[m][:n], b.samples[m][:n])]
+        upper = sum(diffs) / n + confidence_half_width(diffs, confidence)
+        if upper > 0:
+            return False
+        better = better or upper < 0
+    return better
+
+
+def _same_samples(a: Candidate, b: Candidate) -> bool:
+    n = min(a.replications, b.replications)
+    return n > 0 and all(a.samples[m][:n] == b.samples[m][:n] for m in OBJECTIVES)
+
+
+class ParetoArchive:
+    """
+    非支配存档：新成员被存档中任一成员支配、或与某成员目标值完全相同（参数不同但行为一致）时拒绝加入，
+    加入时移除被它支配的成员。
+    """
+
+    def __init__(self):
+        self.members: List[Candidate] = []
+
+    def add(self, candidate: Candidate) -> bool:
+        objectives = [candidate.mean(m) for m in OBJECTIVES]
+        if any(dominates(m, candidate) or [m.mean(o) for o in OBJECTIVES] == objectives for m in self.members):
+            return False
+        self.members = [m for m in self.members if not dominates(candidate, m)]
+        self.members.append(candidate)
+        return True
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def __iter__(self):
+        return iter(self.members)
+
+
+@dataclass
+class ParetoResult:
+    archive: ParetoArchive
+    candidates: List[Candidate]
+    simulations: int  # 实际运行的仿真次数
+    budget: int  # 不提前淘汰时需要的仿真次数
+
+    def rows(self) -> List[Dict]:
+        """全部候选的均值与参数，pareto 标记存档成员（可直接传给 visualizer.plot_pareto_front）。"""
+        front = {id(c) for c in self.archive}
+        return [dict(c.to_dict(), pareto=id(c) in front) for c in self.candidates]
+
+    def save_csv(self, path: str | Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        rows = self.rows()
+        columns = list(dict.fromkeys(k for row in rows for k in row))
+        with path.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+# ----------------------------------------------------------------------
+# 候选生成
+# ----------------------------------------------------------------------
+def _round_params(params: Dict[str, float]) -> Dict[str, float]:
+    return {k: (int(round(v)) if k in _INTEGER_PARAMETERS else round(float(v), 1)) for k, v in params.items()}
+
+
+def _initial_candidates(strategies: Sequence[str], n: int, rng: random.Random) -> List[Candidate]:
+    """第 0 代：各可调策略按拉丁超立方在 DEFAULT_BOUNDS 内取 n 个参数点，另加无参数的基准策略。"""
+    out = [Candidate(s) for s in strategies if s in BASELINE_STRATEGIES]
+    for strategy in strategies:
+        names = TUNABLE_PARAMETERS.get(strategy)
+        if not names:
+            continue
+        columns = {}
+        for name in names:
+            lo, hi = DEFAULT_BOUNDS[name]
+            cells = [(i + rng.random()) / n for i in range(n)]
+            rng.shuffle(cells)
+            columns[name] = [lo + c * (hi - lo) for c in cells]
+        out += [Candidate(strategy, _round_params({k: columns[k][i] for k in names})) for i in range(n)]
+    return out
+
+
+def _mutate(parent: Candidate, rng: random.Random, generation: int, scale: float = 0.15) -> Candidate:
+    """在父代参数附近做高斯扰动（标准差为取值范围的 scale 倍），截断到 DEFAULT_BOUNDS。"""
+    params = {}
+    for name, value in parent.params.items():
+        lo, hi = DEFAULT_BOUNDS[name]
+        params[name] = min(hi, max(lo, value + rng.gauss(0.0, scale * (hi - lo))))
+    return Candidate(parent.strategy, _round_params(params), generation=generation)
+
+
+# ----------------------------------------------------------------------
+# 并行评估
+# ----------------------------------------------------------------------
+def _evaluate(args: tuple) -> Dict[str, float]:
+    ref, strategy, params, index, live_channel, run_id = args
+    shop = make_shop(ref, strategy, seed=replication_seed(index), **params)
+    if live_channel is not None:
+        shop.enable_live_metrics(live_channel, run_id)
+    results = shop.run()
+    metrics = summarize_results(results)
+    metrics["b_utilization"] = b_utilization(results, len(shop.b_machines_busy_until))
+    return metrics
+
+
+def explore_pareto(jobs: List[Dict], strategies: Sequence[str] = (STRATEGY_OPT, STRATEGY_COST_COMPOSITE)
+                   + BASELINE_STRATEGIES, generations: int = config.PARETO_GENERATIONS,
+                   batch_size: int = config.PARETO_BATCH_SIZE,
+                   min_replications: int = config.PARETO_MIN_REPLICATIONS,
+                   max_replications: int = config.PARETO_MAX_REPLICATIONS,
+                   confidence: float = config.REPLICATION_CONFIDENCE, max_workers: Optional[int] = None,
+                   seed: int = config.RANDOM_SEED,
+                   progress: Optional[Callable[[int, List[Candidate], ParetoArchive], None]] = None,
+                   live_channel: Any = None) -> ParetoResult:
+    """
+    在策略参数空间上做多目标探索，维护 (H 平均拖期, N 平均拖期, B 机利用率) 的非支配存档。
+
+    每代候选（第 0 代拉丁超立方抽样，之后对存档成员做参数变异）按批次并行评估：
+    先为每个候选跑 min_replications 次独立重复，之后每批每个存活候选再加若干次重复（存活候选少时多加，以填满进程池）；
+    每批结束后，在置信区间意义下被存档成员或其他存活候选支配的候选立即淘汰，不再耗费仿真，
+    跑满 max_replications 次的候选按均值尝试进入存档。
+    live_channel 为 LiveMetrics.queue 时各次仿真实时上报进度，run_id 为 "候选标签#重复序号"。
+    """
+    rng = random.Random(seed)
+    archive = ParetoArchive()
+    candidates: List[Candidate] = []
+    seen = set()
+    simulations = 0
+    workers = max_workers or os.cpu_count() or 1
+
+    with SharedScenario(jobs, seed=replication_seed(0)) as scenario, \
+            ProcessPoolExecutor(max_workers=max_workers) as pool:
+        for generation in range(generations):
+            if generation == 0:
+                batch = _initial_candidates(strategies, batch_size, rng)
+            else:
+                parents = [m for m in archive if m.params] or [c for c in candidates if c.params]
+                if not parents:
+                    break
+                batch = [_mutate(rng.choice(parents), rng, generation) for _ in range(batch_size)]
+            batch = [c for c in batch if c.key not in seen]
+            seen.update(c.key for c in batch)
+            candidates += batch
+
+            alive = list(batch)
+            while alive:
+                # 首批补足 min_replications 次；之后每批每个存活候选加重复，存活候选少时多加几次以填满进程池
+                step = max(1, -(-workers // len(alive)))
+                tasks = []
+                for c in alive:
+                    count = min_replications - c.replications if c.replications < min_replications else step
+                    count = min(count, max_replications - c.replications)
+                    tasks += [(c, c.replications + i) for i in range(count)]
+                outcomes = pool.map(_evaluate, [(scenario.ref, c.strategy, c.params, i, live_channel, f"{c.label}#{i}")
+                                                for c, i in tasks])
+                for (c, _), metrics in zip(tasks, outcomes):
+                    for m in OBJECTIVES:
+                        c.samples[m].append(metrics[m])
+                simulations += len(tasks)
+
+                rivals = list(archive) + [c for c in alive if c.replications >= min_replications]
+                for c in alive:
+                    if c.replications < min_replications:
+                        continue
+                    # 被置信支配，或与排在前面的候选各次重复结果完全相同（参数不同但行为一致）
+                    earlier = rivals[:rivals.index(c)]
+                    if any(r is not c and confidently_dominates(r, c, confidence) for r in rivals) \
+                            or any(_same_samples(r, c) for r in earlier):
+                        c.dropped = True
+                finished = [c for c in alive if not c.dropped and c.replications >= max_replications]
+                for c in finished:
+                    archive.add(c)
+                alive = [c for c in alive if not c.dropped and c.replications < max_replications]
+            if progress is not None:
+                progress(generation, batch, archive)
+
+    return ParetoResult(archive, candidates, simulations, len(candidates) * max_replications)
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import pickle
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# 节点执行位置
+KIND_PROCESS = "process"  # CPU 密集（仿真）：进程池
+KIND_THREAD = "thread"    # I/O 为主（报告、导出）：线程池
+KIND_MAIN = "main"        # 必须在主线程执行（matplotlib 绘图）
+
+
+def file_digest(path: str | Path) -> str:
+    """文件内容的 sha256，用作数据/代码输入的指纹。"""
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class Node:
+    name: str
+    func: Callable[..., Any]
+    deps: List[str] = field(default_factory=list)
+    kind: str = KIND_THREAD
+    # 节点自身的输入指纹（参数、数据文件哈希等）；最终缓存键还会叠加全部上游节点的键
+    key: Any = None
+    # 节点产出的文件；任一缺失时即使键未变也会重跑
+    outputs: List[Path] = field(default_factory=list)
+
+
+class Pipeline:
+    """
+    小型依赖图执行器。
+
+    - 节点按依赖拓扑执行，互不依赖的节点并发运行（进程池/线程池/主线程）；
+    - 每个节点以 func(*上游结果) 调用，结果按缓存键持久化到 cache_dir；
+    - 重跑时若节点缓存键未变且产出文件齐全，则直接读取缓存结果并跳过；
+    - inline=True 时全部节点在主线程按拓扑顺序串行执行（剖析模式用，计时器只统计本进程）。
+    """
+
+    def __init__(self, cache_dir: str | Path | None = None, max_workers: int | None = None,
+                 inline: bool = False):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_workers = max_workers
+        self.inline = inline
+        self.nodes: Dict[str, Node] = {}
+        self.executed: List[str] = []
+        self.skipped: List[str] = []
+
+    def add(self, name: str, func: Callable[..., Any], deps: List[str] | tuple = (),
+            kind: str = KIND_THREAD, key: Any = None, outputs: List[str | Path] | tuple = ()) -> str:
+        if name in self.nodes:
+            raise ValueError(f"节点重复：{name}")
+        for dep in deps:
+            if dep not in self.nodes:
+                raise ValueError(f"节点 {name} 依赖未定义的节点 {dep}")
+        self.nodes[name] = Node(name, func, list(deps), kind, key, [Path(p) for p in outputs])
+        return name
+
+    def has(self, name: str) -> bool:
+        return name in self.nodes
+
+    # ------------------------------------------------------------------
+    # 缓存
+    # ------------------------------------------------------------------
+    def _cache_key(self, node: Node, keys: Dict[str, str]) -> str:
+        return _digest([node.name, node.key, [keys[d] for d in node.deps]])
+
+    def _cache_path(self, node: Node) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in node.name)
+        return self.cache_dir / f"{safe}.pkl"
+
+    def _load_cached(self, node: Node, key: str) -> tuple[bool, Any]:
+        path = self._cache_path(node)
+        if path is None or not path.exists():
+            return False, None
+        if any(not p.exists() for p in node.outputs):
+            return False, None
+        try:
+            with path.open("rb") as f:
+                cached_key, value = pickle.load(f)
+        except Exception:
+            return False, None
+        if cached_key != key:
+            return False, None
+        return True, value
+
+    def _store(self, node: Node, key: str, value: Any) -> None:
+        path = self._cache_path(node)
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with tmp.open("wb") as f:
+            pickle.dump((key, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(path)
+
+    # ------------------------------------------------------------------
+    # 执行
+    # ------------------------------------------------------------------
+    def run(self) -> Dict[str, Any]:
+        """执行全部节点，返回 {节点名: 结果}。"""
+        results: Dict[str, Any] = {}
+        keys: Dict[str, str] = {}
+        pending = dict(self.nodes)
+        running: Dict[Future, tuple[Node, str]] = {}
+        self.executed, self.skipped = [], []
+
+        process_pool = ProcessPoolExecutor(max_workers=self.max_workers) \
+            if not self.inline and any(n.kind == KIND_PROCESS for n in self.nodes.values()) else None
+        thread_pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        pools: Dict[str, Executor] = {KIND_THREAD: thread_pool}
+        if process_pool is not None:
+            pools[KIND_PROCESS] = process_pool
+
+        try:
+            while pending or running:
+                progressed = False
+                for name, node in list(pending.items()):
+                    if any(dep not in results for dep in node.deps):
+                        continue
+                    del pending[name]
+                    progressed = True
+                    key = self._cache_key(node, keys)
+                    keys[name] = key
+                    hit, value = self._load_cached(node, key)
+                    if hit:
+                        results[name] = value
+                        self.skipped.append(name)
+                        continue
+                    args = [results[d] for d in node.deps]
+                    if node.kind == KIND_MAIN or self.inline:
+                        self._finish(node, key, node.func(*args), results)
+                    else:
+                        running[pools[node.kind].submit(node.func, *args)] = (node, key)
+
+                if progressed:
+                    # 新完成的节点可能解锁了其他节点，先继续调度
+                    continue
+                if not running:
+                    missing = ", ".join(sorted(pending))
+                    raise RuntimeError(f"依赖图存在环或未满足的依赖：{missing}")
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    node, key = running.pop(future)
+                    self._finish(node, key, future.result(), results)
+        finally:
+            thread_pool.shutdown(wait=True, cancel_futures=True)
+            if process_pool is not None:
+                process_pool.shutdown(wait=True, cancel_futures=True)
+        return results
+
+    def _finish(self, node: Node, key: str, value: Any, results: Dict[str, Any]) -> None:
+        results[node.name] = value
+        self.executed.append(node.name)
+        self._store(node, key, value)
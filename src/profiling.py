@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import cProfile
+import functools
+import threading
+import time
+import unicodedata
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List
+
+# 计时组件
+COMPONENT_DISPATCH = "dispatch"
+COMPONENT_QUEUE = "queue_sort_pop"
+COMPONENT_SAMPLING = "process_time_sampling"
+COMPONENT_EVENT = "event_selection"
+COMPONENT_RECORD = "result_recording"
+COMPONENT_EXPORT = "export"
+COMPONENT_PLOT = "plotting"
+
+COMPONENT_LABELS = {
+    COMPONENT_DISPATCH: "派工决策",
+    COMPONENT_QUEUE: "队列排序/出队",
+    COMPONENT_SAMPLING: "加工时间采样",
+    COMPONENT_EVENT: "事件选择/开工判断",
+    COMPONENT_RECORD: "结果记录",
+    COMPONENT_EXPORT: "结果导出",
+    COMPONENT_PLOT: "绘图",
+}
+
+# 关闭时每次调用只多一次全局变量判断，可常驻在热点函数上
+ENABLED = False
+
+# 组件 -> [独占耗时, 调用次数, 含子调用耗时]
+_TOTALS: Dict[str, List[float]] = {}
+_local = threading.local()
+
+
+def enable() -> None:
+    global ENABLED
+    ENABLED = True
+
+
+def disable() -> None:
+    global ENABLED
+    ENABLED = False
+
+
+def reset() -> None:
+    _TOTALS.clear()
+
+
+def timed(component: str) -> Callable:
+    """
+    组件计时装饰器。嵌套调用按独占时间统计（子组件的耗时从父组件中扣除），
+    因此各组件耗时之和不会重复计算。
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+            stack = getattr(_local, "stack", None)
+            if stack is None:
+                stack = _local.stack = []
+            frame = [time.perf_counter(), 0.0]
+            stack.append(frame)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - frame[0]
+                stack.pop()
+                if stack:
+                    stack[-1][1] += elapsed
+                record = _TOTALS.get(component)
+                if record is None:
+                    record = _TOTALS[component] = [0.0, 0, 0.0]
+                record[0] += elapsed - frame[1]
+                record[1] += 1
+                record[2] += elapsed
+        return wrapper
+    return decorator
+
+
+def summary() -> Dict[str, Dict[str, float]]:
+    return {name: {"exclusive": r[0], "calls": r[1], "inclusive": r[2]} for name, r in _TOTALS.items()}
+
+
+def _pad(text: str, width: int, left: bool = True) -> str:
+    """按终端显示宽度补空格（中文字符占两列）。"""
+    shown = sum(2 if unicodedata.east_asian_width(c) in "WF" else 1 for c in text)
+    fill = " " * max(0, width - shown)
+    return text + fill if left else fill + text
+
+
+def format_summary(wall_time: float) -> str:
+    """组件耗时汇总表（按独占耗时降序）；"其他" 为未计时部分。"""
+    lines = [
+        " ".join([_pad("组件", 20), _pad("调用次数", 10, False), _pad("独占耗时(s)", 12, False),
+                  _pad("含子调用(s)", 12, False), _pad("占比", 8, False)]),
+        "-" * 68,
+    ]
+    covered = 0.0
+    for name, r in sorted(_TOTALS.items(), key=lambda kv: -kv[1][0]):
+        covered += r[0]
+        share = r[0] / wall_time * 100 if wall_time > 0 else 0.0
+        label = COMPONENT_LABELS.get(name, name)
+        lines.append(f"{_pad(label, 20)} {r[1]:>10d} {r[0]:>12.4f} {r[2]:>12.4f} {share:>7.1f}%")
+    other = max(0.0, wall_time - covered)
+    share = other / wall_time * 100 if wall_time > 0 else 0.0
+    lines.append(f"{_pad('其他', 20)} {'':>10} {other:>12.4f} {'':>12} {share:>7.1f}%")
+    lines.append("-" * 68)
+    lines.append(f"{_pad('总耗时', 20)} {'':>10} {wall_time:>12.4f}")
+    return "\n".join(lines)
+
+
+@contextmanager
+def profile_session(output_dir: str | Path, name: str, use_cprofile: bool = True) -> Iterator[None]:
+    """
+    剖析会话：期间开启组件计时（并可同时运行 cProfile），结束后写出
+    {name}.prof（可用 pstats / snakeviz 查看）与 {name}_profile.txt 汇总表，并打印汇总表。
+    cProfile 本身有开销，各组件的绝对耗时会偏大，但相对占比仍可用于定位热点。
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    reset()
+    enable()
+    profiler = cProfile.Profile() if use_cprofile else None
+    start = time.perf_counter()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        wall = time.perf_counter() - start
+        disable()
+        table = format_summary(wall)
+        if profiler is not None:
+            profiler.dump_stats(str(output_dir / f"{name}.prof"))
+        (output_dir / f"{name}_profile.txt").write_text(table + "\n", encoding="utf-8")
+        print("=" * 68)
+        print(f"剖析汇总（{name}）")
+        print(table)
+        print(f"剖析文件：{output_dir / (name + '.prof') if profiler is not None else '（未启用 cProfile）'}")
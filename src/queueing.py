@@ -0,0 +1,363 @@
+from __future__ import annotations
+
+import heapq
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from . import config
+from .job import TYPE_H, to_jobs
+from .rng import Seed
+from .scheduler import STRATEGY_COST_COMPOSITE, STRATEGY_OPT, STRATEGY_ROLLOUT
+from .simulation_engine import sample_process_time
+
+# 预筛结论
+SCREEN_INFEASIBLE = "infeasible"  # 超出目标（screen_bound：由下界证明，无需仿真；screen_estimate：仅为估计）
+SCREEN_FEASIBLE = "feasible"      # 解析估计满足目标（仅为估计，仍需仿真确认）
+SCREEN_BORDERLINE = "borderline"  # 无法判定，需要 JobShop 仿真确认
+
+# 为 H 预留 B 机的策略：N 类基本只去 A
+_RESERVING_STRATEGIES = (STRATEGY_OPT, STRATEGY_COST_COMPOSITE, STRATEGY_ROLLOUT)
+
+
+def triangular_moments(params: tuple) -> tuple[float, float]:
+    """三角分布 (a, c, b) 的均值与平方变异系数 SCV = Var / E²。"""
+    a, c, b = params
+    mean = (a + b + c) / 3.0
+    var = (a * a + b * b + c * c - a * b - a * c - b * c) / 18.0
+    return mean, var / (mean * mean)
+
+
+def erlang_c(servers: int, rho: float) -> float:
+    """M/M/c 的等待概率（Erlang C），rho 为单机利用率。"""
+    if rho >= 1.0:
+        return 1.0
+    offered = servers * rho
+    term = 1.0
+    total = 1.0
+    for k in range(1, servers):
+        term *= offered / k
+        total += term
+    term *= offered / servers
+    tail = term / (1.0 - rho)
+    return tail / (total + tail)
+
+
+@dataclass
+class ClassStream:
+    """单一订单类别的到达流统计。"""
+    rate: float = 0.0  # 到达率（个/分钟）
+    scv: float = 1.0   # 到达间隔平方变异系数
+    mean_slack: float = 0.0  # 平均交货期余量：due_date - arrival_time
+    count: int = 0
+
+
+def arrival_stream(jobs: List[Dict], job_type: str, compression_factor: float = 1.0) -> ClassStream:
+    """从作业列表估计某类订单的到达率与到达间隔 SCV；compression_factor 同 run_sensitivity 的到达压缩。"""
+    times = sorted(j["arrival_time"] * compression_factor for j in jobs if j["job_type"] == job_type)
+    slacks = [j["due_date"] - j["arrival_time"] for j in jobs if j["job_type"] == job_type]
+    if len(times) < 2:
+        return ClassStream(count=len(times), mean_slack=sum(slacks) / len(slacks) if slacks else 0.0)
+    gaps = [b - a for a, b in zip(times, times[1:])]
+    mean_gap = sum(gaps) / len(gaps)
+    if mean_gap <= 0:
+        return ClassStream(rate=math.inf, scv=1.0, mean_slack=sum(slacks) / len(slacks), count=len(times))
+    var_gap = sum((g - mean_gap) ** 2 for g in gaps) / len(gaps)
+    return ClassStream(
+        rate=1.0 / mean_gap,
+        scv=var_gap / (mean_gap * mean_gap),
+        mean_slack=sum(slacks) / len(slacks),
+        count=len(times),
+    )
+
+
+@dataclass
+class QueueEstimate:
+    """解析估计结果：各类订单的平均等待与平均拖期（分钟）。"""
+    a_utilization: float
+    b_utilization: float
+    n_to_b_fraction: float
+    wait_h: float
+    wait_n: float
+    tardiness_h: float
+    tardiness_n: float
+    stable: bool
+    details: Dict[str, float] = field(default_factory=dict)
+
+
+def _allen_cunneen_wait(servers: int, rho: float, mean_service: float, ca2: float, cs2: float) -> float:
+    """Allen–Cunneen 近似 Wq ≈ (Ca² + Cs²)/2 · Wq(M/M/c)；rho >= 1 时稳态不存在，返回 0（由流体项接管）。"""
+    if rho <= 0 or rho >= 1.0:
+        return 0.0
+    mmc = erlang_c(servers, rho) * mean_service / (servers * (1.0 - rho))
+    return (ca2 + cs2) / 2.0 * mmc
+
+
+def _fluid_wait(stream: List[tuple], servers: int) -> float:
+    """
+    按实际到达序列的确定性流体近似：工作量以期望加工时间到达、以 servers 台的速率排空，
+    返回目标类别到达时刻的平均积压/servers。能反映到达的阶段性集中与 rho >= 1 时的积压增长，
+    而稳态公式只看平均到达率。stream 元素为 (到达时间, 期望工作量, 是否计入平均)，须按时间排序。
+    """
+    backlog = 0.0
+    last = None
+    total = 0.0
+    count = 0
+    for t, work, counted in stream:
+        if last is not None:
+            backlog = max(0.0, backlog - servers * (t - last))
+        last = t
+        if counted:
+            total += backlog / servers
+            count += 1
+        backlog += work
+    return total / count if count else 0.0
+
+
+def _expected_tardiness(wait: float, p_wait: float, mean_service: float, slack: float) -> float:
+    """
+    等待时间取"以 p_wait 概率等待、等待时长服从均值 wait/p_wait 的指数分布"的近似，
+    拖期 = (等待 + 加工 - 余量)^+，加工时间取均值。
+    """
+    margin = slack - mean_service
+    if wait <= 0 or p_wait <= 0:
+        return max(0.0, -margin)
+    theta = wait / p_wait
+    if margin <= 0:
+        return wait - margin
+    return p_wait * theta * math.exp(-margin / theta)
+
+
+def _b_mixture(h: ClassStream, n: ClassStream, f: float) -> tuple[float, float, float, float]:
+    """B 组合并流（H 全部 + 比例 f 的 N）的到达率、平均加工时间、加工时间 SCV 与到达间隔 SCV。"""
+    mean_bn, scv_bn = triangular_moments(config.TRIANGULAR_B_N)
+    mean_bh, scv_bh = triangular_moments(config.TRIANGULAR_B_H)
+    lam_bh = h.rate
+    lam_bn = n.rate * f
+    lam_b = lam_bh + lam_bn
+    if lam_b <= 0:
+        return 0.0, mean_bh, scv_bh, h.scv
+    mean_b = (lam_bh * mean_bh + lam_bn * mean_bn) / lam_b
+    # 混合加工时间的二阶矩 → SCV
+    m2 = (lam_bh * mean_bh ** 2 * (1 + scv_bh) + lam_bn * mean_bn ** 2 * (1 + scv_bn)) / lam_b
+    # 随机拆分后的到达流 SCV：p·Ca² + (1-p)
+    ca2_b = (lam_bh * h.scv + lam_bn * (f * n.scv + 1.0 - f)) / lam_b
+    return lam_b, mean_b, m2 / (mean_b * mean_b) - 1.0, ca2_b
+
+
+def _mmc_distribution(servers: int, rho: float, tol: float = 1e-10) -> List[float]:
+    """M/M/c 稳态在系统数分布 P(L = k)，截断到尾部概率 < tol（要求 rho < 1）。"""
+    offered = servers * rho
+    head = [1.0]
+    for k in range(1, servers + 1):
+        head.append(head[-1] * offered / k)
+    total = sum(head) + head[-1] * rho / (1.0 - rho)
+    probs = [t / total for t in head]
+    mass = sum(probs)
+    while 1.0 - mass > tol and probs[-1] > 0:
+        probs.append(probs[-1] * rho)
+        mass += probs[-1]
+    return probs
+
+
+def _prob_at_least(p_a: List[float], p_b: List[float]) -> float:
+    """独立的 L_A、L_B 下 P(L_A >= L_B)。"""
+    below = 0.0  # P(L_A < k)
+    out = 0.0
+    for k, q in enumerate(p_b):
+        out += q * (1.0 - below)
+        if k < len(p_a):
+            below += p_a[k]
+    return out
+
+
+def balanced_n_split(h: ClassStream, n: ClassStream, a_machines: int, b_machines: int) -> float:
+    """
+    基准策略下 N 类去 B 的比例。基准规则在 N 到达时比较两组的在系统数（排队 + 在制，不按台数折算），
+    A 不少于 B 时去 B，因此 f = P(L_A >= L_B)（泊松到达看到时间平均）。两组各按 M/M/c 近似、相互独立，
+    右端随 f 递减，二分求不动点；某组超载时按在系统数的增长速率比较。
+    """
+    if n.rate <= 0:
+        return 0.0
+    mean_an, _ = triangular_moments(config.TRIANGULAR_A_N)
+
+    def excess(f: float) -> float:
+        lam_a = n.rate * (1.0 - f)
+        rho_a = lam_a * mean_an / a_machines
+        lam_b, mean_b, _, _ = _b_mixture(h, n, f)
+        rho_b = lam_b * mean_b / b_machines
+        if rho_a >= 1.0 or rho_b >= 1.0:
+            growth_a = lam_a - a_machines / mean_an
+            growth_b = lam_b - b_machines / mean_b
+            return (1.0 if growth_a >= growth_b else 0.0) - f
+        if lam_a <= 0:
+            return -f
+        return _prob_at_least(_mmc_distribution(a_machines, rho_a), _mmc_distribution(b_machines, rho_b)) - f
+
+    lo, hi = 0.0, 1.0
+    for _ in range(40):
+        mid = (lo + hi) / 2.0
+        if excess(mid) > 0:
+            lo = mid
+        else:
+            hi = mid
+    return (lo + hi) / 2.0
+
+
+def n_split_for_strategy(strategy: str, h: ClassStream, n: ClassStream,
+                         a_machines: int, b_machines: int) -> float:
+    if strategy in _RESERVING_STRATEGIES:
+        return 0.0
+    return balanced_n_split(h, n, a_machines, b_machines)
+
+
+def estimate_queue(jobs: List[Dict], strategy: str = STRATEGY_COST_COMPOSITE,
+                   a_machines: int = config.A_MACHINES, b_machines: int = config.B_MACHINES,
+                   compression_factor: float = 1.0,
+                   n_to_b_fraction: Optional[float] = None) -> QueueEstimate:
+    """
+    不做仿真，用多服务台排队近似估计 H/N 的平均等待与拖期。
+
+    - A 组：c = a_machines 的 M/G/c（G/G/c 经 Allen–Cunneen 修正），只服务 N；
+    - B 组：c = b_machines，H 对 N 非抢占优先。先按合并流求 FCFS 等待，再用
+      Wq_k = Wq·(1-ρ) / ((1-σ_{k-1})(1-σ_k)) 分摊到各优先级（M/M/c 等服务率时精确）；
+    - 各组等待取稳态近似与按实际到达序列的流体积压二者中较大者，以覆盖到达集中和超载时段；
+    - 加工时间矩取自 config 中的三角分布参数；N 去 B 的比例缺省按策略推断。
+    """
+    h = arrival_stream(jobs, "H", compression_factor)
+    n = arrival_stream(jobs, "N", compression_factor)
+    arrivals = sorted((j["arrival_time"] * compression_factor, j["job_type"]) for j in jobs)
+
+    if n_to_b_fraction is None:
+        n_to_b_fraction = n_split_for_strategy(strategy, h, n, a_machines, b_machines)
+    f = n_to_b_fraction
+
+    mean_an, scv_an = triangular_moments(config.TRIANGULAR_A_N)
+    mean_bn, _ = triangular_moments(config.TRIANGULAR_B_N)
+    mean_bh, scv_bh = triangular_moments(config.TRIANGULAR_B_H)
+
+    # ---- A 组：N 类 ----
+    lam_a = n.rate * (1.0 - f)
+    rho_a = lam_a * mean_an / a_machines if a_machines > 0 else math.inf
+    # 随机拆分后的到达流 SCV：p·Ca² + (1-p)
+    ca2_a = (1.0 - f) * n.scv + f
+    p_wait_a = erlang_c(a_machines, rho_a) if lam_a > 0 else 0.0
+    wait_a = 0.0
+    if lam_a > 0:
+        fluid_a = _fluid_wait([(t, (1.0 - f) * mean_an, True) for t, k in arrivals if k == "N"], a_machines)
+        wait_a = max(_allen_cunneen_wait(a_machines, rho_a, mean_an, ca2_a, scv_an), fluid_a)
+
+    # ---- B 组：为 H 预留的策略下 H 非抢占优先，其余策略两类按同一队列排队 ----
+    lam_bh = h.rate
+    lam_bn = n.rate * f
+    lam_b, mean_b, scv_b, ca2_b = _b_mixture(h, n, f)
+    rho_b = lam_b * mean_b / b_machines if b_machines > 0 else math.inf
+    sigma_h = lam_bh * mean_bh / b_machines if b_machines > 0 else math.inf
+    p_wait_b = erlang_c(b_machines, rho_b) if lam_b > 0 else 0.0
+    fcfs = _allen_cunneen_wait(b_machines, rho_b, mean_b, ca2_b, scv_b) if rho_b < 1.0 else 0.0
+    b_stream = [(t, mean_bh if k == "H" else f * mean_bn, k == "H") for t, k in arrivals if k == "H" or f > 0]
+    fluid_bn = _fluid_wait([(t, w, not is_h) for t, w, is_h in b_stream], b_machines) if lam_bn > 0 else 0.0
+
+    if strategy in _RESERVING_STRATEGIES:
+        # 稳态部分：合并流 FCFS 等待按 Wq_k = Wq·(1-ρ)/((1-σ_{k-1})(1-σ_k)) 分摊
+        if rho_b < 1.0:
+            ac_bh = fcfs * (1.0 - rho_b) / (1.0 - sigma_h)
+            ac_bn = fcfs / (1.0 - sigma_h)  # σ_2 = ρ
+        elif sigma_h < 1.0:
+            ac_bh = _allen_cunneen_wait(b_machines, sigma_h, mean_bh, h.scv, scv_bh)
+            ac_bn = 0.0
+        else:
+            ac_bh = ac_bn = 0.0
+        # 流体部分：H 只看到 H 的积压（优先级），N 看到全部积压
+        wait_bh = max(ac_bh, _fluid_wait([x for x in b_stream if x[2]], b_machines)) if lam_bh > 0 else 0.0
+        wait_bn = 0.0
+        if lam_bn > 0:
+            wait_bn = math.inf if sigma_h >= 1.0 else max(ac_bn, fluid_bn)
+    else:
+        # 不分类别：H、N 都等待合并流的 FCFS 等待，并看到全部积压
+        wait_bh = max(fcfs, _fluid_wait(b_stream, b_machines)) if lam_bh > 0 else 0.0
+        wait_bn = max(fcfs, fluid_bn) if lam_bn > 0 else 0.0
+
+    tard_h = _expected_tardiness(wait_bh, p_wait_b, mean_bh, h.mean_slack)
+    tard_an = _expected_tardiness(wait_a, p_wait_a, mean_an, n.mean_slack) if lam_a > 0 else 0.0
+    tard_bn = _expected_tardiness(wait_bn, p_wait_b, mean_bn, n.mean_slack) if lam_bn > 0 else 0.0
+
+    return QueueEstimate(
+        a_utilization=rho_a,
+        b_utilization=rho_b,
+        n_to_b_fraction=f,
+        wait_h=wait_bh,
+        wait_n=(1.0 - f) * wait_a + f * wait_bn,
+        tardiness_h=tard_h,
+        tardiness_n=(1.0 - f) * tard_an + f * tard_bn,
+        stable=rho_a < 1.0 and rho_b < 1.0,
+        details={
+            "h_rate": h.rate, "n_rate": n.rate,
+            "h_arrival_scv": h.scv, "n_arrival_scv": n.scv,
+            "a_wait_probability": p_wait_a, "b_wait_probability": p_wait_b,
+        },
+    )
+
+
+def screen_estimate(estimate: QueueEstimate, h_target: float, margin: float = 0.5) -> str:
+    """
+    按解析估计粗分场景：H 平均拖期估计 > h_target·(1+margin) 为估计超标，< h_target·(1-margin) 为估计达标，
+    其余为边界场景。估计既不保守也不乐观，只能用来安排仿真顺序，不能据此跳过仿真（见 screen_bound）。
+    """
+    if estimate.tardiness_h > h_target * (1.0 + margin):
+        return SCREEN_INFEASIBLE
+    if estimate.tardiness_h < h_target * (1.0 - margin):
+        return SCREEN_FEASIBLE
+    return SCREEN_BORDERLINE
+
+
+def h_tardiness_lower_bound(jobs: List[Dict], b_machines: int = config.B_MACHINES,
+                            compression_factor: float = 1.0, seed: Seed = config.RANDOM_SEED) -> float:
+    """
+    任意策略下 H 类平均拖期的下界，对该订单集在 seed 下实际采样的加工时间严格成立。
+
+    H 只能在 B 机加工，N 占用 B 机、预留空等与不可抢占只会推迟 H 的完工，因此只看 H：
+    - 单个作业：拖期 >= (到达 + 加工 - 交货期)^+；
+    - 整体：c 台 B 机上的任一排程都是一台 c 倍速可抢占机器上的可行排程，
+      该松弛下 SRPT 的第 k 个完工时刻不晚于任一排程的第 k 个完工时刻，
+      升序完工时刻与升序交货期逐一配对即得总拖期下界。
+    返回两者中较大者（除以 H 订单数）。到达压缩与 run_sensitivity 相同：交货期余量保持不变。
+    """
+    h_jobs = []
+    for job in to_jobs(jobs):
+        if job.type_code == TYPE_H:
+            arrival = job.arrival_time * compression_factor
+            h_jobs.append((arrival, arrival + job.due_date - job.arrival_time, sample_process_time(seed, job, "B")))
+    if not h_jobs:
+        return 0.0
+    h_jobs.sort()
+    per_job = sum(max(0.0, r + p - d) for r, d, p in h_jobs)
+
+    # c 倍速单机上的抢占式 SRPT
+    completions = []
+    pending: List[float] = []
+    now = 0.0
+    i = 0
+    while i < len(h_jobs) or pending:
+        if not pending:
+            now = max(now, h_jobs[i][0])
+        while i < len(h_jobs) and h_jobs[i][0] <= now:
+            heapq.heappush(pending, h_jobs[i][2])
+            i += 1
+        work = heapq.heappop(pending)
+        next_release = h_jobs[i][0] if i < len(h_jobs) else math.inf
+        finish = now + work / b_machines
+        if finish <= next_release:
+            now = finish
+            completions.append(now)
+        else:
+            heapq.heappush(pending, work - (next_release - now) * b_machines)
+            now = next_release
+    dues = sorted(d for _, d, _ in h_jobs)
+    relaxed = sum(max(0.0, c - d) for c, d in zip(completions, dues))
+    return max(per_job, relaxed) / len(h_jobs)
+
+
+def screen_bound(lower_bound: float, h_target: float) -> str:
+    """按 H 拖期下界判断：下界已超过目标时可证明不可行，跳过仿真；否则需要仿真（无法证明可行）。"""
+    return SCREEN_INFEASIBLE if lower_bound > h_target else SCREEN_BORDERLINE
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Sequence
+
+from . import config
+from .bundle import SharedScenario, make_shop
+from .rng import PURPOSE_REPLICATION, Seed, root_sequence
+from .simulation_engine import summarize_results
+
+METRICS = ("mean_tardiness_h", "mean_tardiness_n")
+
+
+def replication_seed(index: int) -> Seed:
+    """
+    第 index 次重复的种子。第 0 次即 config.RANDOM_SEED（旧版种子），与单次运行的已发布结果一致；
+    其余各次为根种子序列按 ("replication", index) 派生的独立流。
+    """
+    if index == 0:
+        return config.RANDOM_SEED
+    return root_sequence().child(PURPOSE_REPLICATION, index)
+
+
+def t_quantile(p: float, df: int) -> float:
+    """
+    Student t 分布分位数的近似（Cornish–Fisher 展开），df >= 5 时相对误差约 1e-3 以内，df 越大越准。
+    避免为一个分位数引入 scipy。
+    """
+    z = NormalDist().inv_cdf(p)
+    if df <= 0:
+        return math.inf
+    z3, z5, z7 = z ** 3, z ** 5, z ** 7
+    return (z
+            + (z3 + z) / (4 * df)
+            + (5 * z5 + 16 * z3 + 3 * z) / (96 * df ** 2)
+            + (3 * z7 + 19 * z5 + 17 * z3 - 15 * z) / (384 * df ** 3))
+
+
+def confidence_half_width(samples: Sequence[float], confidence: float = config.REPLICATION_CONFIDENCE) -> float:
+    n = len(samples)
+    if n < 2:
+        return math.inf
+    mean = sum(samples) / n
+    var = sum((x - mean) ** 2 for x in samples) / (n - 1)
+    return t_quantile(0.5 + confidence / 2.0, n - 1) * math.sqrt(var / n)
+
+
+@dataclass
+class MetricEstimate:
+    mean: float
+    half_width: float
+    target: float
+
+    @property
+    def converged(self) -> bool:
+        return self.half_width <= self.target
+
+
+@dataclass
+class ReplicationSummary:
+    """重复仿真汇总：各指标的均值、置信区间半宽与是否达到目标。"""
+    strategy: str
+    replications: int
+    estimates: Dict[str, MetricEstimate]
+    samples: Dict[str, List[float]] = field(default_factory=dict)
+
+    @property
+    def converged(self) -> bool:
+        return all(e.converged for e in self.estimates.values())
+
+
+def _replicate(args: tuple) -> Dict[str, float]:
+    ref, strategy, seed, overrides, live_channel, run_id = args
+    shop = make_shop(ref, strategy, seed=seed, **overrides)
+    if live_channel is not None:
+        shop.enable_live_metrics(live_channel, run_id)
+    return summarize_results(shop.run())
+
+
+class ReplicationController:
+    """
+    自适应重复次数控制：按批并行启动不同种子的独立重复，直到各指标置信区间半宽
+    不超过目标（绝对值 target_half_width 分钟，或相对值 relative_half_width·|均值|，两者取大），
+    或达到 max_replications 上限。方差小的配置几批即可结束，方差大的配置自动获得更多样本。
+    live_channel 为 LiveMetrics.queue 时各次重复实时上报进度，run_id 为 "策略#重复序号"。
+    """
+
+    def __init__(self, jobs: List[Dict], strategy: str,
+                 target_half_width: float | Dict[str, float] = 0.0,
+                 relative_half_width: Optional[float] = 0.05,
+                 confidence: float = config.REPLICATION_CONFIDENCE,
+                 min_replications: int = config.REPLICATION_MIN,
+                 max_replications: int = config.REPLICATION_MAX,
+                 batch_size: Optional[int] = None, max_workers: Optional[int] = None,
+                 metrics: Sequence[str] = METRICS, live_channel: Any = None, **overrides):
+        if not target_half_width and not relative_half_width:
+            raise ValueError("target_half_width 与 relative_half_width 至少指定一个")
+        self.jobs = jobs
+        self.strategy = strategy
+        self.metrics = tuple(metrics)
+        if isinstance(target_half_width, dict):
+            self.targets = {m: float(target_half_width.get(m, 0.0)) for m in self.metrics}
+        else:
+            self.targets = {m: float(target_half_width) for m in self.metrics}
+        self.relative_half_width = relative_half_width or 0.0
+        self.confidence = confidence
+        self.min_replications = max(2, min_replications)
+        self.max_replications = max(self.min_replications, max_replications)
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.live_channel = live_channel
+        # 传给 JobShop 的参数覆盖（机器数、预留窗口等）
+        self.overrides = overrides
+
+    def _target(self, metric: str, mean: float) -> float:
+        return max(self.targets[metric], self.relative_half_width * abs(mean))
+
+    def _summarize(self, samples: Dict[str, List[float]]) -> ReplicationSummary:
+        estimates = {}
+        for m in self.metrics:
+            values = samples[m]
+            mean = sum(values) / len(values)
+            estimates[m] = MetricEstimate(mean, confidence_half_width(values, self.confidence), self._target(m, mean))
+        return ReplicationSummary(self.strategy, len(samples[self.metrics[0]]), estimates, samples)
+
+    def run(self) -> ReplicationSummary:
+        samples: Dict[str, List[float]] = {m: [] for m in self.metrics}
+        batch = self.batch_size or self.max_workers or os.cpu_count() or 1
+        # 作业表经共享内存场景包传给工作进程，每个任务只传引用与种子
+        with SharedScenario(self.jobs, seed=replication_seed(0)) as scenario, \
+                ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            done = 0
+            while True:
+                # 首批直接补足最少次数，之后每批 batch 次
+                size = max(batch, self.min_replications - done)
+                size = min(size, self.max_replications - done)
+                tasks = [(scenario.ref, self.strategy, replication_seed(done + i), self.overrides,
+                          self.live_channel, f"{self.strategy}#{done + i}") for i in range(size)]
+                for result in pool.map(_replicate, tasks):
+                    for m in self.metrics:
+                        samples[m].append(result[m])
+                done += size
+                summary = self._summarize(samples)
+                if summary.converged or done >= self.max_replications:
+                    return summary
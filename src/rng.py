@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import random
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from . import config
+
+# 随机流用途标签
+PURPOSE_PROCESS_TIME = "process_time"  # 加工时间（按作业、机器类型各一条流）
+PURPOSE_DUE_JITTER = "due_jitter"      # 交货期扰动（data_loader）
+PURPOSE_GLOBAL = "global"              # run() 开始时的全局 random 种子
+PURPOSE_WORKLOAD = "workload"          # 合成订单流
+PURPOSE_REPLICATION = "replication"    # 独立重复仿真的子序列
+PURPOSE_ROLLOUT = "rollout"            # Rollout 前向情景（未来到达与加工时间）
+
+
+@dataclass(frozen=True)
+class SeedSequence:
+    """
+    可派生的种子序列：由根熵 entropy 与派生路径 spawn_key 唯一确定。
+
+    - child(*key) / spawn(n) 派生子序列（重复仿真、工作进程、作业……），派生结果只取决于路径，
+      与调用顺序、进程、派生次数无关，因此可复现；
+    - state(*purpose) 把 (entropy, spawn_key, purpose) 经 BLAKE2b 映射为 256 位种子，
+      不同路径/用途得到的种子相同的概率约为 2^-256，与 job_id*1000 这类线性偏移不同，
+      不会因为作业号或重复编号的组合而重叠；
+    - rng(*purpose) 用该 256 位种子初始化独立的 random.Random。
+    """
+    entropy: int = config.RANDOM_SEED
+    spawn_key: Tuple[Any, ...] = ()
+
+    def child(self, *key: Any) -> "SeedSequence":
+        return SeedSequence(self.entropy, self.spawn_key + tuple(key))
+
+    def spawn(self, n: int, start: int = 0) -> List["SeedSequence"]:
+        return [self.child(i) for i in range(start, start + n)]
+
+    def state(self, *purpose: Any) -> int:
+        digest = hashlib.blake2b(repr((self.entropy, self.spawn_key, purpose)).encode("utf-8"),
+                                 digest_size=32).digest()
+        return int.from_bytes(digest, "little")
+
+    def rng(self, *purpose: Any) -> random.Random:
+        return random.Random(self.state(*purpose))
+
+    def to_json(self) -> Dict:
+        return {"entropy": self.entropy, "spawn_key": list(self.spawn_key)}
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "SeedSequence":
+        return cls(data["entropy"], tuple(data["spawn_key"]))
+
+
+# 种子：整数为旧版线性种子（已发布结果使用），SeedSequence 为派生流
+Seed = Union[int, SeedSequence]
+
+
+def root_sequence() -> SeedSequence:
+    return SeedSequence(config.RANDOM_SEED)
+
+
+def make_rng(seed: Seed, *purpose: Any) -> random.Random:
+    """
+    按 (种子, 用途) 派生独立随机流：整数种子视为 SeedSequence(seed) 的根熵，不同用途互不相关。
+    唯一的例外是整数种子下的交货期扰动，保持旧方式 random.Random(seed)，已发布结果的交货期不变。
+    """
+    if isinstance(seed, SeedSequence):
+        return seed.rng(*purpose)
+    if purpose == (PURPOSE_DUE_JITTER,):
+        return random.Random(seed)
+    return SeedSequence(seed).rng(*purpose)
+
+
+def process_time_rng(seed: Seed, job_id: int, machine: str) -> random.Random:
+    """单个作业在某类机器上的加工时间随机流。整数种子保持旧公式 seed + job_id*1000 + 机器偏移。"""
+    if isinstance(seed, SeedSequence):
+        return seed.rng(PURPOSE_PROCESS_TIME, job_id, machine)
+    return random.Random(seed + job_id * 1000 + (0 if machine == "A" else 1))
+
+
+def global_seed(seed: Seed) -> int:
+    """run() 开始时 random.seed() 使用的种子。"""
+    if isinstance(seed, SeedSequence):
+        return seed.state(PURPOSE_GLOBAL)
+    return seed
+
+
+def seed_to_json(seed: Seed) -> Union[int, Dict]:
+    return seed.to_json() if isinstance(seed, SeedSequence) else seed
+
+
+def seed_from_json(data: Union[int, Dict]) -> Seed:
+    return SeedSequence.from_json(data) if isinstance(data, dict) else data
+
+
+
+# ----------------------------------------------------------------------
+# 批量生成
+# ----------------------------------------------------------------------
+def uniform_block(rng: random.Random, n: int) -> List[float]:
+    draw = rng.random
+    return [draw() for _ in range(n)]
+
+
+def triangular_block(rng: random.Random, low: float, high: float, mode: Optional[float], n: int) -> List[float]:
+    """
+    一次生成 n 个三角分布变量，与连续 n 次 rng.triangular(low, high, mode) 逐位相同，随机流位置也相同：
+    逆变换与 random.Random.triangular 的运算及顺序一致，只把与 u 无关的量提到循环外。
+    """
+    us = uniform_block(rng, n)
+    if high == low:
+        # random.triangular 此时先取一个均匀数再返回 low
+        return [low] * n
+    c = 0.5 if mode is None else (mode - low) / (high - low)
+    c_right = 1.0 - c
+    span_left = high - low
+    span_right = low - high
+    sqrt = math.sqrt
+    return [high + span_right * sqrt((1.0 - u) * c_right) if u > c else low + span_left * sqrt(u * c)
+            for u in us]
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import Dict, List, Optional, Tuple
+
+from . import config
+from .job import TYPE_H, Job
+from .rng import PURPOSE_ROLLOUT, Seed, SeedSequence
+from .scheduler import STRATEGY_COST_COMPOSITE
+from .simulation_engine import JobShop, ShopState
+from .workload import PoissonWorkload
+
+
+def _sample_seed(seed: Seed, job_id: int, sample: int) -> SeedSequence:
+    """第 sample 个前向情景的种子：只取决于 (种子, 决策作业, 样本序号)，与批量/在线模式、进程无关。"""
+    root = seed if isinstance(seed, SeedSequence) else SeedSequence(seed)
+    return root.child(PURPOSE_ROLLOUT, job_id, sample)
+
+
+def _branch_cost(branch: JobShop, job: Job, choice: str, now: float, horizon: float,
+                 h_weight: float, max_events: Optional[int]) -> Optional[float]:
+    """
+    在分支上把 job 放入 choice 队列，按基准策略前向仿真 horizon 分钟，返回加权拖期；
+    分支处理的事件数达到 max_events 仍未走完时域时返回 None。
+    时域内开工的作业计实际拖期；时域结束时仍在排队的作业按"时域末立即开工"估计拖期下界。
+    """
+    if choice == "A":
+        branch.a_queue.add(job)
+    else:
+        branch.b_queue.add(job)
+    end = now + horizon
+    branch.run(until=end, max_events=max_events)
+    if not branch._finished and branch.now <= end:
+        return None
+
+    cost = 0.0
+    for r in branch.results:
+        cost += r.tardiness * (h_weight if r.job_type == "H" else 1.0)
+    for queued in branch.a_queue.peek_jobs() + branch.b_queue.peek_jobs():
+        late = end + queued.expected_duration - queued.due_date
+        if late > 0:
+            cost += late * (h_weight if queued.type_code == TYPE_H else 1.0)
+    return cost
+
+
+def _sample_costs(args: tuple) -> Optional[Tuple[float, float]]:
+    """
+    一个前向情景下"送 A"与"送 B"的代价（公共随机数：两侧使用同一组未来到达与加工时间）。
+
+    分支只包含已到达的订单（队列中的作业、同一时刻到达尚未派工的作业）与按到达率抽样的未来订单；
+    未开工作业的加工时间按三角分布重新抽样，不读取真实加工时间。
+    """
+    (state, job, pending, rates, base_strategy, overrides, seed, sample, horizon, h_weight, max_events) = args
+    sample_seed = _sample_seed(seed, job.job_id, sample)
+    h_rate, n_rate = rates
+    future: List[Dict] = []
+    if h_rate + n_rate > 0:
+        known = [job.job_id] + [j.job_id for j in pending + state.a_queue + state.b_queue]
+        workload = PoissonWorkload(h_rate, n_rate, seed=sample_seed, start_id=max(known) + 1)
+        orders = workload.generate(horizon, limit=max_events)
+        if max_events is not None and len(orders) >= max_events:
+            # 每个到达至少是一个事件，分支必然超出预算
+            return None
+        for order in orders:
+            order["arrival_time"] += state.now
+            order["due_date"] += state.now
+            future.append(order)
+
+    # 分支自带加工时间缓存，按情景种子抽样；state 中的机器占用与 B 机预留是已定案的当前状态，原样保留
+    shop = JobShop(list(pending) + future, base_strategy, seed=sample_seed, **overrides)
+    start = replace(state, job_idx=0, finished=False, results=())
+    costs = []
+    for choice in ("A", "B"):
+        branch = shop.fork(state=start, keep_results=False)
+        cost = _branch_cost(branch, job, choice, state.now, horizon, h_weight, max_events)
+        if cost is None:
+            return None
+        costs.append(cost)
+    return costs[0], costs[1]
+
+
+class RolloutPolicy:
+    """
+    Rollout 派工：N 类订单到达时，分别假设"送 A"与"送 B"，以基准策略前向仿真 horizon 分钟，
+    选择 samples 个情景下平均加权拖期（H 权重 h_weight）较小的一侧。
+
+    - 不使用未来信息：分支只含当前已到达的订单，未来到达按泊松过程抽样
+      （到达率缺省由已到达订单在线估计，也可由 arrival_rates 给定），
+      未开工作业的加工时间按分布重新抽样，因此批量运行与 submit/advance 在线运行的决策相同；
+    - 每个情景内两侧使用同一组抽样（公共随机数），降低两侧代价之差的方差；
+    - 单个分支最多处理 max_events 个事件，超出时退回基准策略的启发式规则，
+      预算按事件数而不是墙钟计，结果与机器快慢无关；两侧代价相同也按启发式规则决定；
+    - workers > 1 时各情景在进程池中并行评估（缺省按 CPU 核数，已在工作进程中时不再嵌套），
+      每个任务只传快照与已到达的作业；JobShop 运行结束时关闭进程池。
+    """
+
+    def __init__(self, horizon: float = config.ROLLOUT_HORIZON,
+                 base_strategy: str = STRATEGY_COST_COMPOSITE,
+                 h_weight: float = config.ROLLOUT_H_WEIGHT,
+                 samples: int = config.ROLLOUT_SAMPLES,
+                 max_events: Optional[int] = config.ROLLOUT_MAX_EVENTS,
+                 workers: Optional[int] = config.ROLLOUT_WORKERS,
+                 arrival_rates: Optional[Tuple[float, float]] = None):
+        if samples < 1:
+            raise ValueError("samples 至少为 1")
+        self.horizon = horizon
+        self.base_strategy = base_strategy
+        self.h_weight = h_weight
+        self.samples = samples
+        self.max_events = max_events
+        if workers is None:
+            workers = 1 if multiprocessing.parent_process() is not None else (os.cpu_count() or 1)
+        self.workers = workers
+        self.arrival_rates = arrival_rates
+        self.decisions = 0
+        self.fallbacks = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def __enter__(self) -> "RolloutPolicy":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def decide(self, shop: JobShop, job: Job, now: float, load: Dict) -> str:
+        heuristic = replace(shop.scheduler, strategy=self.base_strategy).decide_machine(job=job, now=now, **load)
+        self.decisions += 1
+        costs = self._evaluate(shop, job, now)
+        if costs is None:
+            self.fallbacks += 1
+            return heuristic
+        cost_a, cost_b = costs
+        if cost_a == cost_b:
+            return heuristic
+        return "A" if cost_a < cost_b else "B"
+
+    def _rates(self, shop: JobShop, now: float) -> Tuple[float, float]:
+        """H、N 到达率：给定 arrival_rates 时直接使用，否则按 t <= now 已到达的订单估计。"""
+        if self.arrival_rates is not None:
+            return self.arrival_rates
+        arrived = shop.jobs[:shop._job_idx + 1]
+        span = now - arrived[0].arrival_time
+        if span <= 0:
+            return 0.0, 0.0
+        h = sum(1 for j in arrived if j.type_code == TYPE_H)
+        return h / span, (len(arrived) - h) / span
+
+    def _evaluate(self, shop: JobShop, job: Job, now: float) -> Optional[Tuple[float, float]]:
+        state = shop.snapshot(include_results=False)
+        # 与 job 同一时刻到达、尚未派工的订单（已到达，属于当前信息）
+        pending = []
+        for later in shop.jobs[shop._job_idx + 1:]:
+            if later.arrival_time > now:
+                break
+            pending.append(later)
+        base = (state, job, tuple(pending), self._rates(shop, now), self.base_strategy,
+                shop.scheduler.overrides(), shop.seed)
+        tail = (self.horizon, self.h_weight, self.max_events)
+        tasks = [base + (sample,) + tail for sample in range(self.samples)]
+        if self.workers > 1 and self.samples > 1:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=min(self.workers, self.samples))
+            outcomes = list(self._pool.map(_sample_costs, tasks))
+        else:
+            outcomes = [_sample_costs(task) for task in tasks]
+        if any(o is None for o in outcomes):
+            return None
+        return (sum(o[0] for o in outcomes) / self.samples, sum(o[1] for o in outcomes) / self.samples)
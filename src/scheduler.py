@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Optional
 
 from . import config
+from .job import TYPE_H, Job
 
 
 STRATEGY_FCFS = "FCFS"
@@ -10,31 +12,59 @@ STRATEGY_EDD = "EDD"
 STRATEGY_MINSLK = "MinSLK"
 STRATEGY_OPT = "OPT"
 STRATEGY_COST_COMPOSITE = "Cost_Based_Composite"
+# 滚动仿真派工：N 类去 A/B 由短时域前向仿真比较决定（见 rollout.py），
+# 队列规则与 Cost_Based_Composite 相同
+STRATEGY_ROLLOUT = "Rollout"
 
 
 @dataclass
 class Scheduler:
     strategy: str
+    # 策略参数覆盖（None 表示使用 config 中的取值），供扫参与代理模型使用
+    reservation_window: Optional[float] = None
+    busy_threshold: Optional[int] = None
+    overflow_limit: Optional[int] = None
 
-    def decide_machine(self, job: dict, now: float, a_queue_len: int, a_in_service: int,
+    @property
+    def b_reservation_window(self) -> float:
+        return config.B_RESERVATION_WINDOW if self.reservation_window is None else self.reservation_window
+
+    @property
+    def a_busy_threshold(self) -> int:
+        return config.A_BUSY_THRESHOLD if self.busy_threshold is None else self.busy_threshold
+
+    @property
+    def a_overflow_limit(self) -> int:
+        return config.A_OVERFLOW_LIMIT if self.overflow_limit is None else self.overflow_limit
+
+    def overrides(self) -> dict:
+        """参数覆盖项（可作为 JobShop 的关键字参数）。"""
+        return {
+            "reservation_window": self.reservation_window,
+            "busy_threshold": self.busy_threshold,
+            "overflow_limit": self.overflow_limit,
+        }
+
+    def decide_machine(self, job: Job, now: float, a_queue_len: int, a_in_service: int,
                        b_queue_len: int, b_in_service: int, next_h_arrival: float | None,
                        h_in_b_system: int) -> str:
         """决定 N 类订单去 A 或 B；H 类必须去 B。"""
-        if job["job_type"] == "H":
+        if job.type_code == TYPE_H:
             return "B"
 
         # N 类订单
         if self.strategy == STRATEGY_OPT:
             a_load = a_queue_len + a_in_service
             b_load = b_queue_len + b_in_service
-            if a_load >= config.A_BUSY_THRESHOLD and b_load == 0:
+            if a_load >= self.a_busy_threshold and b_load == 0:
                 if next_h_arrival is None:
                     return "B"
-                if (next_h_arrival - now) >= config.B_RESERVATION_WINDOW:
+                if (next_h_arrival - now) >= self.b_reservation_window:
                     return "B"
             return "A"
 
-        if self.strategy == STRATEGY_COST_COMPOSITE:
+        if self.strategy in (STRATEGY_COST_COMPOSITE, STRATEGY_ROLLOUT):
+            # Rollout 在引擎中由前向仿真决定，此处规则仅作为超时兜底
             # =============================================================
             # 优化策略：A/B 严格分流 (Strict Partitioning with Overflow Protection)
             # =============================================================
@@ -42,21 +72,21 @@ class Scheduler:
             # 
             # 规则：
             # 1. N 类默认禁止进入 B 机
-            # 2. 只有当 A 机严重拥堵（队列 > 10）且 B 机完全空闲且无 H 等待时
+            # 2. 只有当 A 机严重拥堵（队列 > A_OVERFLOW_LIMIT）且 B 机完全空闲且无 H 等待时
             #    才允许 N "捡漏"
             # =============================================================
             a_total_load = a_queue_len + a_in_service
             b_total_load = b_queue_len + b_in_service
             
             # 溢出条件（非常严格）：
-            # 1. A 机队列长度 > 10（严重拥堵）
+            # 1. A 机队列长度 > A_OVERFLOW_LIMIT（严重拥堵）
             # 2. B 机完全空闲（无排队、无在制）
             # 3. B 队列中无 H 等待
             # 4. 近期无 H 到达（预留窗口内）
-            if a_total_load > 10 and b_total_load == 0 and h_in_b_system == 0:
+            if a_total_load > self.a_overflow_limit and b_total_load == 0 and h_in_b_system == 0:
                 if next_h_arrival is None:
                     return "B"  # 后续无 H，可以去 B 捡漏
-                if (next_h_arrival - now) >= config.B_RESERVATION_WINDOW:
+                if (next_h_arrival - now) >= self.b_reservation_window:
                     return "B"  # H 还很远，可以去 B 捡漏
             
             # 默认：N 类必须强制去 A 机（即使 A 机很忙）
@@ -79,30 +109,28 @@ class Scheduler:
         # 否则去 A
         return "A"
 
-    def priority(self, job: dict, machine: str, now: float) -> float:
+    def priority(self, job: Job, machine: str, now: float) -> float:
         """生成 SimPy PriorityResource 的优先级，数值越小优先级越高。"""
         if self.strategy == STRATEGY_FCFS:
-            return float(job["arrival_time"])
+            return float(job.arrival_time)
         if self.strategy == STRATEGY_EDD:
-            return float(job["due_date"])
+            return float(job.due_date)
         if self.strategy == STRATEGY_MINSLK:
-            slack = job["due_date"] - job["expected_duration"] - now
-            return float(slack)
+            return float(job.slack_key - now)
 
-        if self.strategy == STRATEGY_COST_COMPOSITE:
+        if self.strategy in (STRATEGY_COST_COMPOSITE, STRATEGY_ROLLOUT):
             if machine == "B":
-                if job["job_type"] == "H":
-                    return float(job["due_date"])
-                return 1_000_000.0 + float(job["due_date"])
-            slack = job["due_date"] - job["expected_duration"] - now
-            return float(slack)
+                if job.type_code == TYPE_H:
+                    return float(job.due_date)
+                return 1_000_000.0 + float(job.due_date)
+            return float(job.slack_key - now)
 
         # 优化策略：B 机对 H 绝对优先（同类内用 EDD）
         if machine == "B":
-            base = 0.0 if job["job_type"] == "H" else 1.0
-            return base * 1_000_000.0 + float(job["due_date"])
-        return float(job["due_date"])
+            base = 0.0 if job.type_code == TYPE_H else 1.0
+            return base * 1_000_000.0 + float(job.due_date)
+        return float(job.due_date)
 
 
 def available_strategies() -> list[str]:
-    return [STRATEGY_FCFS, STRATEGY_EDD, STRATEGY_MINSLK, STRATEGY_OPT, STRATEGY_COST_COMPOSITE]
+    return [STRATEGY_FCFS, STRATEGY_EDD, STRATEGY_MINSLK, STRATEGY_OPT, STRATEGY_COST_COMPOSITE, STRATEGY_ROLLOUT]
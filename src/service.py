@@ -0,0 +1,450 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from http import HTTPStatus
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from . import config
+from .backends import BACKEND_JOBSHOP, get_backend
+from .bundle import SharedScenario, attach
+from .job import Job, JobLike, to_jobs
+from .pareto import b_utilization
+from .scheduler import STRATEGY_COST_COMPOSITE, available_strategies
+from .simulation_engine import complete_order, summarize_results
+
+# 可覆盖的参数 -> (类型, 下限)；查询中未给出的参数按 config 缺省值补全，使等价查询得到相同的键
+OVERRIDE_FIELDS: Dict[str, Tuple[type, float]] = {
+    "a_machines": (int, 1),
+    "b_machines": (int, 1),
+    "reservation_window": (float, 0.0),
+    "busy_threshold": (int, 0),
+    "overflow_limit": (int, 0),
+    "seed": (int, 0),
+}
+_QUERY_FIELDS = ("dataset", "strategy", "backend", "overrides", "orders")
+_ORDER_NUMBERS = ("arrival_time", "expected_duration", "due_date")
+
+
+def _number(value: Any, name: str, kind: type = float, minimum: float = 0.0):
+    """
+    把 JSON 取值转换为不小于 minimum 的有限数（kind=int 时还须为整数），否则抛出 ValueError。
+    NaN/inf 必须在这里拦下：NaN 到达时刻会让事件循环无法推进，inf 到达的订单永远不会被仿真。
+    """
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} 的取值无效：{value!r}") from None
+    if not math.isfinite(number) or number < minimum:
+        raise ValueError(f"{name} 必须是不小于 {minimum:g} 的有限数：{value!r}")
+    if kind is int:
+        if number != int(number):
+            raise ValueError(f"{name} 必须是整数：{value!r}")
+        return int(number)
+    return number
+
+
+def _default_overrides() -> Dict[str, Any]:
+    return {
+        "a_machines": config.A_MACHINES,
+        "b_machines": config.B_MACHINES,
+        "reservation_window": config.B_RESERVATION_WINDOW,
+        "busy_threshold": config.A_BUSY_THRESHOLD,
+        "overflow_limit": config.A_OVERFLOW_LIMIT,
+        "seed": config.RANDOM_SEED,
+    }
+
+
+@dataclass(frozen=True)
+class WhatIfQuery:
+    """
+    规范化后的 what-if 查询（可哈希，用作去重与缓存的键）。
+    overrides 为补全缺省值后按名称排序的 (参数, 值)；orders 为追加订单的
+    (job_id, arrival_time, job_type, expected_duration, due_date)，顺序同 Job 的构造参数。
+    """
+    dataset: str
+    strategy: str
+    backend: str
+    overrides: Tuple[Tuple[str, Any], ...]
+    orders: Tuple[tuple, ...] = ()
+
+    def to_dict(self) -> Dict:
+        return {
+            "dataset": self.dataset,
+            "strategy": self.strategy,
+            "backend": self.backend,
+            "overrides": dict(self.overrides),
+            "orders": [Job(*o).to_dict() for o in self.orders],
+        }
+
+
+@dataclass
+class ServiceStats:
+    requests: int = 0
+    cache_hits: int = 0
+    deduplicated: int = 0  # 与进行中的相同查询合并的请求数
+    simulations: int = 0
+    batches: int = 0
+    errors: int = 0
+
+
+# ----------------------------------------------------------------------
+# 工作进程
+# ----------------------------------------------------------------------
+_WORKER_REFS: Dict[str, str] = {}
+
+
+def _init_worker(refs: Dict[str, str]) -> None:
+    """工作进程启动时附加全部场景包并解码作业表与加工时间，之后的查询直接复用。"""
+    _WORKER_REFS.update(refs)
+    for ref in refs.values():
+        bundle = attach(ref)
+        bundle.jobs()
+        bundle.process_times()
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _simulate(query: WhatIfQuery) -> Dict:
+    bundle = attach(_WORKER_REFS[query.dataset])
+    params = dict(query.overrides)
+    seed = params.pop("seed")
+    jobs: List[Job] = bundle.jobs()
+    times = bundle.process_times() if seed == bundle.seed else None
+    if query.orders:
+        jobs = jobs + [Job(*o) for o in query.orders]
+        if times is not None:
+            # 追加订单的加工时间写入副本，不污染本进程共用的缓存
+            times = dict(times)
+    shop_class = get_backend(query.backend).shop_class()
+    results = shop_class(jobs, query.strategy, seed=seed, process_times=times, **params).run()
+
+    metrics = summarize_results(results)
+    metrics["n_jobs"] = len(results)
+    metrics["tardy_jobs"] = sum(1 for r in results if r.tardiness > 0)
+    metrics["makespan"] = max((r.end_time for r in results), default=0.0)
+    metrics["b_utilization"] = b_utilization(results, params["b_machines"])
+    order_ids = {o[0] for o in query.orders}
+    return {"metrics": metrics, "orders": [asdict(r) for r in results if r.job_id in order_ids]}
+
+
+def _run_batch(queries: List[WhatIfQuery]) -> List[tuple]:
+    """在一个工作进程中依次运行一批查询，返回 [(是否成功, 结果或错误信息)]，单个查询出错不影响其余查询。"""
+    out = []
+    for query in queries:
+        start = time.perf_counter()
+        try:
+            result = _simulate(query)
+        except Exception as exc:
+            out.append((False, f"{type(exc).__name__}: {exc}"))
+        else:
+            result["elapsed_ms"] = (time.perf_counter() - start) * 1000
+            out.append((True, result))
+    return out
+
+
+# ----------------------------------------------------------------------
+# 服务
+# ----------------------------------------------------------------------
+class WhatIfService:
+    """
+    常驻的 what-if 查询服务：数据集打包为共享内存场景包，工作进程启动时附加并保持热状态。
+
+    并发到达的查询先按规范化的键查 LRU 缓存；与进行中的相同查询合并为同一个 future；
+    其余查询在 batch_window 秒内攒成一批，均分给各工作进程，每个进程一次 IPC 跑完自己那一份。
+    """
+
+    def __init__(self, datasets: Dict[str, List[JobLike]], max_workers: Optional[int] = None,
+                 backend: str = config.SERVICE_BACKEND, batch_window: float = config.SERVICE_BATCH_WINDOW,
+                 cache_size: int = config.SERVICE_CACHE_SIZE):
+        self.datasets: Dict[str, List[Job]] = {name: to_jobs(jobs) for name, jobs in datasets.items()}
+        self._job_ids = {name: {j.job_id for j in jobs} for name, jobs in self.datasets.items()}
+        self.workers = max_workers or os.cpu_count() or 1
+        self.backend = get_backend(backend).name
+        self.batch_window = batch_window
+        self.cache_size = cache_size
+        self.stats = ServiceStats()
+        self._scenarios: Dict[str, SharedScenario] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._cache: "OrderedDict[WhatIfQuery, Dict]" = OrderedDict()
+        self._inflight: Dict[WhatIfQuery, asyncio.Future] = {}
+        self._pending: List[WhatIfQuery] = []
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """创建场景包与进程池，并等待全部工作进程完成预热。"""
+        self._scenarios = {name: SharedScenario(jobs, meta={"dataset": name}) for name, jobs in self.datasets.items()}
+        refs = {name: s.ref for name, s in self._scenarios.items()}
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(refs,))
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._pool, _ping) for _ in range(self.workers)))
+
+    def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+        for scenario in self._scenarios.values():
+            scenario.close()
+        self._scenarios = {}
+
+    # ------------------------------------------------------------------
+    def parse_query(self, payload: Any) -> WhatIfQuery:
+        """校验并规范化 JSON 查询，非法查询抛出 ValueError。"""
+        if not isinstance(payload, dict):
+            raise ValueError("查询必须是 JSON 对象")
+        unknown = set(payload) - set(_QUERY_FIELDS)
+        if unknown:
+            raise ValueError(f"未知字段：{', '.join(sorted(unknown))}")
+        dataset = payload.get("dataset")
+        if dataset not in self.datasets:
+            raise ValueError(f"未知数据集 {dataset!r}，可选：{', '.join(self.datasets)}")
+        strategy = payload.get("strategy", STRATEGY_COST_COMPOSITE)
+        if strategy not in available_strategies():
+            raise ValueError(f"未知策略 {strategy!r}，可选：{', '.join(available_strategies())}")
+
+        name = payload.get("backend")
+        try:
+            backend = get_backend(name or self.backend)
+        except KeyError as exc:
+            raise ValueError(exc.args[0]) from None
+        if not (backend.available() and backend.supports(strategy)):
+            if name:
+                raise ValueError(f"后端 {backend.name} 不可用或不支持策略 {strategy}")
+            backend = get_backend(BACKEND_JOBSHOP)
+
+        overrides = _default_overrides()
+        given = payload.get("overrides") or {}
+        if not isinstance(given, dict):
+            raise ValueError("overrides 必须是 JSON 对象")
+        for key, value in given.items():
+            if key not in OVERRIDE_FIELDS:
+                raise ValueError(f"不可覆盖的参数 {key!r}，可选：{', '.join(OVERRIDE_FIELDS)}")
+            kind, minimum = OVERRIDE_FIELDS[key]
+            overrides[key] = _number(value, f"参数 {key}", kind, minimum)
+
+        orders = []
+        taken = set(self._job_ids[dataset])
+        next_id = max(taken, default=0) + 1
+        for order in payload.get("orders") or []:
+            if not isinstance(order, dict) or "job_type" not in order or "arrival_time" not in order:
+                raise ValueError("追加订单至少需要 job_type 与 arrival_time")
+            order = dict(order)
+            order["job_id"] = next_id if order.get("job_id") is None else _number(order["job_id"], "job_id", int)
+            for name in _ORDER_NUMBERS:
+                if name in order:
+                    order[name] = _number(order[name], f"订单 {order['job_id']} 的 {name}")
+            try:
+                job = complete_order(order)
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(f"追加订单无效：{order!r}") from None
+            if job.job_id in taken:
+                raise ValueError(f"追加订单的 job_id {job.job_id} 与已有订单重复")
+            taken.add(job.job_id)
+            next_id = max(next_id, job.job_id + 1)
+            orders.append((job.job_id, job.arrival_time, job.job_type, job.expected_duration, job.due_date))
+        return WhatIfQuery(dataset, strategy, backend.name, tuple(sorted(overrides.items())), tuple(orders))
+
+    async def evaluate(self, query: WhatIfQuery) -> Dict:
+        """
+        返回查询结果：{query, metrics, orders, elapsed_ms, source}，source 为
+        cache（命中缓存）、shared（与进行中的相同查询合并）或 simulated（本次仿真）。
+        """
+        self.stats.requests += 1
+        cached = self._cache.get(query)
+        if cached is not None:
+            self._cache.move_to_end(query)
+            self.stats.cache_hits += 1
+            return dict(cached, source="cache")
+
+        future = self._inflight.get(query)
+        if future is not None:
+            self.stats.deduplicated += 1
+            source = "shared"
+        else:
+            loop = asyncio.get_running_loop()
+            future = self._inflight[query] = loop.create_future()
+            # 所有等待者都已断开时也要取走异常，避免"未读取的异常"告警
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self._pending.append(query)
+            if self._flusher is None:
+                self._flusher = loop.create_task(self._flush_later())
+            source = "simulated"
+        # shield：某个客户端断开只取消它自己的等待，不影响合并到同一 future 的其他请求
+        result = await asyncio.shield(future)
+        return dict(result, source=source)
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.batch_window)
+        batch, self._pending = self._pending, []
+        self._flusher = None
+        self.stats.batches += 1
+        size = -(-len(batch) // self.workers)
+        await asyncio.gather(*(self._run_chunk(batch[i:i + size]) for i in range(0, len(batch), size)))
+
+    async def _run_chunk(self, chunk: List[WhatIfQuery]) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            outcomes = await loop.run_in_executor(self._pool, _run_batch, chunk)
+        except Exception as exc:  # 工作进程崩溃等：整份查询失败
+            outcomes = [(False, f"{type(exc).__name__}: {exc}")] * len(chunk)
+        for query, (ok, value) in zip(chunk, outcomes):
+            future = self._inflight.pop(query)
+            if ok:
+                self.stats.simulations += 1
+                result = dict(value, query=query.to_dict())
+                self._cache[query] = result
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+                future.set_result(result)
+            else:
+                self.stats.errors += 1
+                future.set_exception(RuntimeError(value))
+
+    def describe(self) -> Dict:
+        return {
+            "status": "ok",
+            "workers": self.workers,
+            "backend": self.backend,
+            "datasets": {name: len(jobs) for name, jobs in self.datasets.items()},
+            "cache_entries": len(self._cache),
+            "stats": asdict(self.stats),
+        }
+
+
+# ----------------------------------------------------------------------
+# HTTP（最小的 HTTP/1.1 实现，支持 keep-alive）
+# ----------------------------------------------------------------------
+class _HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[tuple]:
+    """读取一个请求，返回 (method, path, version, headers, body)；连接已关闭时返回 None。"""
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, version = line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+    except ValueError:
+        raise _HTTPError(400, "请求行格式错误") from None
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise _HTTPError(400, "Content-Length 无效") from None
+    if length > config.SERVICE_MAX_BODY:
+        raise _HTTPError(413, f"请求体超过 {config.SERVICE_MAX_BODY} 字节")
+    body = await reader.readexactly(length) if length > 0 else b""
+    return method.upper(), urlsplit(target).path, version, headers, body
+
+
+def _response(status: int, payload: Any, keep_alive: bool) -> bytes:
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = (f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+
+async def _whatif(service: WhatIfService, body: bytes) -> Dict:
+    """POST /whatif：单个查询对象，或 {"queries": [...]} 批量查询（逐条返回结果或错误）。"""
+    try:
+        payload = json.loads(body or b"null")
+    except ValueError:
+        raise _HTTPError(400, "请求体不是合法的 JSON") from None
+    if isinstance(payload, dict) and "queries" in payload:
+        if not isinstance(payload["queries"], list):
+            raise _HTTPError(400, "queries 必须是数组")
+
+        async def one(item):
+            try:
+                return await service.evaluate(service.parse_query(item))
+            except Exception as exc:
+                return {"error": str(exc)}
+
+        return {"results": await asyncio.gather(*(one(item) for item in payload["queries"]))}
+    try:
+        query = service.parse_query(payload)
+    except ValueError as exc:
+        raise _HTTPError(400, str(exc)) from None
+    try:
+        return await service.evaluate(query)
+    except RuntimeError as exc:
+        raise _HTTPError(500, str(exc)) from None
+
+
+async def _route(service: WhatIfService, method: str, path: str, body: bytes) -> Dict:
+    if path == "/health" and method == "GET":
+        return service.describe()
+    if path == "/datasets" and method == "GET":
+        return {"datasets": [{"name": name, "n_jobs": len(jobs)} for name, jobs in service.datasets.items()],
+                "strategies": available_strategies()}
+    if path == "/whatif" and method == "POST":
+        return await _whatif(service, body)
+    if path in ("/health", "/datasets", "/whatif"):
+        raise _HTTPError(405, f"{path} 不支持 {method}")
+    raise _HTTPError(404, f"未知路径 {path}")
+
+
+async def handle_connection(service: WhatIfService, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            try:
+                request = await _read_request(reader)
+            except _HTTPError as exc:
+                writer.write(_response(exc.status, {"error": str(exc)}, keep_alive=False))
+                await writer.drain()
+                break
+            if request is None:
+                break
+            method, path, version, headers, body = request
+            connection = headers.get("connection", "").lower()
+            keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+            try:
+                status, payload = 200, await _route(service, method, path, body)
+            except _HTTPError as exc:
+                status, payload = exc.status, {"error": str(exc)}
+            writer.write(_response(status, payload, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(service: WhatIfService, host: str = config.SERVICE_HOST, port: int = config.SERVICE_PORT,
+                ready: Optional[Callable[[str, int], None]] = None) -> None:
+    """启动服务并一直运行到任务被取消；ready 在开始监听后以实际地址 (host, port) 调用（port=0 时由系统分配）。"""
+    await service.start()
+    try:
+        server = await asyncio.start_server(lambda r, w: handle_connection(service, r, w), host, port)
+        async with server:
+            if ready is not None:
+                ready(*server.sockets[0].getsockname()[:2])
+            await server.serve_forever()
+    finally:
+        service.close()
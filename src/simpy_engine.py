@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import math
+import random
+from typing import List
+
+import simpy
+
+from .heap_engine import HeapJobShop
+from .rng import global_seed
+from .simulation_engine import SimulationResult
+
+
+def _delay_to(env: simpy.Environment, t: float) -> float:
+    """
+    返回使 env.now + delay 恰好等于 t 的延迟。SimPy 按 now + delay 计算事件时刻，
+    直接用 t - now 可能因舍入偏离 t 一个 ulp，导致与 JobShop 的"完工时刻 <= now"判断不一致。
+    """
+    delay = t - env.now
+    while env.now + delay < t:
+        delay = math.nextafter(delay, math.inf)
+    while env.now + delay > t:
+        delay = math.nextafter(delay, -math.inf)
+    return delay
+
+
+class SimPyJobShop(HeapJobShop):
+    """
+    SimPy 事件内核后端（需要安装 simpy），队列、派工与收尾规则沿用 HeapJobShop，结果与 JobShop 逐作业一致。
+
+    到达由一个 SimPy 进程按时刻推进并派工，完工为 Timeout 事件；任一事件发生后在同一时刻追加一个
+    "开工判断"事件，它排在该时刻所有已登记事件之后，因此与 JobShop 一样先处理完同一时刻的全部到达与完工，
+    再做一次开工判断。机器没有用 PriorityResource 建模：请求资源时优先级就已固定，
+    无法表达 MinSLK 随时间变化的松弛时间和 B 机为 H 预留的空等。
+    """
+
+    def run(self) -> List[SimulationResult]:
+        random.seed(global_seed(self.seed))
+        env = self._env = simpy.Environment()
+        self._step_pending = False
+        env.process(self._arrivals(env))
+        # JobShop 在 t=0 总会做一次开工判断
+        self._request_step()
+        env.run()
+        self._env = None
+        if (len(self.a_queue) or len(self.b_queue)) and len(self.results) < len(self.jobs):
+            self._force_process_remaining(env.now)
+        return self.results
+
+    def _arrivals(self, env: simpy.Environment):
+        jobs = self.jobs
+        i = 0
+        while i < len(jobs):
+            t = jobs[i].arrival_time
+            if t > env.now:
+                yield env.timeout(_delay_to(env, t))
+            while i < len(jobs) and jobs[i].arrival_time <= env.now:
+                self._dispatch_job(jobs[i], env.now)
+                i += 1
+            self._request_step()
+
+    def _request_step(self, _event=None) -> None:
+        if not self._step_pending:
+            self._step_pending = True
+            self._env.timeout(0).callbacks.append(self._step)
+
+    def _step(self, _event) -> None:
+        self._step_pending = False
+        self.events_processed += 1
+        self._try_start_jobs(self._env.now)
+
+    def _schedule_completion(self, end_time: float, now: float) -> None:
+        # 收尾阶段（事件循环已结束）不再登记事件
+        if self._env is not None:
+            self._env.timeout(_delay_to(self._env, end_time)).callbacks.append(self._request_step)
@@ -1,15 +1,26 @@
 from __future__ import annotations
 
 import random
-from dataclasses import dataclass
-from typing import List, Dict, Optional
+from bisect import bisect_right, insort
+from dataclasses import dataclass, replace
+from pathlib import Path
+from operator import attrgetter
+from typing import Callable, Iterable, List, Dict, Optional, Tuple
 
 from . import config
-from .scheduler import Scheduler, STRATEGY_FCFS, STRATEGY_EDD, STRATEGY_MINSLK, STRATEGY_COST_COMPOSITE
+from .job import TYPE_H, TYPE_N, Job, JobLike, to_jobs
+from .profiling import (COMPONENT_DISPATCH, COMPONENT_EVENT, COMPONENT_QUEUE, COMPONENT_RECORD,
+                        COMPONENT_SAMPLING, timed)
+from .rng import Seed, global_seed, process_time_rng
+from .scheduler import (Scheduler, STRATEGY_FCFS, STRATEGY_EDD, STRATEGY_MINSLK, STRATEGY_COST_COMPOSITE,
+                        STRATEGY_ROLLOUT)
 
 # 调试开关：设为 True 打印队列排序信息
 DEBUG_QUEUE = False
 
+_by_arrival = attrgetter("arrival_time")
+_by_due_date = attrgetter("due_date")
+
 
 @dataclass
 class SimulationResult:
@@ -21,15 +32,68 @@ class SimulationResult:
     due_date: float
     tardiness: float
     machine: str
+    machine_index: int = 0
+
+
+@dataclass(frozen=True)
+class ShopState:
+    """JobShop 可变状态的不可变快照；作业字典按引用保存，不做深拷贝。"""
+    now: float
+    job_idx: int
+    finished: bool
+    a_busy_until: Tuple[float, ...]
+    b_busy_until: Tuple[float, ...]
+    a_queue: Tuple[Job, ...]
+    b_queue: Tuple[Job, ...]
+    h_in_b_system: int
+    results: Tuple[SimulationResult, ...]
+    clock: float = 0.0
+    events_processed: int = 0
+    b_reserved_until: Optional[float] = None
+    b_hold: Optional[Tuple[float, int]] = None
+    b_reserved_idle: float = 0.0
+
+
+@dataclass(frozen=True)
+class RunMark:
+    """运行中的周期性状态标记：不含结果的快照 + 当时的结果条数（结果列表只追加，前缀即当时的结果）。"""
+    state: ShopState
+    n_results: int
+
+
+def sample_process_time(seed: Seed, job: Job, machine: str) -> float:
+    """按 (种子, 作业 ID, 机器类型) 确定性地采样加工时间，各引擎后端共用，保证同一作业的加工时间一致。"""
+    if machine == "A":
+        a, c, b = config.TRIANGULAR_A_N
+    elif job.type_code == TYPE_H:
+        a, c, b = config.TRIANGULAR_B_H
+    else:
+        a, c, b = config.TRIANGULAR_B_N
+    # 使用作业 ID 和机器类型生成确定性随机数
+    return process_time_rng(seed, job.job_id, machine).triangular(a, b, c)
+
+
+def complete_order(order: JobLike, arrival_time: float = 0.0) -> Job:
+    """
+    补全一个新订单：order 至少包含 job_id 与 job_type，arrival_time 缺省为给定时刻，
+    expected_duration / due_date 缺省按 config 计算（与 data_loader 相同的交货期公式，不加扰动）。
+    """
+    job = dict(order)
+    job["job_type"] = str(job["job_type"]).upper()
+    job.setdefault("arrival_time", arrival_time)
+    job["arrival_time"] = float(job["arrival_time"])
+    job.setdefault("expected_duration", config.expected_processing_time(job["job_type"]))
+    job.setdefault("due_date", job["arrival_time"] + config.DUE_DATE_FACTOR * job["expected_duration"])
+    return Job.from_mapping(job)
 
 
 class ManualQueue:
     """手动管理的作业队列，支持按策略显式排序。"""
-    def __init__(self, name: str):
+    def __init__(self, name: str, jobs: Iterable[Job] = ()):
         self.name = name
-        self._queue: List[Dict] = []
+        self._queue: List[Job] = list(jobs)
     
-    def add(self, job: Dict):
+    def add(self, job: Job):
         self._queue.append(job)
     
     def is_empty(self) -> bool:
@@ -38,52 +102,56 @@ class ManualQueue:
     def __len__(self) -> int:
         return len(self._queue)
     
-    def sort_and_pop(self, strategy: str, now: float, machine: str) -> Optional[Dict]:
+    @timed(COMPONENT_QUEUE)
+    def sort_and_pop(self, strategy: str, now: float, machine: str) -> Optional[Job]:
         """根据策略排序队列并弹出最高优先级的作业。"""
         if not self._queue:
             return None
         
         # 对于 B 机 + Cost_Based_Composite：H 类绝对优先
-        if machine == "B" and strategy == STRATEGY_COST_COMPOSITE:
-            h_jobs = [j for j in self._queue if j["job_type"] == "H"]
-            n_jobs = [j for j in self._queue if j["job_type"] == "N"]
+        if machine == "B" and strategy in (STRATEGY_COST_COMPOSITE, STRATEGY_ROLLOUT):
+            h_jobs = [j for j in self._queue if j.type_code == TYPE_H]
+            n_jobs = [j for j in self._queue if j.type_code == TYPE_N]
             if h_jobs:
                 # H 类按 EDD 排序
-                h_jobs.sort(key=lambda x: x["due_date"])
+                h_jobs.sort(key=_by_due_date)
                 selected = h_jobs[0]
             elif n_jobs:
                 # N 类按 MinSLK 排序
-                n_jobs.sort(key=lambda x: x["due_date"] - x["expected_duration"] - now)
+                n_jobs.sort(key=lambda x: x.slack_key - now)
                 selected = n_jobs[0]
             else:
                 return None
             self._queue.remove(selected)
             if DEBUG_QUEUE:
-                top3 = [j["job_id"] for j in (h_jobs if h_jobs else n_jobs)[:3]]
-                print(f"[DEBUG] {self.name} Strategy: {strategy}, Queue Top 3 IDs: {top3}, Selected: {selected['job_id']}")
+                top3 = [j.job_id for j in (h_jobs if h_jobs else n_jobs)[:3]]
+                print(f"[DEBUG] {self.name} Strategy: {strategy}, Queue Top 3 IDs: {top3}, Selected: {selected.job_id}")
             return selected
         
         # 通用排序逻辑
         if strategy == STRATEGY_FCFS:
-            self._queue.sort(key=lambda x: x["arrival_time"])
+            self._queue.sort(key=_by_arrival)
         elif strategy == STRATEGY_EDD:
-            self._queue.sort(key=lambda x: x["due_date"])
+            self._queue.sort(key=_by_due_date)
         elif strategy == STRATEGY_MINSLK:
-            self._queue.sort(key=lambda x: x["due_date"] - x["expected_duration"] - now)
-        elif strategy == STRATEGY_COST_COMPOSITE:
+            self._queue.sort(key=lambda x: x.slack_key - now)
+        elif strategy in (STRATEGY_COST_COMPOSITE, STRATEGY_ROLLOUT):
             # A 机使用 MinSLK
-            self._queue.sort(key=lambda x: x["due_date"] - x["expected_duration"] - now)
+            self._queue.sort(key=lambda x: x.slack_key - now)
         else:
             # OPT 等其他策略默认 EDD
-            self._queue.sort(key=lambda x: x["due_date"])
+            self._queue.sort(key=_by_due_date)
         
         if DEBUG_QUEUE:
-            top3 = [j["job_id"] for j in self._queue[:3]]
+            top3 = [j.job_id for j in self._queue[:3]]
             print(f"[DEBUG] {self.name} Strategy: {strategy}, Queue Top 3 IDs: {top3}")
         
         return self._queue.pop(0)
     
-    def peek_jobs(self) -> List[Dict]:
+    def has_h(self) -> bool:
+        return any(j.type_code == TYPE_H for j in self._queue)
+
+    def peek_jobs(self) -> List[Job]:
         """查看队列中的所有作业（不修改）。"""
         return list(self._queue)
 
@@ -91,14 +159,40 @@ class ManualQueue:
 class JobShop:
     """使用手动队列管理的作业车间仿真。"""
     
-    def __init__(self, jobs: List[Dict], strategy: str):
-        self.jobs = sorted(jobs, key=lambda x: x["arrival_time"])
+    def __init__(self, jobs: List[JobLike], strategy: str,
+                 sink: Optional[Callable[[SimulationResult], None]] = None,
+                 a_machines: Optional[int] = None, b_machines: Optional[int] = None,
+                 reservation_window: Optional[float] = None, busy_threshold: Optional[int] = None,
+                 overflow_limit: Optional[int] = None, seed: Optional[Seed] = None,
+                 process_times: Optional[Dict[tuple, float]] = None):
+        """
+        a_machines/b_machines 与 reservation_window/busy_threshold/overflow_limit 为可选覆盖，
+        缺省使用 config 中的 A_MACHINES、B_MACHINES、B_RESERVATION_WINDOW、A_BUSY_THRESHOLD、A_OVERFLOW_LIMIT。
+        seed 为随机种子（缺省 config.RANDOM_SEED）：整数沿用旧的线性种子公式，
+        rng.SeedSequence 则按作业、机器类型派生互相独立的随机流（用于独立重复仿真）。
+        process_times 为同一 seed 下预采样的加工时间缓存（如场景包），传入后直接共享使用。
+        """
+        # 以下为各分支共享的不可变数据：作业列表、H 到达时刻、加工时间缓存
+        self.jobs: List[Job] = sorted(to_jobs(jobs), key=_by_arrival)
+        # 预计算所有 H 类到达时间
+        self.h_arrivals = sorted([j.arrival_time for j in self.jobs if j.type_code == TYPE_H])
+        # (job_id, 机器类型) -> 加工时间；采样是确定性的，因此可在 fork 出的分支间共享
+        self._process_times: Dict[tuple, float] = {} if process_times is None else process_times
+        self.seed = config.RANDOM_SEED if seed is None else seed
+
         self.strategy = strategy
-        self.scheduler = Scheduler(strategy=strategy)
+        self.scheduler = Scheduler(
+            strategy=strategy,
+            reservation_window=reservation_window,
+            busy_threshold=busy_threshold,
+            overflow_limit=overflow_limit,
+        )
+        # 结果流出口：每个作业开工定案后立即推送（如 StreamingResultWriter.put）
+        self.sink = sink
         
         # 机器状态：每台机器的剩余加工时间（0 表示空闲）
-        self.a_machines_busy_until: List[float] = [0.0] * config.A_MACHINES
-        self.b_machines_busy_until: List[float] = [0.0] * config.B_MACHINES
+        self.a_machines_busy_until: List[float] = [0.0] * (config.A_MACHINES if a_machines is None else a_machines)
+        self.b_machines_busy_until: List[float] = [0.0] * (config.B_MACHINES if b_machines is None else b_machines)
         
         # 手动管理的队列
         self.a_queue = ManualQueue("A_Queue")
@@ -107,35 +201,116 @@ class JobShop:
         # 结果
         self.results: List[SimulationResult] = []
         
-        # 预计算所有 H 类到达时间
-        self.h_arrivals = sorted([j["arrival_time"] for j in self.jobs if j["job_type"] == "H"])
-        
         # 当前 B 机系统中的 H 数量（队列 + 在制）
         self.h_in_b_system = 0
 
+        # 事件循环游标：下一个待处理事件时刻、下一个未到达作业的下标
+        self.now = 0.0
+        self._job_idx = 0
+        self._started = False
+        self._finished = False
+        # 已推进到的仿真时钟（<= clock 的事件均已处理），在线模式下新订单不得早于该时刻
+        self.clock = 0.0
+        # 作业列表是否与 fork 出的分支共享；共享时 submit() 先复制再写
+        self._jobs_shared = False
+        # 已处理的事件数
+        self.events_processed = 0
+        # B 机预留计时器：B 机为即将到达的 H 保持空闲时登记，在该 H 到达时刻到期（None 表示未预留）
+        self._b_reserved_until: Optional[float] = None
+        # 预留空等记账：(开始时刻, 空等的 B 机台数)，以及累计的预留空等机时（台·分钟）
+        self._b_hold: Optional[Tuple[float, int]] = None
+        self.b_reserved_idle = 0.0
+        # 周期性检查点（见 enable_checkpoints）
+        self.checkpointer = None
+        # 实时进度上报（见 enable_live_metrics）
+        self.monitor = None
+        # Rollout 策略的前向仿真评估器（首次派工时按 config 创建，也可预先设置以使用进程池）
+        self.rollout = None
+        # 周期性状态标记（见 enable_marks / resimulate）；缺省不记录，fork 出的分支也不记录
+        self.marks: List[RunMark] = []
+        self.mark_every = 0
+        self._next_mark = 0
+
+    def snapshot(self, include_results: bool = True) -> ShopState:
+        """拍摄当前可变状态的快照（不复制作业列表）；include_results=False 时不带已完成结果。"""
+        return ShopState(
+            now=self.now,
+            job_idx=self._job_idx,
+            finished=self._finished,
+            a_busy_until=tuple(self.a_machines_busy_until),
+            b_busy_until=tuple(self.b_machines_busy_until),
+            a_queue=tuple(self.a_queue.peek_jobs()),
+            b_queue=tuple(self.b_queue.peek_jobs()),
+            h_in_b_system=self.h_in_b_system,
+            results=tuple(self.results) if include_results else (),
+            clock=self.clock,
+            events_processed=self.events_processed,
+            b_reserved_until=self._b_reserved_until,
+            b_hold=self._b_hold,
+            b_reserved_idle=self.b_reserved_idle,
+        )
+
+    def restore(self, state: ShopState, keep_results: bool = True) -> None:
+        """把可变状态恢复为快照内容；keep_results=False 时只保留快照之后的新结果。"""
+        self.now = state.now
+        self._job_idx = state.job_idx
+        self._started = True
+        self._finished = state.finished
+        self.a_machines_busy_until = list(state.a_busy_until)
+        self.b_machines_busy_until = list(state.b_busy_until)
+        self.a_queue = ManualQueue("A_Queue", state.a_queue)
+        self.b_queue = ManualQueue("B_Queue", state.b_queue)
+        self.h_in_b_system = state.h_in_b_system
+        self.results = list(state.results) if keep_results else []
+        self.clock = state.clock
+        self._b_reserved_until = state.b_reserved_until
+        self._b_hold = state.b_hold
+        self.b_reserved_idle = state.b_reserved_idle
+        self.events_processed = state.events_processed
+        # 恢复后原有标记不再对应当前结果列表
+        self.marks = []
+        self._next_mark = self.events_processed + self.mark_every
+
+    def fork(self, strategy: Optional[str] = None, state: Optional[ShopState] = None,
+             keep_results: bool = True) -> "JobShop":
+        """
+        从当前状态（或给定快照）分叉出一个新仿真，可改用其他策略继续运行。
+        分支与本对象共享作业列表、H 到达时刻和加工时间缓存，只复制机器/队列等小规模可变状态。
+        """
+        child = JobShop.__new__(JobShop)
+        child.jobs = self.jobs
+        child.h_arrivals = self.h_arrivals
+        child._process_times = self._process_times
+        child.seed = self.seed
+        child._jobs_shared = self._jobs_shared = True
+        child.strategy = strategy or self.strategy
+        child.scheduler = replace(self.scheduler, strategy=child.strategy)
+        child.sink = None
+        child.checkpointer = None
+        child.monitor = None
+        child.rollout = None
+        child.marks = []
+        child.mark_every = 0
+        if state is None:
+            state = self.snapshot(include_results=keep_results)
+        child.restore(state, keep_results=keep_results)
+        return child
+
     def _next_h_arrival(self, now: float) -> Optional[float]:
         """获取下一个 H 类订单的到达时间。"""
-        for t in self.h_arrivals:
-            if t > now:
-                return t
-        return None
+        i = bisect_right(self.h_arrivals, now)
+        return self.h_arrivals[i] if i < len(self.h_arrivals) else None
 
-    def _sample_process_time(self, job: Dict, machine: str) -> float:
+    @timed(COMPONENT_SAMPLING)
+    def _sample_process_time(self, job: Job, machine: str) -> float:
         """采样加工时间。使用作业 ID 作为随机种子，确保同一作业在不同策略下加工时间一致。"""
-        job_type = job["job_type"]
-        job_id = job["job_id"]
-        
-        if machine == "A":
-            a, c, b = config.TRIANGULAR_A_N
-        else:
-            if job_type == "H":
-                a, c, b = config.TRIANGULAR_B_H
-            else:
-                a, c, b = config.TRIANGULAR_B_N
-        
-        # 使用作业 ID 和机器类型生成确定性随机数
-        rng = random.Random(config.RANDOM_SEED + job_id * 1000 + (0 if machine == "A" else 1))
-        return rng.triangular(a, b, c)
+        key = (job.job_id, machine)
+        cached = self._process_times.get(key)
+        if cached is not None:
+            return cached
+        duration = sample_process_time(self.seed, job, machine)
+        self._process_times[key] = duration
+        return duration
 
     def _get_idle_machine(self, machine_type: str, now: float) -> Optional[int]:
         """获取一台空闲机器的索引，如果没有空闲返回 None。"""
@@ -151,8 +326,8 @@ class JobShop:
         return sum(1 for t in busy_list if t > now)
 
     def _should_b_wait_for_h(self, now: float) -> bool:
-        """判断 B 机是否应该空闲等待 H 类订单（前瞻预留）。"""
-        if self.strategy != STRATEGY_COST_COMPOSITE:
+        """判断 B 机是否应该空闲等待 H 类订单（前瞻预留）；Rollout 的基准策略为 Cost_Based_Composite，同样预留。"""
+        if self.strategy not in (STRATEGY_COST_COMPOSITE, STRATEGY_ROLLOUT):
             return False
         
         next_h = self._next_h_arrival(now)
@@ -161,12 +336,13 @@ class JobShop:
         
         time_until_h = next_h - now
         # 如果 H 将在预留窗口内到达，B 机应该等待
-        if time_until_h <= config.B_RESERVATION_WINDOW:
+        if time_until_h <= self.scheduler.b_reservation_window:
             return True
         
         return False
 
-    def _dispatch_job(self, job: Dict, now: float):
+    @timed(COMPONENT_DISPATCH)
+    def _dispatch_job(self, job: Job, now: float):
         """决定作业去哪个队列。"""
         next_h = self._next_h_arrival(now)
         a_queue_len = len(self.a_queue)
@@ -174,9 +350,7 @@ class JobShop:
         a_in_service = self._count_in_service("A", now)
         b_in_service = self._count_in_service("B", now)
         
-        machine = self.scheduler.decide_machine(
-            job=job,
-            now=now,
+        load = dict(
             a_queue_len=a_queue_len,
             a_in_service=a_in_service,
             b_queue_len=b_queue_len,
@@ -184,14 +358,47 @@ class JobShop:
             next_h_arrival=next_h,
             h_in_b_system=self.h_in_b_system,
         )
+        if self.strategy == STRATEGY_ROLLOUT and job.type_code == TYPE_N:
+            if self.rollout is None:
+                from .rollout import RolloutPolicy
+                self.rollout = RolloutPolicy()
+            machine = self.rollout.decide(self, job, now, load)
+        else:
+            machine = self.scheduler.decide_machine(job=job, now=now, **load)
         
         if machine == "A":
             self.a_queue.add(job)
         else:
             self.b_queue.add(job)
-            if job["job_type"] == "H":
+            if job.type_code == TYPE_H:
                 self.h_in_b_system += 1
 
+    @timed(COMPONENT_RECORD)
+    def _start_job(self, job: Job, machine: str, machine_index: int, now: float) -> float:
+        """在指定机台上开工并记录结果，返回完工时间。"""
+        duration = self._sample_process_time(job, machine)
+        end_time = now + duration
+        if machine == "A":
+            self.a_machines_busy_until[machine_index] = end_time
+        else:
+            self.b_machines_busy_until[machine_index] = end_time
+        result = SimulationResult(
+            job_id=job.job_id,
+            job_type=job.job_type,
+            arrival_time=job.arrival_time,
+            start_time=now,
+            end_time=end_time,
+            due_date=job.due_date,
+            tardiness=max(0.0, end_time - job.due_date),
+            machine=machine,
+            machine_index=machine_index,
+        )
+        self.results.append(result)
+        if self.sink is not None:
+            self.sink(result)
+        return end_time
+
+    @timed(COMPONENT_EVENT)
     def _try_start_jobs(self, now: float):
         """尝试在空闲机器上启动作业。"""
         # 处理 A 机队列
@@ -201,163 +408,308 @@ class JobShop:
                 break
             job = self.a_queue.sort_and_pop(self.strategy, now, "A")
             if job:
-                duration = self._sample_process_time(job, "A")
-                end_time = now + duration
-                self.a_machines_busy_until[idle_a] = end_time
-                tardiness = max(0.0, end_time - job["due_date"])
-                self.results.append(SimulationResult(
-                    job_id=job["job_id"],
-                    job_type=job["job_type"],
-                    arrival_time=job["arrival_time"],
-                    start_time=now,
-                    end_time=end_time,
-                    due_date=job["due_date"],
-                    tardiness=tardiness,
-                    machine="A",
-                ))
+                self._start_job(job, "A", idle_a, now)
         
         # 处理 B 机队列
+        if self._b_reserved_until is not None:
+            if now < self._b_reserved_until:
+                # 预留计时器未到期：其间不会有 H 进入 B 队列，预留条件保持成立，无需逐事件重新判断
+                self._b_hold = (now, len(self.b_machines_busy_until) - self._count_in_service("B", now))
+                return
+            self._b_reserved_until = None
+        self._b_hold = None
         while True:
             idle_b = self._get_idle_machine("B", now)
             if idle_b is None or self.b_queue.is_empty():
                 break
             
             # 前瞻预留：检查是否应该等待 H
-            b_has_h = any(j["job_type"] == "H" for j in self.b_queue.peek_jobs())
+            b_has_h = self.b_queue.has_h()
             if not b_has_h and self._should_b_wait_for_h(now):
-                # B 机队列只有 N，但 H 即将到达，保持空闲
+                # B 机队列只有 N，但 H 即将到达：保持空闲，登记在该 H 到达时刻到期的预留计时器
+                self._b_reserved_until = self._next_h_arrival(now)
+                self._b_hold = (now, len(self.b_machines_busy_until) - self._count_in_service("B", now))
                 break
             
             job = self.b_queue.sort_and_pop(self.strategy, now, "B")
             if job:
-                if job["job_type"] == "H":
+                if job.type_code == TYPE_H:
                     self.h_in_b_system -= 1
-                duration = self._sample_process_time(job, "B")
-                end_time = now + duration
-                self.b_machines_busy_until[idle_b] = end_time
-                tardiness = max(0.0, end_time - job["due_date"])
-                self.results.append(SimulationResult(
-                    job_id=job["job_id"],
-                    job_type=job["job_type"],
-                    arrival_time=job["arrival_time"],
-                    start_time=now,
-                    end_time=end_time,
-                    due_date=job["due_date"],
-                    tardiness=tardiness,
-                    machine="B",
-                ))
-
-    def run(self) -> List[SimulationResult]:
-        """运行仿真。"""
-        random.seed(config.RANDOM_SEED)
-        
-        job_idx = 0
+                self._start_job(job, "B", idle_b, now)
+
+    def run(self, until: Optional[float] = None, max_events: Optional[int] = None) -> List[SimulationResult]:
+        """
+        运行仿真。
+        给定 until 时只处理时刻 <= until 的事件后返回，可随后 snapshot()/fork() 或再次 run() 继续；
+        给定 max_events 时本次调用最多处理这么多事件（Rollout 分支的计算预算）。
+        运行结束时关闭 Rollout 评估器的进程池（之后在线提交新订单时按需重建）。
+        """
+        if not self._started:
+            random.seed(global_seed(self.seed))
+            self._started = True
+
+        stop_at = None if max_events is None else self.events_processed + max_events
+        # 事件驱动循环
+        while not self._finished:
+            if until is not None and self.now > until:
+                break
+            if stop_at is not None and self.events_processed >= stop_at:
+                break
+            self._step()
+            if self.checkpointer is not None:
+                self.checkpointer.maybe_save(self)
+            if self.monitor is not None:
+                self.monitor.maybe_report(self)
+            if self.mark_every and self.events_processed >= self._next_mark and not self._finished:
+                self.marks.append(RunMark(self.snapshot(include_results=False), len(self.results)))
+                self._next_mark = self.events_processed + self.mark_every
+        if self.monitor is not None and self._finished:
+            self.monitor.finish(self)
+        if self.rollout is not None and self._finished:
+            self.rollout.close()
+        if until is not None:
+            self.clock = max(self.clock, float(until))
+
+        return self.results
+
+    def enable_checkpoints(self, directory: str | Path, every_events: Optional[int] = None,
+                           every_time: Optional[float] = None, fsync: bool = False) -> None:
+        """
+        开启周期性磁盘检查点：每处理 every_events 个事件或仿真时间推进 every_time 分钟写一次。
+        中断后可用 src.checkpoint.resume_from_checkpoint 从最近的检查点继续。
+        """
+        from .checkpoint import Checkpointer
+
+        self.checkpointer = Checkpointer(directory, every_events=every_events,
+                                         every_time=every_time, fsync=fsync)
+        self.checkpointer.attach(self)
+
+    def enable_marks(self, every_events: Optional[int] = None) -> None:
+        """
+        开启周期性状态标记：运行中每处理 every_events 个事件（缺省 config.MARK_EVERY_EVENTS）记录一次
+        不含结果的快照，供之后的 resimulate() 从变更点之前恢复。每个标记都复制两条队列，
+        过载时内存随 事件数 / every_events × 队列长度 增长，因此只在需要增量重仿真的运行上开启。
+        """
+        self.mark_every = config.MARK_EVERY_EVENTS if every_events is None else every_events
+        self._next_mark = self.events_processed + self.mark_every
+
+    def enable_live_metrics(self, channel, run_id: str, every_events: Optional[int] = None,
+                            every_seconds: Optional[float] = None) -> None:
+        """
+        开启实时进度上报：立即推送一条初始快照，运行中按墙钟间隔把事件数、仿真时间、吞吐与累计平均拖期推送到 channel
+        （有 put 方法的队列，通常为 src.live_metrics.LiveMetrics.queue），结束时再推送一条最终快照。
+        """
+        from .live_metrics import LiveReporter
+
+        self.monitor = LiveReporter(channel, run_id, every_events=every_events, every_seconds=every_seconds)
+        self.monitor.attach(self)
+
+    # ------------------------------------------------------------------
+    # 增量重仿真
+    # ------------------------------------------------------------------
+    def _first_change(self, jobs: List[Job]) -> tuple[int, float]:
+        """
+        比较按到达排序后的新旧订单序列，返回首个不同位置 i 与受影响的最早到达时刻；
+        位置 i 之前的订单（内容与顺序）完全相同。没有差异时返回 (len, inf)。
+        """
+        old, new = self.jobs, jobs
+        n = min(len(old), len(new))
+        i = 0
+        while i < n and (old[i] is new[i] or old[i] == new[i]):
+            i += 1
+        times = [seq[i].arrival_time for seq in (old, new) if i < len(seq)]
+        return i, min(times) if times else float("inf")
+
+    def resimulate(self, jobs: List[JobLike], sink: Optional[Callable[[SimulationResult], None]] = None) -> "JobShop":
+        """
+        订单集合变更（插单、删单、改交货期等）后的增量重仿真，返回以 jobs 运行完毕的新 JobShop，
+        结果与从 t=0 完整重跑相同；本对象不受影响，可继续作为下一次变更的基准。
+
+        首个受影响的到达时刻 t_c 之前的决策不受变更影响，但派工/预留会前瞻 B_RESERVATION_WINDOW 内的
+        H 到达（Rollout 的前向分支只用已到达的订单，不需要额外余量），因此从满足 clock + 前瞻余量 < t_c 的最近标记恢复，只重跑其后的事件。
+        sink 只接收恢复点之后新开工的结果。本对象运行前未调用 enable_marks() 时没有标记，从 t=0 完整重跑；
+        返回的新 JobShop 沿用本对象的标记间隔，可作为下一次变更的基准。
+        """
+        shop = JobShop(jobs, self.strategy, sink=sink,
+                       a_machines=len(self.a_machines_busy_until), b_machines=len(self.b_machines_busy_until),
+                       seed=self.seed, **self.scheduler.overrides())
+        if self.mark_every:
+            shop.enable_marks(self.mark_every)
+        index, changed_at = self._first_change(shop.jobs)
+        # 变更订单的加工时间可能随类型改变，其余订单的采样结果可直接复用
+        changed_ids = {j.job_id for j in self.jobs[index:]}
+        shop._process_times = {k: v for k, v in self._process_times.items() if k[0] not in changed_ids}
+
+        margin = self.scheduler.b_reservation_window
+        usable = [m for m in self.marks if m.state.clock + margin < changed_at]
+        if usable:
+            mark = usable[-1]
+            state = mark.state
+            # 标记中的下一事件时刻按旧订单序列算出，按新序列重新确定
+            next_arrival = shop.jobs[state.job_idx].arrival_time if state.job_idx < len(shop.jobs) else float("inf")
+            next_free = min((t for t in state.a_busy_until + state.b_busy_until if t > state.clock),
+                            default=float("inf"))
+            shop.restore(replace(state, now=min(next_arrival, next_free)))
+            shop.results = self.results[:mark.n_results]
+            shop.marks = usable
+            random.seed(global_seed(shop.seed))
+        shop.run()
+        return shop
+
+    # ------------------------------------------------------------------
+    # 在线（滚动时域）接口
+    # ------------------------------------------------------------------
+    def submit(self, order: JobLike) -> Job:
+        """
+        在线提交一个新订单，增量插入到达序列，不重跑已处理的事件。
+        order 至少包含 job_id 与 job_type；arrival_time 缺省为当前时钟，
+        expected_duration / due_date 缺省按 config 计算。返回实际入列的作业记录。
+        """
+        job = complete_order(order, self.clock)
+        if job.arrival_time < self.clock:
+            raise ValueError(f"订单 {job.job_id} 的到达时刻 {job.arrival_time} 早于当前时钟 {self.clock}")
+
+        if self._jobs_shared:
+            # 与分支共享的作业列表只读，写前复制（不复制作业字典本身）
+            self.jobs = list(self.jobs)
+            self.h_arrivals = list(self.h_arrivals)
+            self._jobs_shared = False
+
+        # 同一时刻到达的订单保持提交顺序
+        pos = bisect_right(self.jobs, job.arrival_time, lo=self._job_idx, key=_by_arrival)
+        self.jobs.insert(pos, job)
+        if job.type_code == TYPE_H:
+            insort(self.h_arrivals, job.arrival_time)
+            if self._b_reserved_until is not None and job.arrival_time < self._b_reserved_until:
+                # 新 H 先于预留目标到达，计时器作废，下一事件重新判断预留
+                self._b_reserved_until = None
+
+        if self._finished or self.now > job.arrival_time:
+            self.now = job.arrival_time
+        self._finished = False
+        return job
+
+    def advance(self, until: float) -> List[SimulationResult]:
+        """把仿真推进到时刻 until，返回本次新开工的作业（即派工建议）。"""
+        n_before = len(self.results)
+        self.run(until=until)
+        return self.results[n_before:]
+
+    def queue_state(self) -> Dict[str, List[Dict]]:
+        """当前两条队列中的作业，按策略优先级从高到低排列。"""
+        state = {}
+        for machine, queue in (("A", self.a_queue), ("B", self.b_queue)):
+            jobs = queue.peek_jobs()
+            jobs.sort(key=lambda j: self.scheduler.priority(j, machine, self.clock))
+            state[machine] = [
+                {
+                    "job_id": j.job_id,
+                    "job_type": j.job_type,
+                    "arrival_time": j.arrival_time,
+                    "due_date": j.due_date,
+                }
+                for j in jobs
+            ]
+        return state
+
+    def machine_state(self) -> List[Dict]:
+        """每台机器在当前时钟下的状态：是否在加工、加工中的作业与预计完工时刻。"""
+        busy = {
+            ("A", i): t for i, t in enumerate(self.a_machines_busy_until) if t > self.clock
+        }
+        busy.update({
+            ("B", i): t for i, t in enumerate(self.b_machines_busy_until) if t > self.clock
+        })
+        # 在制作业一定是该机台上最近开工的作业，从结果尾部回溯即可
+        running: Dict[tuple, int] = {}
+        for r in reversed(self.results):
+            if len(running) == len(busy):
+                break
+            key = (r.machine, r.machine_index)
+            if key in busy and key not in running:
+                running[key] = r.job_id
+
+        state = []
+        for machine, busy_list in (("A", self.a_machines_busy_until), ("B", self.b_machines_busy_until)):
+            for i, t in enumerate(busy_list):
+                key = (machine, i)
+                state.append({
+                    "machine": machine,
+                    "machine_index": i,
+                    "busy": key in busy,
+                    "job_id": running.get(key),
+                    "busy_until": t if key in busy else self.clock,
+                })
+        return state
+
+    def projected_tardiness(self) -> Dict[int, float]:
+        """
+        在不再有新订单的假设下推演到底，返回尚未开工的已提交订单的预计拖期 {job_id: 拖期}。
+        推演在 fork 出的分支上进行，不影响本对象状态。
+        """
+        branch = self.fork(keep_results=False)
+        return {r.job_id: r.tardiness for r in branch.run()}
+
+    @timed(COMPONENT_EVENT)
+    def _step(self) -> None:
+        """处理 self.now 时刻的事件，并把 self.now 推进到下一个事件时刻。"""
+        now = self.now
+        if self._b_hold is not None:
+            # 上一事件至今 B 机处于预留空等（其间没有开工或完工，空等台数不变）
+            since, idle = self._b_hold
+            self.b_reserved_idle += idle * (now - since)
+            self._b_hold = None
+        self.clock = max(self.clock, now)
+        self.events_processed += 1
         n_jobs = len(self.jobs)
-        now = 0.0
+
+        # 处理当前时刻的到达
+        while self._job_idx < n_jobs and self.jobs[self._job_idx].arrival_time <= now:
+            self._dispatch_job(self.jobs[self._job_idx], now)
+            self._job_idx += 1
         
-        # 事件驱动循环
-        while True:
-            # 处理当前时刻的到达
-            while job_idx < n_jobs and self.jobs[job_idx]["arrival_time"] <= now:
-                self._dispatch_job(self.jobs[job_idx], now)
-                job_idx += 1
-            
-            # 尝试启动作业
-            self._try_start_jobs(now)
-            
-            # 计算下一个事件时间
-            next_arrival = self.jobs[job_idx]["arrival_time"] if job_idx < n_jobs else float('inf')
-            
-            # 下一个机器完成时间（只考虑 > now 的）
-            next_machine_free = float('inf')
-            for t in self.a_machines_busy_until + self.b_machines_busy_until:
-                if t > now:
-                    next_machine_free = min(next_machine_free, t)
-            
-            next_event = min(next_arrival, next_machine_free)
-            
-            # 检查是否还有未处理的作业
+        # 尝试启动作业
+        self._try_start_jobs(now)
+        
+        # 计算下一个事件时间
+        next_arrival = self.jobs[self._job_idx].arrival_time if self._job_idx < n_jobs else float('inf')
+        
+        # 下一个机器完成时间（只考虑 > now 的）
+        next_machine_free = float('inf')
+        for t in self.a_machines_busy_until + self.b_machines_busy_until:
+            if t > now:
+                next_machine_free = min(next_machine_free, t)
+        
+        next_event = min(next_arrival, next_machine_free)
+        # B 机预留到期本身就是一个事件：到期时刻重新尝试 B 机开工
+        if self._b_reserved_until is not None and self._b_reserved_until > now:
+            next_event = min(next_event, self._b_reserved_until)
+        
+        if next_event == float('inf'):
+            # 没有任何未来事件：队列仍非空时收尾处理剩余作业
             queues_empty = self.a_queue.is_empty() and self.b_queue.is_empty()
-            all_done = len(self.results) >= n_jobs
-            
-            if next_event == float('inf'):
-                if queues_empty or all_done:
-                    break
-                # 队列非空但没有未来事件，说明有机器空闲，再试一次
-                # 找到最近的机器空闲时间
-                min_busy = min(self.a_machines_busy_until + self.b_machines_busy_until)
-                if min_busy <= now:
-                    # 机器已经空闲，但 _try_start_jobs 没处理（可能因为预留逻辑）
-                    # 等待下一个到达事件
-                    if next_arrival < float('inf'):
-                        now = next_arrival
-                        continue
-                    else:
-                        # 没有更多到达，强制处理剩余队列
-                        self._force_process_remaining(now)
-                        break
-                else:
-                    now = min_busy
-                    continue
-            
-            now = next_event
+            if not queues_empty and len(self.results) < n_jobs:
+                self._force_process_remaining(now)
+            self._finished = True
+            return
         
-        return self.results
+        self.now = next_event
     
     def _force_process_remaining(self, now: float):
-        """强制处理队列中剩余的作业（用于仿真结束时）。"""
-        # 处理 A 机队列
-        while not self.a_queue.is_empty():
-            idle_a = self._get_idle_machine("A", now)
-            if idle_a is None:
-                # 找到最早空闲的机器
-                now = min(self.a_machines_busy_until)
-                idle_a = self._get_idle_machine("A", now)
-            
-            job = self.a_queue.sort_and_pop(self.strategy, now, "A")
-            if job:
-                duration = self._sample_process_time(job, "A")
-                end_time = now + duration
-                self.a_machines_busy_until[idle_a] = end_time
-                tardiness = max(0.0, end_time - job["due_date"])
-                self.results.append(SimulationResult(
-                    job_id=job["job_id"],
-                    job_type=job["job_type"],
-                    arrival_time=job["arrival_time"],
-                    start_time=now,
-                    end_time=end_time,
-                    due_date=job["due_date"],
-                    tardiness=tardiness,
-                    machine="A",
-                ))
-                now = end_time
-        
-        # 处理 B 机队列（忽略预留逻辑）
-        while not self.b_queue.is_empty():
-            idle_b = self._get_idle_machine("B", now)
-            if idle_b is None:
-                now = min(self.b_machines_busy_until)
-                idle_b = self._get_idle_machine("B", now)
-            
-            job = self.b_queue.sort_and_pop(self.strategy, now, "B")
-            if job:
-                if job["job_type"] == "H":
-                    self.h_in_b_system -= 1
-                duration = self._sample_process_time(job, "B")
-                end_time = now + duration
-                self.b_machines_busy_until[idle_b] = end_time
-                tardiness = max(0.0, end_time - job["due_date"])
-                self.results.append(SimulationResult(
-                    job_id=job["job_id"],
-                    job_type=job["job_type"],
-                    arrival_time=job["arrival_time"],
-                    start_time=now,
-                    end_time=end_time,
-                    due_date=job["due_date"],
-                    tardiness=tardiness,
-                    machine="B",
-                ))
-                now = end_time
+        """
+        强制处理队列中剩余的作业（用于仿真结束时，忽略预留逻辑）。
+        A、B 两组各自从 now 开始，每个作业派给最早空闲的机台，各机台并行加工，不串行排队。
+        """
+        for machine, queue, busy_list in (("A", self.a_queue, self.a_machines_busy_until),
+                                          ("B", self.b_queue, self.b_machines_busy_until)):
+            while not queue.is_empty():
+                t = max(now, min(busy_list))
+                idle = self._get_idle_machine(machine, t)
+                job = queue.sort_and_pop(self.strategy, t, machine)
+                if job:
+                    if job.type_code == TYPE_H and machine == "B":
+                        self.h_in_b_system -= 1
+                    self._start_job(job, machine, idle, t)
 
 
 def summarize_results(results: List[SimulationResult]) -> Dict[str, float]:
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from . import config
+from .replication import t_quantile
+from .simulation_engine import JobShop
+from .workload import PoissonWorkload
+
+
+def mser(series: Sequence[float], batch: int = 5) -> Optional[int]:
+    """
+    MSER-m 预热期检测（缺省 m=5）：先取长度为 batch 的批均值 Z_j，
+    对截断点 d 最小化 Σ_{j>d}(Z_j - Z̄_d)² / (k-d)²，d 只在前一半批内搜索。
+    返回截断的观测数 d·batch；最优点落在搜索上限时说明序列尚未进入稳态，返回 None。
+    """
+    k = len(series) // batch
+    if k < 4:
+        return None
+    z = [sum(series[i * batch:(i + 1) * batch]) / batch for i in range(k)]
+    # 从尾部累加，使每个 d 的统计量 O(1) 得到
+    best_d, best_value = 0, math.inf
+    total = sq = 0.0
+    stats = [0.0] * k
+    for j in range(k - 1, -1, -1):
+        total += z[j]
+        sq += z[j] * z[j]
+        count = k - j
+        stats[j] = (sq - total * total / count) / (count * count)
+    limit = k // 2
+    for d in range(limit + 1):
+        if stats[d] < best_value:
+            best_d, best_value = d, stats[d]
+    if best_d >= limit:
+        return None
+    return best_d * batch
+
+
+@dataclass
+class BatchMeans:
+    mean: float
+    half_width: float
+    batches: int
+    lag1: float  # 批均值一阶自相关；明显大于 0 说明批长度不足
+
+
+def batch_means(series: Sequence[float], n_batches: int = 20,
+                confidence: float = config.REPLICATION_CONFIDENCE) -> BatchMeans:
+    """非重叠批均值法估计均值及置信区间半宽。"""
+    size = len(series) // n_batches
+    if size < 1 or n_batches < 2:
+        return BatchMeans(math.nan, math.inf, 0, math.nan)
+    means = [sum(series[i * size:(i + 1) * size]) / size for i in range(n_batches)]
+    grand = sum(means) / n_batches
+    var = sum((m - grand) ** 2 for m in means) / (n_batches - 1)
+    if var > 0:
+        lag1 = sum((means[i] - grand) * (means[i + 1] - grand) for i in range(n_batches - 1)) / ((n_batches - 1) * var)
+    else:
+        lag1 = 0.0
+    half = t_quantile(0.5 + confidence / 2.0, n_batches - 1) * math.sqrt(var / n_batches)
+    return BatchMeans(grand, half, n_batches, lag1)
+
+
+@dataclass
+class SteadyStateResult:
+    """稳态仿真结果：各类订单的截断点、批均值估计与是否收敛。"""
+    strategy: str
+    jobs_started: int
+    sim_time: float
+    converged: bool
+    stable: bool = True  # False 表示 H 负载已超过 B 机能力，不存在稳态，未运行
+    warmup: Dict[str, Optional[int]] = field(default_factory=dict)
+    estimates: Dict[str, BatchMeans] = field(default_factory=dict)
+
+
+def run_steady_state(workload: PoissonWorkload, strategy: str,
+                     relative_half_width: float = 0.1, abs_half_width: float = 1.0,
+                     n_batches: int = 20, min_batch_size: int = 10,
+                     chunk_time: float = 20_000.0, lookahead: Optional[float] = None,
+                     max_jobs: int = 200_000, check_growth: float = 1.2, **overrides) -> SteadyStateResult:
+    """
+    稳态运行模式：订单流分段在线提交给 JobShop（submit/advance），每段结束后
+    对 H、N 各自的拖期序列（按开工顺序）做 MSER-5 截断，对截断后的部分做批均值估计；
+    两类的半宽都不超过 max(abs_half_width, relative_half_width·均值) 时停止。
+    收敛检查按已开工作业数几何间隔进行（每增长 check_growth 倍检查一次），总开销与运行长度成线性。
+    H 负载超过 B 机能力时必然不存在稳态，直接返回 stable=False；其他不收敛情形运行到 max_jobs 为止。
+
+    lookahead：订单提前提交的时长，保证预留/前瞻类策略能看到即将到达的 H，
+    缺省为 B_RESERVATION_WINDOW。
+    """
+    if lookahead is None:
+        lookahead = config.B_RESERVATION_WINDOW
+
+    b_machines = overrides.get("b_machines") or config.B_MACHINES
+    rho_h = workload.h_rate * config.expected_triangular(*config.TRIANGULAR_B_H) / b_machines
+    if rho_h >= 1.0:
+        return SteadyStateResult(strategy, 0, 0.0, False, stable=False)
+
+    shop = JobShop([], strategy, **overrides)
+    series: Dict[str, List[float]] = {"H": [], "N": []}
+    until = 0.0
+    next_check = n_batches * min_batch_size
+    result = SteadyStateResult(strategy, 0, 0.0, False)
+
+    while True:
+        for job in workload.generate(until + chunk_time + lookahead):
+            shop.submit(job)
+        until += chunk_time
+        for r in shop.advance(until):
+            series[r.job_type].append(r.tardiness)
+
+        result.jobs_started = len(shop.results)
+        result.sim_time = until
+        if result.jobs_started < min(next_check, max_jobs):
+            continue
+        next_check = int(result.jobs_started * check_growth) + 1
+        converged = True
+        for job_type, values in series.items():
+            if (workload.h_rate if job_type == "H" else workload.n_rate) == 0:
+                continue
+            key = f"mean_tardiness_{job_type.lower()}"
+            d = mser(values)
+            result.warmup[key] = d
+            if d is None or len(values) - d < n_batches * min_batch_size:
+                converged = False
+                continue
+            est = batch_means(values[d:], n_batches)
+            result.estimates[key] = est
+            if est.half_width > max(abs_half_width, relative_half_width * abs(est.mean)):
+                converged = False
+        if converged or result.jobs_started >= max_jobs:
+            result.converged = converged
+            return result
@@ -1,14 +1,36 @@
 from __future__ import annotations
 
 import csv
+import os
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict
 
-import matplotlib.pyplot as plt
-from matplotlib import font_manager
+from .profiling import COMPONENT_EXPORT, COMPONENT_PLOT, timed
 
+# 无界面批处理模式：开启后所有绘图函数直接返回，不导入 matplotlib。
+# 并行扫描的工作进程可通过环境变量 DSO_HEADLESS=1 继承该模式。
+HEADLESS = os.environ.get("DSO_HEADLESS", "") == "1"
+
+
+def set_headless(enabled: bool = True) -> None:
+    """开启/关闭无界面批处理模式。"""
+    global HEADLESS
+    HEADLESS = enabled
+
+
+@lru_cache(maxsize=None)
+def _pyplot():
+    """首次绘图时才导入 matplotlib，沿用 matplotlib 的缺省后端；无界面批处理模式下各绘图函数不会调用到这里。"""
+    import matplotlib.pyplot as plt
+    return plt
+
+
+@lru_cache(maxsize=None)
+def _resolve_chinese_font() -> str | None:
+    """在系统字体中查找可用的中文字体，只扫描一次字体列表。"""
+    from matplotlib import font_manager
 
-def _setup_chinese_font() -> None:
     candidates = [
         "Microsoft YaHei",
         "SimHei",
@@ -19,17 +41,28 @@ def _setup_chinese_font() -> None:
     available = {f.name for f in font_manager.fontManager.ttflist}
     for name in candidates:
         if name in available:
-            plt.rcParams["font.sans-serif"] = [name]
-            break
+            return name
+    return None
+
+
+def _setup_chinese_font():
+    plt = _pyplot()
+    name = _resolve_chinese_font()
+    if name is not None:
+        plt.rcParams["font.sans-serif"] = [name]
     plt.rcParams["axes.unicode_minus"] = False
+    return plt
 
 
+@timed(COMPONENT_PLOT)
 def plot_comparison(summary_records: List[Dict], output_dir: str | Path, filename: str | None = None) -> None:
     """
     生成柱状图对比不同策略的 H/N 平均拖期。
     summary_records: [{dataset, strategy, mean_tardiness_h, mean_tardiness_n}]
     """
-    _setup_chinese_font()
+    if HEADLESS:
+        return
+    plt = _setup_chinese_font()
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -62,18 +95,84 @@ def plot_comparison(summary_records: List[Dict], output_dir: str | Path, filenam
         plt.close(fig)
 
 
+def _assign_lanes(rows: List[Dict]) -> List[int]:
+    """
+    为缺少 machine_index 的结果推断机台编号。
+    与引擎一致：按开工时间顺序，分配给编号最小的空闲机台。
+    """
+    lanes = [0] * len(rows)
+    busy_until: Dict[str, List[float]] = {}
+    order = sorted(range(len(rows)), key=lambda i: rows[i]["start_time"])
+    for i in order:
+        r = rows[i]
+        machine_busy = busy_until.setdefault(r["machine"], [])
+        for lane, t in enumerate(machine_busy):
+            if t <= r["start_time"]:
+                break
+        else:
+            lane = len(machine_busy)
+            machine_busy.append(0.0)
+        machine_busy[lane] = r["end_time"]
+        lanes[i] = lane
+    return lanes
+
+
+def _merge_bars(bars: List[tuple], resolution: float) -> List[tuple]:
+    """
+    细节层次（LOD）合并：把同一机台的时间轴按 resolution（约一个像素）分桶，
+    每个有加工的桶画一条色条，颜色取桶内加工时长最多的订单类型，相邻且同色的桶再合并为一条。
+    H/N 交替的泳道（B 机上很常见）也因此降到至多画布像素数条色条。
+    bars: [(start, end, job_type)]，需已按 start 排序。
+    """
+    if resolution <= 0 or not bars:
+        return bars
+    origin = bars[0][0]
+    horizon = max(end for _, end, _ in bars)
+    busy: Dict[int, Dict[str, float]] = {}
+    for start, end, job_type in bars:
+        for k in range(int((start - origin) // resolution), int((end - origin) // resolution) + 1):
+            lo = max(start, origin + k * resolution)
+            hi = min(end, origin + (k + 1) * resolution)
+            if hi > lo:
+                bucket = busy.setdefault(k, {})
+                bucket[job_type] = bucket.get(job_type, 0.0) + (hi - lo)
+
+    merged: List[tuple] = []
+    last_k = None
+    for k in sorted(busy):
+        by_type = busy[k]
+        job_type = max(sorted(by_type), key=by_type.get)
+        end = min(origin + (k + 1) * resolution, horizon)
+        if merged and last_k == k - 1 and merged[-1][2] == job_type:
+            merged[-1] = (merged[-1][0], end, job_type)
+        else:
+            merged.append((origin + k * resolution, end, job_type))
+        last_k = k
+    return merged
+
+
+@timed(COMPONENT_PLOT)
 def plot_gantt(
     results: List[Dict],
     output_dir: str | Path | None = None,
     output_path: str | Path | None = None,
     filename: str | None = None,
-    max_jobs: int = 50,
+    max_jobs: int | None = 50,
+    label_limit: int = 200,
+    lod_pixels: float = 1.0,
 ) -> None:
     """
-    绘制甘特图，区分机器（A/B）和订单类型颜色。
-    results: list of dicts with start_time, end_time, machine, job_type, job_id
+    绘制甘特图，每台机器一条泳道（A1..An, B1..Bm），按订单类型着色。
+    results: list of dicts with start_time, end_time, machine, job_type, job_id (可选 machine_index)
+
+    max_jobs=None 时绘制全时域；每个机器组的全部色条通过一次 PolyCollection 绘制，
+    订单数超过 label_limit 时不再标注编号，并按 lod_pixels 像素宽的时间桶合并色条（LOD，见 _merge_bars）。
     """
-    _setup_chinese_font()
+    if HEADLESS:
+        return
+    plt = _setup_chinese_font()
+    from matplotlib.collections import PolyCollection
+
     if output_path is None:
         if output_dir is None:
             raise ValueError("plot_gantt 需要 output_dir 或 output_path")
@@ -81,29 +180,128 @@ def plot_gantt(
         output_dir.mkdir(parents=True, exist_ok=True)
         output_path = output_dir / (filename or "gantt_chart.png")
     output_path = Path(output_path)
-    rows = sorted(results, key=lambda x: x["start_time"])[:max_jobs]
+    if max_jobs is None:
+        rows = list(results)
+    else:
+        rows = sorted(results, key=lambda x: x["start_time"])[:max_jobs]
 
-    y_map = {"A": 10, "B": 30}
     colors = {"H": "#d62728", "N": "#1f77b4"}
+    fig_width_inch, dpi = 10, 200
+
+    if rows and "machine_index" not in rows[0]:
+        lanes = _assign_lanes(rows)
+    else:
+        lanes = [int(r["machine_index"]) for r in rows]
+
+    # 泳道：(机器类型, 机台编号) -> 该泳道上的色条
+    lane_bars: Dict[tuple, List[tuple]] = {}
+    for r, lane in zip(rows, lanes):
+        lane_bars.setdefault((r["machine"], lane), []).append(
+            (r["start_time"], r["end_time"], r["job_type"])
+        )
 
-    fig, ax = plt.subplots(figsize=(10, 5))
-    for r in rows:
-        y = y_map.get(r["machine"], 10)
-        ax.broken_barh([(r["start_time"], r["end_time"] - r["start_time"])], (y, 8),
-                       facecolors=colors.get(r["job_type"], "#7f7f7f"))
-        ax.text(r["start_time"], y + 9, str(r["job_id"]), fontsize=6, alpha=0.6)
+    # 机台数由结果推断（各机器组编号 0..最大编号），编号较小但全程空闲的机台也保留其泳道
+    n_lanes: Dict[str, int] = {}
+    for machine, lane in lane_bars:
+        n_lanes[machine] = max(n_lanes.get(machine, 0), lane + 1)
+    lane_keys = sorted((m, i) for m, n in n_lanes.items() for i in range(n))
+    y_pos = {key: idx * 10 for idx, key in enumerate(lane_keys)}
 
-    ax.set_yticks([10, 30])
-    ax.set_yticklabels(["A 机", "B 机"])
+    if rows:
+        t_min = min(r["start_time"] for r in rows)
+        t_max = max(r["end_time"] for r in rows)
+    else:
+        t_min, t_max = 0.0, 1.0
+    resolution = (t_max - t_min) / (fig_width_inch * dpi) * lod_pixels
+
+    fig, ax = plt.subplots(figsize=(fig_width_inch, max(3.0, 0.4 * len(lane_keys) + 1.5)))
+    for group in sorted({m for m, _ in lane_keys}):
+        verts = []
+        facecolors = []
+        for key, bars in lane_bars.items():
+            if key[0] != group:
+                continue
+            y = y_pos[key]
+            if len(rows) > label_limit:
+                bars = _merge_bars(sorted(bars), resolution)
+            for start, end, job_type in bars:
+                verts.append(((start, y), (start, y + 8), (end, y + 8), (end, y)))
+                facecolors.append(colors.get(job_type, "#7f7f7f"))
+        if verts:
+            # 标注模式下用细白边区分首尾相接的订单；LOD 模式下不描边
+            edge = "none" if len(rows) > label_limit else "white"
+            ax.add_collection(PolyCollection(verts, facecolors=facecolors, edgecolors=edge, linewidths=0.3))
+
+    if len(rows) <= label_limit:
+        for r, lane in zip(rows, lanes):
+            y = y_pos[(r["machine"], lane)]
+            ax.text(r["start_time"], y + 9, str(r["job_id"]), fontsize=6, alpha=0.6)
+
+    ax.set_xlim(t_min, t_max)
+    ax.set_ylim(-2, len(lane_keys) * 10)
+    ax.set_yticks([y_pos[key] + 4 for key in lane_keys])
+    ax.set_yticklabels([f"{m}{i + 1} 机" for m, i in lane_keys])
     ax.set_xlabel("时间 (分钟)")
-    ax.set_title("前 50 个订单甘特图")
+    if max_jobs is None:
+        ax.set_title(f"全时域甘特图（{len(rows)} 个订单）")
+    else:
+        ax.set_title(f"前 {len(rows)} 个订单甘特图")
     ax.grid(True, axis="x", linestyle="--", alpha=0.3)
     fig.tight_layout()
 
-    fig.savefig(output_path, dpi=200)
+    fig.savefig(output_path, dpi=dpi)
+    plt.close(fig)
+
+
+@timed(COMPONENT_PLOT)
+def plot_pareto_front(points: List[Dict], output_dir: str | Path, filename: str | None = None,
+                      label_limit: int = 12) -> None:
+    """
+    绘制 H/N 平均拖期的 Pareto 前沿图。
+    points: [{label, mean_tardiness_h, mean_tardiness_n, b_utilization, pareto, dropped}]
+
+    横轴 H、纵轴 N；前沿成员按 B 机利用率着色，其余已评估配置为灰点（提前淘汰的为叉）。
+    第三个目标（B 机利用率）只以颜色表示，因此二维投影中部分前沿成员看起来可能被其他点支配，
+    也不连成阶梯线。前沿成员不超过 label_limit 个时标注名称。
+    """
+    if HEADLESS:
+        return
+    plt = _setup_chinese_font()
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    front = sorted((p for p in points if p.get("pareto")), key=lambda p: p["mean_tardiness_h"])
+    kept = [p for p in points if not p.get("pareto") and not p.get("dropped")]
+    dropped = [p for p in points if not p.get("pareto") and p.get("dropped")]
+
+    fig, ax = plt.subplots(figsize=(8, 5.5))
+    if kept:
+        ax.scatter([p["mean_tardiness_h"] for p in kept], [p["mean_tardiness_n"] for p in kept],
+                   s=18, color="#bbbbbb", label="已评估（被支配）")
+    if dropped:
+        ax.scatter([p["mean_tardiness_h"] for p in dropped], [p["mean_tardiness_n"] for p in dropped],
+                   s=18, marker="x", color="#bbbbbb", label="提前淘汰")
+    if front:
+        xs = [p["mean_tardiness_h"] for p in front]
+        ys = [p["mean_tardiness_n"] for p in front]
+        sc = ax.scatter(xs, ys, c=[p["b_utilization"] for p in front], cmap="viridis", s=50,
+                        edgecolors="black", linewidths=0.5, zorder=3, label="Pareto 前沿")
+        fig.colorbar(sc, ax=ax, label="B 机利用率")
+        if len(front) <= label_limit:
+            for p in front:
+                ax.annotate(p["label"], (p["mean_tardiness_h"], p["mean_tardiness_n"]), fontsize=6,
+                            xytext=(4, 4), textcoords="offset points", alpha=0.8)
+    ax.set_xlabel("H 平均拖期 (分钟)")
+    ax.set_ylabel("N 平均拖期 (分钟)")
+    ax.set_title(f"H/N 拖期 Pareto 前沿（{len(front)} 个非支配配置）")
+    ax.grid(True, linestyle="--", alpha=0.3)
+    ax.legend(fontsize=8)
+    fig.tight_layout()
+    fig.savefig(output_dir / (filename or "pareto_front.png"), dpi=200)
     plt.close(fig)
 
 
+@timed(COMPONENT_EXPORT)
 def export_results_csv(results: List[Dict], output_path: str | Path) -> None:
     output_path = Path(output_path)
     if not results:
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+from . import config
+from .rng import PURPOSE_WORKLOAD, Seed, make_rng
+
+
+class PoissonWorkload:
+    """
+    合成订单流：H、N 两类各自为泊松到达，交货期规则与 data_loader 相同
+    （到达时间 + DUE_DATE_FACTOR·期望加工时间 ± 10% 扰动）。
+    可按时间分段生成，用于稳态仿真等需要任意长订单流的场景。
+    """
+
+    def __init__(self, h_rate: float, n_rate: float, seed: Seed = config.RANDOM_SEED, start_id: int = 1):
+        if h_rate < 0 or n_rate < 0 or h_rate + n_rate <= 0:
+            raise ValueError("到达率必须非负且不全为 0")
+        self.h_rate = h_rate
+        self.n_rate = n_rate
+        self.rng = make_rng(seed, PURPOSE_WORKLOAD)
+        self.next_id = start_id
+        self.generated_until = 0.0
+        self._next_arrival = self.rng.expovariate(h_rate + n_rate)
+
+    @classmethod
+    def from_jobs(cls, jobs: List[Dict], compression_factor: float = 1.0,
+                  seed: Seed = config.RANDOM_SEED) -> "PoissonWorkload":
+        """按现有数据集的平均到达率构造（compression_factor 含义同 run_sensitivity）。"""
+        times = [j["arrival_time"] for j in jobs]
+        span = (max(times) - min(times)) * compression_factor
+        if span <= 0:
+            raise ValueError("数据集到达时间跨度为 0，无法估计到达率")
+        h = sum(1 for j in jobs if j["job_type"] == "H")
+        return cls(h_rate=h / span, n_rate=(len(jobs) - h) / span, seed=seed)
+
+    def _make_job(self, arrival_time: float) -> Dict:
+        job_type = "H" if self.rng.random() * (self.h_rate + self.n_rate) < self.h_rate else "N"
+        expected = config.expected_processing_time(job_type)
+        due_jitter = self.rng.uniform(-0.1, 0.1) * expected
+        job = {
+            "job_id": self.next_id,
+            "arrival_time": arrival_time,
+            "job_type": job_type,
+            "expected_duration": float(expected),
+            "due_date": arrival_time + config.DUE_DATE_FACTOR * expected + due_jitter,
+        }
+        self.next_id += 1
+        return job
+
+    def generate(self, until: float, limit: Optional[int] = None) -> List[Dict]:
+        """生成到达时刻 <= until 的下一段订单（按到达时间排序）。"""
+        out = []
+        while self._next_arrival <= until and (limit is None or len(out) < limit):
+            out.append(self._make_job(self._next_arrival))
+            self._next_arrival += self.rng.expovariate(self.h_rate + self.n_rate)
+        self.generated_until = max(self.generated_until, until)
+        return out
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+检查点恢复检查：运行中途"崩溃"（sink 抛出异常）后，用 resume_from_checkpoint 从检查点目录继续，
+结果必须与未中断的运行逐作业相同；恢复后的运行再次中断也能继续恢复；订单不一致时拒绝恢复。
+
+    python test_checkpoint.py
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT))
+
+from src.checkpoint import resume_from_checkpoint
+from src.data_loader import load_and_process_data
+from src.scheduler import STRATEGY_ROLLOUT, available_strategies
+from src.simulation_engine import JobShop
+
+DATASET = ROOT / "native_data" / "csv" / "Data1.3.csv"
+
+
+class _Crash(Exception):
+    pass
+
+
+def _crash_after(n):
+    seen = []
+
+    def sink(result):
+        seen.append(result)
+        if len(seen) >= n:
+            raise _Crash()
+    return sink
+
+
+def _key(results):
+    return [(r.job_id, r.machine, r.machine_index, r.start_time, r.end_time) for r in results]
+
+
+def check(strategies=None, every_events=97):
+    jobs = load_and_process_data(DATASET)
+    failures = []
+    for strategy in strategies or [s for s in available_strategies() if s != STRATEGY_ROLLOUT]:
+        expected = _key(JobShop(jobs, strategy).run())
+        with tempfile.TemporaryDirectory() as directory:
+            shop = JobShop(jobs, strategy, sink=_crash_after(len(jobs) // 3))
+            shop.enable_checkpoints(directory, every_events=every_events)
+            try:
+                shop.run()
+            except _Crash:
+                pass
+            # 恢复后再中断一次，检验检查点链
+            resumed = resume_from_checkpoint(directory, jobs, sink=_crash_after(len(jobs) // 3),
+                                             every_events=every_events)
+            try:
+                resumed.run()
+            except _Crash:
+                pass
+            final = resume_from_checkpoint(directory, jobs, every_events=every_events)
+            ok = _key(final.run()) == expected
+            print(f"  {strategy:<22} {'一致' if ok else '不一致'}")
+            if not ok:
+                failures.append(strategy)
+    return failures
+
+
+def test_resume_matches_uninterrupted_run():
+    assert check() == []
+
+
+def test_resume_rejects_other_jobs():
+    jobs = load_and_process_data(DATASET)
+    with tempfile.TemporaryDirectory() as directory:
+        shop = JobShop(jobs, "FCFS")
+        shop.enable_checkpoints(directory, every_events=100)
+        shop.run(until=jobs[len(jobs) // 2].arrival_time)
+        try:
+            resume_from_checkpoint(directory, jobs[:-1])
+        except ValueError:
+            return
+    raise AssertionError("订单不一致时应拒绝恢复")
+
+
+def main():
+    failures = check()
+    print("检查点恢复检查通过" if not failures else f"不一致：{failures}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
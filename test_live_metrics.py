@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+实时指标检查：enable_live_metrics 挂上时立即推送初始快照，因此首次常规上报前就卡住的运行
+也会被 LiveMetrics.stalled 列出；运行结束后的最终快照使其不再被判为停滞。
+
+    python test_live_metrics.py
+"""
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT))
+
+from src.data_loader import load_and_process_data
+from src.live_metrics import LiveMetrics
+from src.simulation_engine import JobShop
+
+DATASET = ROOT / "native_data" / "csv" / "Data1.3.csv"
+
+
+def _wait_for(live, run_id, final=False, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        sample = live.latest.get(run_id)
+        if sample is not None and sample["final"] == final:
+            return sample
+        time.sleep(0.01)
+    raise AssertionError(f"{run_id} 未收到{'最终' if final else '初始'}快照")
+
+
+def test_run_is_tracked_before_first_report():
+    jobs = load_and_process_data(DATASET)
+    with LiveMetrics(echo=False, stall_seconds=0.05) as live:
+        shop = JobShop(jobs, "FCFS")
+        shop.enable_live_metrics(live.queue, "hung")
+        sample = _wait_for(live, "hung")
+        assert sample["events"] == 0 and sample["jobs_total"] == len(jobs)
+        time.sleep(0.1)
+        assert live.stalled() == ["hung"]
+
+        shop.run()
+        _wait_for(live, "hung", final=True)
+        assert live.stalled() == []
+
+
+def main():
+    test_run_is_tracked_before_first_report()
+    print("实时指标检查通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
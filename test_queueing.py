@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+排队论预筛检查：H 拖期下界对各策略、各 B 机数、各到达压缩都不超过仿真值（可安全用于跳过仿真）；
+基准策略的解析估计按负载均衡推断 N 去 B 的比例，与预留策略的估计不同。
+
+    python test_queueing.py
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT))
+
+from run_sensitivity import compress_arrival_times
+from src.data_loader import load_and_process_data
+from src.queueing import estimate_queue, h_tardiness_lower_bound
+from src.scheduler import STRATEGY_ROLLOUT, available_strategies
+from src.simulation_engine import JobShop, summarize_results
+
+DATA_DIR = ROOT / "native_data" / "csv"
+
+
+def check(datasets=("Data1.1", "Data1.2", "Data1.3"), factors=(1.0, 0.8, 0.6), b_values=(1, 2, 3)):
+    failures = []
+    strategies = [s for s in available_strategies() if s != STRATEGY_ROLLOUT]
+    for name in datasets:
+        jobs = load_and_process_data(DATA_DIR / f"{name}.csv")
+        for factor in factors:
+            compressed = compress_arrival_times(jobs, factor)
+            for b in b_values:
+                bound = h_tardiness_lower_bound(jobs, b, compression_factor=factor)
+                best = min(summarize_results(JobShop(compressed, s, b_machines=b).run())["mean_tardiness_h"]
+                           for s in strategies)
+                ok = bound <= best + 1e-9
+                print(f"  {name} x{factor:g} B={b}: 下界 {bound:10.2f}  仿真最小值 {best:10.2f}  {'✓' if ok else '✗'}")
+                if not ok:
+                    failures.append((name, factor, b))
+    return failures
+
+
+def test_lower_bound_holds():
+    assert check() == []
+
+
+def test_baseline_split_differs_from_reserving():
+    jobs = load_and_process_data(DATA_DIR / "Data1.3.csv")
+    fcfs = estimate_queue(jobs, "FCFS")
+    composite = estimate_queue(jobs, "Cost_Based_Composite")
+    assert fcfs.n_to_b_fraction > 0 and composite.n_to_b_fraction == 0
+    assert fcfs.tardiness_h > composite.tardiness_h
+
+
+def main():
+    failures = check()
+    print("H 拖期下界检查通过" if not failures else f"下界高于仿真值：{failures}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+B 机预留检查（Cost_Based_Composite，加工时间固定）：
+- N 在 H 恰好位于预留窗口边界时被分到 B（派工规则为 >= 窗口），但 B 机随即为该 H 预留空等（预留规则为 <= 窗口），
+  预留计时器在 H 到达时刻到期，H 与 N 同时在两台 B 机上开工，空等机时记入 b_reserved_idle；
+- 收尾处理 _force_process_remaining 把剩余作业派给最早空闲的机台，各机台并行加工而不是首尾相接。
+
+    python test_reservation.py
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT))
+
+from src.scheduler import STRATEGY_COST_COMPOSITE
+from src.simulation_engine import JobShop, complete_order
+
+WINDOW = 200.0
+
+
+def _order(job_id, job_type, arrival_time):
+    return complete_order({"job_id": job_id, "job_type": job_type, "arrival_time": arrival_time})
+
+
+def test_b_waits_for_h_inside_window():
+    jobs = [_order(1, "N", 0.0), _order(2, "N", 10.0), _order(3, "H", 10.0 + WINDOW)]
+    process_times = {(1, "A"): 500.0, (2, "B"): 100.0, (3, "B"): 50.0}
+    shop = JobShop(jobs, STRATEGY_COST_COMPOSITE, a_machines=1, b_machines=2, reservation_window=WINDOW,
+                   overflow_limit=0, process_times=process_times)
+    results = {r.job_id: r for r in shop.run()}
+
+    assert (results[1].machine, results[1].start_time) == ("A", 0.0)
+    # N2 进入 B 队列后，两台 B 机都为 t=210 到达的 H3 空等，到期后 H3 与 N2 并行开工
+    assert results[2].machine == "B" and results[3].machine == "B"
+    assert results[3].start_time == 10.0 + WINDOW
+    assert results[2].start_time == 10.0 + WINDOW
+    assert {results[2].machine_index, results[3].machine_index} == {0, 1}
+    assert shop.b_reserved_idle == 2 * WINDOW
+    # 事件只有 t=0、10、210（H3 到达即预留到期）与三次完工 260、310、500，预留期间没有空转轮询
+    assert shop.events_processed == 6
+
+
+def test_force_process_remaining_runs_machines_in_parallel():
+    jobs = [_order(i, "N", 0.0) for i in range(1, 5)] + [_order(i, "H", 0.0) for i in range(5, 7)]
+    process_times = {(i, "A"): 100.0 for i in range(1, 5)}
+    process_times.update({(i, "B"): 30.0 for i in range(5, 7)})
+    shop = JobShop(jobs, STRATEGY_COST_COMPOSITE, a_machines=2, b_machines=2, process_times=process_times)
+    for job in shop.jobs:
+        (shop.a_queue if job.job_type == "N" else shop.b_queue).add(job)
+    shop._force_process_remaining(0.0)
+
+    starts = sorted((r.machine, r.start_time, r.machine_index) for r in shop.results)
+    assert starts == [("A", 0.0, 0), ("A", 0.0, 1), ("A", 100.0, 0), ("A", 100.0, 1),
+                      ("B", 0.0, 0), ("B", 0.0, 1)]
+    assert max(r.end_time for r in shop.results) == 200.0
+
+
+def main():
+    test_b_waits_for_h_inside_window()
+    test_force_process_remaining_runs_machines_in_parallel()
+    print("B 机预留检查通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
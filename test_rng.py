@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+随机流检查：triangular_block 批量生成的变量与逐次 random.Random.triangular 逐位相同，
+且生成后随机流位置一致；config 中的各组三角分布参数与退化、缺省众数情形都覆盖。
+
+    python test_rng.py
+"""
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT))
+
+from src import config
+from src.rng import SeedSequence, triangular_block
+
+CASES = [config.TRIANGULAR_A_N, config.TRIANGULAR_B_N, config.TRIANGULAR_B_H, (5.0, 5.0, 5.0), (0.1, 0.3, 7.9)]
+
+
+def test_triangular_block_matches_stdlib():
+    for i, (a, c, b) in enumerate(CASES):
+        for mode in (c, None):
+            seed = SeedSequence().child(i).state("test", mode is None)
+            bulk_rng, call_rng = random.Random(seed), random.Random(seed)
+            bulk = triangular_block(bulk_rng, a, b, mode, 5000)
+            calls = [call_rng.triangular(a, b, mode) for _ in range(5000)]
+            assert [x.hex() for x in bulk] == [x.hex() for x in calls], (a, c, b, mode)
+            assert bulk_rng.random() == call_rng.random()
+
+
+def main():
+    test_triangular_block_matches_stdlib()
+    print("随机流检查通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
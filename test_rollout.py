@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Rollout 检查：前向分支不使用未来信息，因此批量运行与按到达逐单在线提交（提前量为预留窗口，
+与 Cost_Based_Composite 的前瞻相同）的结果逐作业相同；进程池评估与本地评估结果相同，运行结束后进程池已关闭。
+
+    python test_rollout.py
+"""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT))
+
+from src import config
+from src.data_loader import load_and_process_data
+from src.rollout import RolloutPolicy
+from src.scheduler import STRATEGY_ROLLOUT
+from src.simulation_engine import JobShop
+
+DATASET = ROOT / "native_data" / "csv" / "Data1.3.csv"
+
+
+def _key(results):
+    return sorted((r.job_id, r.machine, r.machine_index, r.start_time, r.end_time) for r in results)
+
+
+def _online(jobs, lookahead):
+    shop = JobShop([], STRATEGY_ROLLOUT)
+    shop.rollout = RolloutPolicy(workers=1)
+    i = 0
+    for job in jobs:
+        while i < len(jobs) and jobs[i]["arrival_time"] <= job["arrival_time"] + lookahead:
+            shop.submit(dict(jobs[i]))
+            i += 1
+        shop.advance(job["arrival_time"])
+    shop.run()
+    return shop.results
+
+
+def _batch(jobs, workers=1):
+    shop = JobShop(jobs, STRATEGY_ROLLOUT)
+    shop.rollout = RolloutPolicy(workers=workers)
+    results = shop.run()
+    assert shop.rollout._pool is None, "运行结束后应关闭进程池"
+    return results
+
+
+def test_batch_matches_online():
+    jobs = load_and_process_data(DATASET)
+    assert _key(_batch(jobs)) == _key(_online(jobs, config.B_RESERVATION_WINDOW + 1.0))
+
+
+def test_pool_matches_local():
+    jobs = load_and_process_data(DATASET)[:200]
+    assert _key(_batch(jobs, workers=2)) == _key(_batch(jobs))
+
+
+def main():
+    test_batch_matches_online()
+    test_pool_matches_local()
+    print("Rollout 检查通过")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
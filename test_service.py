@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+what-if 服务本机测试：在 127.0.0.1 的随机端口启动服务，检查
+结果与直接仿真一致、相同查询合并、缓存命中、并发查询攒批，以及非法取值（NaN/inf/负数）被拒绝且服务不受影响。
+
+    python test_service.py
+"""
+import asyncio
+import json
+import sys
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT))
+
+from src import config
+from src.data_loader import load_and_process_data
+from src.service import WhatIfService, serve
+from src.simulation_engine import JobShop, summarize_results
+
+DATASET = "Data1.3"
+
+
+def _request(base, path, payload=None):
+    data = None if payload is None else json.dumps(payload).encode("utf-8")
+    req = urllib.request.Request(base + path, data=data, method="GET" if data is None else "POST")
+    try:
+        with urllib.request.urlopen(req, timeout=60) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.loads(exc.read())
+
+
+async def _scenario(jobs):
+    service = WhatIfService({DATASET: jobs}, max_workers=1, batch_window=0.05)
+    address = asyncio.get_running_loop().create_future()
+    server = asyncio.ensure_future(serve(service, "127.0.0.1", 0, ready=lambda h, p: address.set_result(p)))
+    port = await asyncio.wait_for(address, timeout=60)
+    base = f"http://127.0.0.1:{port}"
+
+    async def call(path, payload=None):
+        return await asyncio.to_thread(_request, base, path, payload)
+
+    try:
+        # 结果与直接仿真一致
+        status, body = await call("/whatif", {"dataset": DATASET, "strategy": "OPT"})
+        assert status == 200 and body["source"] == "simulated", body
+        expected = summarize_results(JobShop(jobs, "OPT").run())
+        for key, value in expected.items():
+            assert abs(body["metrics"][key] - value) < 1e-9, (key, body["metrics"][key], value)
+
+        # 相同查询：并发时合并为一次仿真，之后命中缓存；显式给出缺省参数视为同一查询
+        query = {"dataset": DATASET, "strategy": "FCFS", "orders": [{"job_type": "H", "arrival_time": 120}]}
+        before = service.stats.simulations
+        replies = await asyncio.gather(*(call("/whatif", query) for _ in range(6)))
+        assert all(status == 200 for status, _ in replies), replies
+        assert service.stats.simulations == before + 1, service.stats
+        assert sorted(r["source"] for _, r in replies).count("simulated") == 1
+        assert len(replies[0][1]["orders"]) == 1 and replies[0][1]["metrics"]["n_jobs"] == len(jobs) + 1
+        same = dict(query, overrides={"b_machines": config.B_MACHINES})
+        status, body = await call("/whatif", same)
+        assert status == 200 and body["source"] == "cache", body
+
+        # 并发的不同查询攒成一批
+        batches = service.stats.batches
+        distinct = [{"dataset": DATASET, "strategy": "EDD", "overrides": {"reservation_window": w}}
+                    for w in (10, 20, 30, 40)]
+        replies = await asyncio.gather(*(call("/whatif", q) for q in distinct))
+        assert all(status == 200 and r["source"] == "simulated" for status, r in replies), replies
+        assert service.stats.batches == batches + 1, service.stats
+
+        # 批量接口：逐条返回结果或错误
+        status, body = await call("/whatif", {"queries": [query, {"dataset": "nope"}]})
+        assert status == 200 and body["results"][0]["source"] == "cache" and "error" in body["results"][1]
+
+        # 非法取值在解析阶段被拒绝，不会到达工作进程
+        bad = [
+            {"dataset": DATASET, "orders": [{"job_type": "H", "arrival_time": "nan"}]},
+            {"dataset": DATASET, "orders": [{"job_type": "H", "arrival_time": "inf"}]},
+            {"dataset": DATASET, "orders": [{"job_type": "N", "arrival_time": -5}]},
+            {"dataset": DATASET, "orders": [{"job_type": "N", "arrival_time": 5, "due_date": "nan"}]},
+            {"dataset": DATASET, "orders": [{"job_type": "X", "arrival_time": 5}]},
+            {"dataset": DATASET, "orders": [{"job_type": "N", "arrival_time": 5, "job_id": 1}]},
+            {"dataset": DATASET, "overrides": {"reservation_window": "nan"}},
+            {"dataset": DATASET, "overrides": {"reservation_window": -1}},
+            {"dataset": DATASET, "overrides": {"b_machines": 0}},
+            {"dataset": DATASET, "overrides": {"busy_threshold": 2.5}},
+            {"dataset": DATASET, "overrides": {"unknown": 1}},
+            {"dataset": DATASET, "strategy": "Rollout", "backend": "heap"},
+            {"dataset": "nope"},
+        ]
+        simulations = service.stats.simulations
+        for payload in bad:
+            status, body = await call("/whatif", payload)
+            assert status == 400 and "error" in body, (payload, status, body)
+        assert service.stats.simulations == simulations
+
+        status, _ = await call("/nothing")
+        assert status == 404
+        status, _ = await call("/health", {"x": 1})
+        assert status == 405
+
+        # 错误之后服务仍然可用
+        status, body = await call("/whatif", {"dataset": DATASET, "strategy": "MinSLK"})
+        assert status == 200 and body["source"] == "simulated", body
+        status, body = await call("/health")
+        assert status == 200 and body["stats"]["errors"] == 0, body
+        return body["stats"]
+    finally:
+        server.cancel()
+        await asyncio.gather(server, return_exceptions=True)
+
+
+def _run():
+    jobs = load_and_process_data(ROOT / "native_data" / "csv" / f"{DATASET}.csv")
+    return asyncio.run(_scenario(jobs))
+
+
+def test_service():
+    _run()
+
+
+def main():
+    stats = _run()
+    print(f"what-if 服务测试通过：{stats}")
+
+
+if __name__ == "__main__":
+    main()